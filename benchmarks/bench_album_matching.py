@@ -0,0 +1,119 @@
+"""Compare AlbumMatcher against scoring every album of an artist.
+
+Run from the repository root:
+
+    python benchmarks/bench_album_matching.py [--albums N] [--queries N] [--tracks N]
+
+The artist has --albums generated titles with editions such as
+"(Deluxe Edition)" or "(Live)". Queries are exact titles, titles with a
+typo or a different edition, and titles the artist does not have; each
+is looked up --tracks times, once per track of an album.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, TypeVar
+
+from kimp3.album_matching import AlbumMatcher
+from kimp3.strings_operations import album_title_similarity
+
+T = TypeVar("T")
+
+WORDS = (
+    "night day black white red blue golden silent broken electric summer winter "
+    "river ocean city desert forest fire ice stone glass paper heart ghost dream "
+    "machine empire kingdom garden shadow light mirror echo signal station"
+).split()
+EDITIONS = ("", "", "", "Deluxe Edition", "Live", "Remastered", "Demo Version", "Expanded")
+
+
+def make_titles(count: int, rng: random.Random) -> list[str]:
+    titles: list[str] = []
+    seen: set[str] = set()
+    while len(titles) < count:
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title()
+        edition = rng.choice(EDITIONS)
+        title = f"{words} ({edition})" if edition else words
+        if title not in seen:
+            seen.add(title)
+            titles.append(title)
+    return titles
+
+
+def typo(title: str, rng: random.Random) -> str:
+    position = rng.randrange(len(title))
+    return title[:position] + title[position + 1 :]
+
+
+def make_queries(titles: list[str], count: int, rng: random.Random) -> list[str]:
+    queries = []
+    for number in range(count):
+        title = rng.choice(titles)
+        kind = number % 4
+        if kind == 1:
+            title = typo(title, rng)
+        elif kind == 2:
+            title = f"{title.split(' (')[0]} ({rng.choice(EDITIONS[3:])})"
+        elif kind == 3:
+            title = " ".join(rng.choice(WORDS) for _ in range(3)).title() + " Sessions"
+        queries.append(title)
+    return queries
+
+
+def scan_all(titles: list[str], query: str) -> tuple[str, float] | None:
+    """_best_lastfm_album_match() before AlbumMatcher, kept for comparison."""
+    best_score = 0.0
+    best_title = None
+    for title in titles:
+        score = album_title_similarity(title, query)
+        if score > best_score:
+            best_score = score
+            best_title = title
+    return (best_title, best_score) if best_title else None
+
+
+def timed(function: Callable[[], T]) -> tuple[float, T]:
+    started = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--albums", type=int, default=2000)
+    arguments.add_argument("--queries", type=int, default=40)
+    arguments.add_argument("--tracks", type=int, default=4)
+    options = arguments.parse_args()
+
+    rng = random.Random(2024)
+    titles = make_titles(options.albums, rng)
+    queries = make_queries(titles, options.queries, rng)
+    lookups = [query for query in queries for _ in range(options.tracks)]
+
+    scan_ms, expected = timed(lambda: [scan_all(titles, query) for query in lookups])
+    matcher: AlbumMatcher[str] = AlbumMatcher()
+    match_ms, found = timed(
+        lambda: [matcher.best_match("artist", titles, str, query) for query in lookups]
+    )
+    unmemoized = AlbumMatcher(max_memo=0)
+    index_ms, _ = timed(
+        lambda: [unmemoized.best_match("artist", titles, str, query) for query in lookups]
+    )
+
+    agree = sum(
+        (left[0] if left else None) == (right[0] if right else None)
+        for left, right in zip(expected, found)
+    )
+    print(f"{options.albums} albums, {len(lookups)} lookups ({options.queries} distinct)")
+    print(f"{'full scan ms':>13}{'index ms':>10}{'memo ms':>10}{'speed-up':>10}{'agree':>9}")
+    print(
+        f"{scan_ms:>13.1f}{index_ms:>10.1f}{match_ms:>10.1f}"
+        f"{scan_ms / match_ms:>9.0f}x{agree:>5}/{len(lookups)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
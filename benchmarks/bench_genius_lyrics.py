@@ -0,0 +1,81 @@
+"""Compare Genius lyrics extraction against the former BeautifulSoup path.
+
+Run from the repository root:
+
+    python benchmarks/bench_genius_lyrics.py [--repeat N]
+
+BeautifulSoup comes with the bench extra: pip install -e ".[bench]".
+
+Pages are the saved fixtures in tests/fixtures/genius. The streamed case
+feeds 64 KiB chunks, as provider_client.stream() does, and stops when the
+parser reports the lyrics complete.
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from kimp3.lyrics import GeniusLyricsParser, extract_genius_lyrics
+from kimp3.provider_client import STREAM_CHUNK_SIZE
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "genius"
+
+
+def extract_with_beautifulsoup(html: str) -> str | None:
+    """The extraction used before the streaming parser, kept for comparison."""
+    soup = BeautifulSoup(html, "html.parser")
+    lyrics_containers = soup.find_all("div", attrs={"data-lyrics-container": "true"})
+    if not lyrics_containers:
+        return None
+    lyrics = ""
+    for container in lyrics_containers:
+        for elem in container.stripped_strings:
+            lyrics += elem + "\n"
+    return lyrics.strip()
+
+
+def extract_streamed(page: bytes) -> tuple[str | None, int]:
+    parser = GeniusLyricsParser()
+    on_chunk = parser.restart()
+    read = 0
+    for start in range(0, len(page), STREAM_CHUNK_SIZE):
+        chunk = page[start:start + STREAM_CHUNK_SIZE]
+        read += len(chunk)
+        if on_chunk(chunk):
+            break
+    return parser.text(), read
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--repeat", type=int, default=20)
+    options = arguments.parse_args()
+
+    print(f"{'page':<16}{'bytes':>9}{'read':>9}{'bs4 ms':>10}{'parser ms':>11}{'stream ms':>11}")
+    for path in sorted(FIXTURES.glob("*.html")):
+        page = path.read_bytes()
+        html = page.decode("utf-8")
+        expected = extract_with_beautifulsoup(html)
+        streamed, read = extract_streamed(page)
+        assert extract_genius_lyrics(html) == expected == streamed, f"{path.name}: extractors disagree"
+
+        timings = [
+            min(timeit.repeat(function, number=1, repeat=options.repeat)) * 1000
+            for function in (
+                lambda: extract_with_beautifulsoup(html),
+                lambda: extract_genius_lyrics(html),
+                lambda: extract_streamed(page),
+            )
+        ]
+        print(
+            f"{path.name:<16}{len(page):>9}{read:>9}"
+            f"{timings[0]:>10.2f}{timings[1]:>11.2f}{timings[2]:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Compare TagPolicy against the former per-call tag normalization and ban checks.
+
+Run from the repository root:
+
+    python benchmarks/bench_tag_policy.py [--repeat N] [--tracks N]
+
+Rules come from config/tags.example.yaml. Each simulated track offers
+about 150 candidates: the album and artist tags shared by the whole album
+plus track tags of its own, as process_lastfm_tags() receives them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Callable, TypeVar
+
+import yaml
+
+from kimp3.settings import TagsSettings
+from kimp3.tag_processing import TagPolicy
+
+T = TypeVar("T")
+CONFIG = Path(__file__).resolve().parent.parent / "config" / "tags.example.yaml"
+
+
+def normalize_sequential(settings: TagsSettings, tag: str) -> str:
+    """_normalize_tag() before TagPolicy, kept for comparison."""
+    for similar_tags in settings.similar_tags:
+        if tag in similar_tags:
+            return similar_tags[0]
+    for pattern_list in settings.similar_tags_patterns:
+        if any(re.match(pattern, tag) for pattern in pattern_list[1:]):
+            return pattern_list[0]
+    return tag
+
+
+def is_banned_sequential(settings: TagsSettings, tag: str, artist_name: str) -> bool:
+    """_is_banned_tag() before TagPolicy, kept for comparison."""
+    tag_key = tag.casefold()
+    artist_key = artist_name.casefold()
+    if tag_key in {item.casefold() for item in settings.banned_tags}:
+        return True
+    if any(re.match(pattern, tag) for pattern in settings.banned_tags_patterns):
+        return True
+    banned_artists = {
+        key.casefold(): [artist.casefold() for artist in artists]
+        for key, artists in settings.banned_artists_from_tags.items()
+    }
+    if tag_key in banned_artists:
+        return artist_key in banned_artists[tag_key]
+    return False
+
+
+def album_candidates(settings: TagsSettings, tracks: int) -> list[list[str]]:
+    vocabulary = (
+        settings.genres
+        + settings.extended_genres
+        + settings.banned_tags
+        + [group[0] for group in settings.similar_tags_patterns]
+    )
+    shared = [vocabulary[(index * 7) % len(vocabulary)] for index in range(100)]
+    return [
+        shared + [f"{vocabulary[(track * 13 + index) % len(vocabulary)]} music" for index in range(50)]
+        for track in range(tracks)
+    ]
+
+
+def run_sequential(settings: TagsSettings, album: list[list[str]]) -> list[tuple[str, bool]]:
+    result = []
+    for candidates in album:
+        for tag in candidates:
+            normalized = normalize_sequential(settings, tag)
+            result.append((normalized, is_banned_sequential(settings, normalized, "Nirvana")))
+    return result
+
+
+def run_policy(settings: TagsSettings, album: list[list[str]]) -> list[tuple[str, bool]]:
+    policy = TagPolicy(settings)
+    result = []
+    for candidates in album:
+        for tag in candidates:
+            normalized = policy.normalize(tag)
+            result.append((normalized, policy.is_banned(normalized, "Nirvana")))
+    return result
+
+
+def best_of(repeat: int, function: Callable[[], T]) -> tuple[float, T]:
+    """Return the fastest of repeat runs in milliseconds and the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--repeat", type=int, default=3)
+    arguments.add_argument("--tracks", type=int, default=5)
+    options = arguments.parse_args()
+
+    settings = TagsSettings(**yaml.safe_load(CONFIG.read_text(encoding="utf-8"))["tags"])
+    album = album_candidates(settings, options.tracks)
+    build_ms, _ = best_of(options.repeat, lambda: TagPolicy(settings))
+    sequential_ms, expected = best_of(options.repeat, lambda: run_sequential(settings, album))
+    policy_ms, result = best_of(options.repeat, lambda: run_policy(settings, album))
+    assert result == expected, "policies disagree"
+
+    candidates = sum(len(track) for track in album)
+    print(f"{options.tracks} tracks, {candidates} candidates, {len(settings.similar_tags_patterns)} pattern lists")
+    print(f"{'sequential ms':>14}{'policy ms':>11}{'build ms':>10}{'speed-up':>10}")
+    print(f"{sequential_ms:>14.2f}{policy_ms:>11.2f}{build_ms:>10.2f}{sequential_ms / policy_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
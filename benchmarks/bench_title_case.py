@@ -0,0 +1,78 @@
+"""Measure title normalization of album tags with and without the memo.
+
+Run from the repository root:
+
+    python benchmarks/bench_title_case.py [--albums N] [--tracks N] [--repeat N]
+
+Exceptions come from config/tags.example.yaml. Every track's title,
+artist, album and album artist are normalized twice, once when the file
+is read and once after the tag fetch. "per call" builds the exception
+rules for every value, as the code did before TitleCaseRules; "compiled"
+reuses them without a memo; "memoized" is normalize_title().
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable
+
+import yaml
+
+from kimp3.title_case import TitleCaseRules, normalize_title, title_case_rules
+
+CONFIG = Path(__file__).resolve().parent.parent / "config" / "tags.example.yaml"
+FIELDS = ("title", "artist", "album", "album_artist")
+
+
+def album_values(albums: int, tracks: int) -> list[str]:
+    values = []
+    for album in range(albums):
+        artist = ("the cure", "ддт", "dj shadow", "король и шут")[album % 4]
+        album_title = f"disintegration vol. {album} (deluxe edition)"
+        for track in range(tracks):
+            title = f"a forest part {track} of the night" if album % 2 else f"звезда номер {track}"
+            values.extend((title, artist, album_title, artist))
+    return values * 2
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arguments.add_argument("--albums", type=int, default=50)
+    arguments.add_argument("--tracks", type=int, default=12)
+    arguments.add_argument("--repeat", type=int, default=3)
+    options = arguments.parse_args()
+
+    exceptions = yaml.safe_load(CONFIG.read_text(encoding="utf-8"))["tags"]["title_case_exceptions"]
+    values = album_values(options.albums, options.tracks)
+    compiled = TitleCaseRules(exceptions, memo_size=0)
+
+    def per_call() -> list[str]:
+        return [TitleCaseRules(exceptions, memo_size=0).normalize(value, "title_case_safe") for value in values]
+
+    def without_memo() -> list[str]:
+        return [compiled.normalize(value, "title_case_safe") for value in values]
+
+    def memoized() -> list[str]:
+        title_case_rules.cache_clear()
+        return [normalize_title(value, "title_case_safe", exceptions) for value in values]
+
+    assert per_call() == without_memo() == memoized(), "normalizers disagree"
+    timings = [best_of(options.repeat, function) for function in (per_call, without_memo, memoized)]
+    print(f"{options.albums} albums x {options.tracks} tracks, {len(values)} values, {len(set(values))} distinct")
+    print(f"{'per call ms':>12}{'compiled ms':>13}{'memoized ms':>13}{'speed-up':>10}")
+    print(f"{timings[0]:>12.1f}{timings[1]:>13.1f}{timings[2]:>13.1f}{timings[0] / timings[2]:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
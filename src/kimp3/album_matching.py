@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Sequence, TypeVar
+
+from kimp3.config import APP_NAME
+from kimp3.strings_operations import (
+    ALBUM_TITLE_BASE_WEIGHT,
+    ALBUM_TITLE_MATCH_THRESHOLD,
+    album_parts_similarity,
+    album_title_parts,
+)
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+T = TypeVar("T")
+
+# Candidates scored with album_parts_similarity() after trigram pruning.
+SHORTLIST_SIZE = 8
+MAX_INDEXES = 256
+MAX_MEMO_PER_INDEX = 256
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    padded = f"  {text} "
+    return frozenset(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+def _dice(shared: int, left: int, right: int) -> float:
+    return 2.0 * shared / (left + right) if left + right else 1.0
+
+
+class AlbumTitleIndex:
+    """Album titles of one artist, split and casefolded once, indexed by trigrams.
+
+    best_match() ranks candidates by trigram overlap with the query, using
+    the same base/qualifier weighting as album_title_similarity(), and runs
+    the SequenceMatcher-based scorer only on the best SHORTLIST_SIZE of them.
+    An exact title match skips scoring altogether.
+    """
+
+    def __init__(self, titles: Sequence[str], shortlist: int = SHORTLIST_SIZE) -> None:
+        self.shortlist = shortlist
+        self.parts = [album_title_parts(title) for title in titles]
+        self._base_sizes: list[int] = []
+        self._qualifier_sizes: list[int] = []
+        self._base_postings: dict[str, list[int]] = {}
+        self._qualifier_postings: dict[str, list[int]] = {}
+        self._exact: dict[tuple[str, str], int] = {}
+        for position, (base, qualifier) in enumerate(self.parts):
+            self._exact.setdefault((base, qualifier), position)
+            base_grams = _trigrams(base)
+            qualifier_grams = _trigrams(qualifier) if qualifier else frozenset()
+            self._base_sizes.append(len(base_grams))
+            self._qualifier_sizes.append(len(qualifier_grams))
+            for gram in base_grams:
+                self._base_postings.setdefault(gram, []).append(position)
+            for gram in qualifier_grams:
+                self._qualifier_postings.setdefault(gram, []).append(position)
+        self.scored = 0
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def _shared(self, grams: frozenset[str], postings: dict[str, list[int]]) -> dict[int, int]:
+        shared: dict[int, int] = {}
+        for gram in grams:
+            for position in postings.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+        return shared
+
+    def shortlist_for(self, query: tuple[str, str]) -> list[int]:
+        """Return the positions worth scoring for query, in candidate order."""
+        if len(self.parts) <= self.shortlist:
+            return list(range(len(self.parts)))
+        base, qualifier = query
+        base_grams = _trigrams(base)
+        qualifier_grams = _trigrams(qualifier) if qualifier else frozenset()
+        base_shared = self._shared(base_grams, self._base_postings)
+        qualifier_shared = self._shared(qualifier_grams, self._qualifier_postings)
+
+        def estimate(position: int) -> float:
+            base_estimate = _dice(
+                base_shared.get(position, 0), len(base_grams), self._base_sizes[position]
+            )
+            if qualifier_grams and self._qualifier_sizes[position]:
+                qualifier_estimate = _dice(
+                    qualifier_shared.get(position, 0),
+                    len(qualifier_grams),
+                    self._qualifier_sizes[position],
+                )
+            else:
+                qualifier_estimate = float(not qualifier_grams and not self._qualifier_sizes[position])
+            return base_estimate * ALBUM_TITLE_BASE_WEIGHT + qualifier_estimate * (
+                1.0 - ALBUM_TITLE_BASE_WEIGHT
+            )
+
+        ranked = sorted(base_shared, key=lambda position: (-estimate(position), position))
+        return sorted(ranked[: self.shortlist])
+
+    def best_match(
+        self, query: str, min_ratio: float = ALBUM_TITLE_MATCH_THRESHOLD
+    ) -> tuple[int, float] | None:
+        """Return the position and score of the best candidate for query, if any passes."""
+        query_parts = album_title_parts(query)
+        exact = self._exact.get(query_parts)
+        if exact is not None:
+            return exact, 1.0
+        best_position = None
+        best_score = 0.0
+        for position in self.shortlist_for(query_parts):
+            self.scored += 1
+            score = album_parts_similarity(self.parts[position], query_parts, min_ratio)
+            if score > best_score:
+                best_score = score
+                best_position = position
+        if best_position is None:
+            return None
+        return best_position, best_score
+
+
+class _IndexEntry:
+    def __init__(self, candidates: Sequence[object], index: AlbumTitleIndex) -> None:
+        self.candidates = candidates
+        self.index = index
+        self.memo: OrderedDict[str, tuple[int, float] | None] = OrderedDict()
+
+
+class AlbumMatcher(Generic[T]):
+    """Best album match per (key, query), with one AlbumTitleIndex per candidate list.
+
+    key names a candidate list, usually the artist. The index is rebuilt
+    when a different list object is passed for the same key, for example
+    after the provider cache was cleared, and its memoized matches go with
+    it. Both the indexes and the per-index memos are bounded LRUs.
+    """
+
+    def __init__(
+        self,
+        max_indexes: int = MAX_INDEXES,
+        max_memo: int = MAX_MEMO_PER_INDEX,
+        shortlist: int = SHORTLIST_SIZE,
+    ) -> None:
+        self.max_indexes = max_indexes
+        self.max_memo = max_memo
+        self.shortlist = shortlist
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, _IndexEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(
+        self, key: Hashable, candidates: Sequence[T], title_of: Callable[[T], str]
+    ) -> _IndexEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.candidates is candidates:
+                self._entries.move_to_end(key)
+                return entry
+        entry = _IndexEntry(
+            candidates,
+            AlbumTitleIndex([title_of(candidate) for candidate in candidates], self.shortlist),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_indexes:
+                self._entries.popitem(last=False)
+        return entry
+
+    def best_match(
+        self,
+        key: Hashable,
+        candidates: Sequence[T],
+        title_of: Callable[[T], str],
+        query: str,
+    ) -> tuple[T, float] | None:
+        """Return the candidate whose title matches query best and its score."""
+        if not candidates:
+            return None
+        entry = self._entry(key, candidates, title_of)
+        with self._lock:
+            if query in entry.memo:
+                self.hits += 1
+                entry.memo.move_to_end(query)
+                found = entry.memo[query]
+                return None if found is None else (candidates[found[0]], found[1])
+            self.misses += 1
+        found = entry.index.best_match(query)
+        with self._lock:
+            entry.memo[query] = found
+            while len(entry.memo) > self.max_memo:
+                entry.memo.popitem(last=False)
+        return None if found is None else (candidates[found[0]], found[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "album_match_indexes": len(self._entries),
+                "album_match_memo_hits": self.hits,
+                "album_match_memo_misses": self.misses,
+            }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import logging
 from dataclasses import dataclass
 from pathlib import Path
@@ -7,6 +8,7 @@ from typing import Any, Protocol
 
 from mutagen.easyid3 import EasyID3
 from mutagen.flac import FLAC, Picture
+from mutagen.mp3 import MP3, HeaderNotFoundError
 from mutagen.id3 import (
     APIC,
     COMM,
@@ -23,7 +25,7 @@ from mutagen.id3 import (
 )
 
 from kimp3.config import APP_NAME
-from kimp3.models import Artwork, AudioTags, Lyrics
+from kimp3.models import Artwork, ArtworkSource, AudioInfo, AudioTags, Lyrics
 
 LYRICS_LOOKUP_COMMENT_DESC = "KiMP3 lyrics lookup"
 LYRICS_LOOKUP_VORBIS_KEY = "kimp3:lyrics_lookup"
@@ -62,7 +64,11 @@ class TagWritePolicy:
 class TagBackend(Protocol):
     supported_extensions: set[str]
 
-    def read(self, path: Path) -> AudioTags: ...
+    def read(self, path: Path, headers_only: bool = False) -> AudioTags: ...
+
+    def read_with_info(self, path: Path, headers_only: bool = False) -> tuple[AudioTags, AudioInfo]: ...
+
+    def read_artwork(self, path: Path, locator: str) -> bytes: ...
 
     def write(self, path: Path, tags: AudioTags, policy: TagWritePolicy) -> None: ...
 
@@ -84,6 +90,8 @@ def _first(value: list[str] | None) -> str:
 
 def _tag_value(tags: AudioTags, field: str) -> Any:
     value = getattr(tags, field)
+    if isinstance(value, Artwork):
+        return value.managed_value()
     if hasattr(value, "model_dump"):
         return value.model_dump()
     return value
@@ -96,6 +104,17 @@ def _format_tag_value(value: Any) -> str:
     return rendered
 
 
+def _artwork_bytes(artwork: Artwork, embedded: list[Any]) -> bytes:
+    """Return bytes to write, reusing an identical image already in the file."""
+    if artwork.is_loaded:
+        return artwork.data
+    for item in embedded:
+        data = item.data
+        if len(data) == artwork.size and hashlib.sha256(data).hexdigest() == artwork.digest:
+            return data
+    return artwork.read_bytes()
+
+
 def _set_id3_text_frame(
     id3: ID3, frame_id: str, frame_type: type, value: str | list[str] | None
 ) -> None:
@@ -117,13 +136,56 @@ def _verify_managed_tags(path: Path, expected: AudioTags, actual: AudioTags) ->
     return errors
 
 
+class _EasyId3View:
+    """Read-only EasyID3 key access over an already parsed ID3 tag."""
+
+    def __init__(self, id3: ID3) -> None:
+        self._id3 = id3
+
+    def get(self, key: str, default: Any = None) -> Any:
+        getter = EasyID3.Get.get(key.lower())
+        if getter is None:
+            return default
+        try:
+            return getter(self._id3, key)
+        except KeyError:
+            return default
+
+
+def _stream_info(info: object, raw_genres: list[str]) -> AudioInfo:
+    return AudioInfo(
+        bitrate=int(getattr(info, "bitrate", 0) or 0),
+        length=float(getattr(info, "length", 0.0) or 0.0),
+        raw_genres=[str(genre) for genre in raw_genres],
+    )
+
+
 class Mp3Id3Backend:
     supported_extensions = {".mp3"}
 
-    def read(self, path: Path) -> AudioTags:
-        id3 = ID3(path, v2_version=4)
-        easy_tags = EasyID3(path)
-        return AudioTags.from_mutagen(easy_tags, id3)
+    def read(self, path: Path, headers_only: bool = False) -> AudioTags:
+        return self.read_with_info(path, headers_only=headers_only)[0]
+
+    def read_with_info(self, path: Path, headers_only: bool = False) -> tuple[AudioTags, AudioInfo]:
+        """Parse the ID3 block once and derive easy fields, raw frames and stream info.
+
+        With headers_only, artwork keeps only its digest, size and frame locator.
+        """
+        try:
+            audio = MP3(path)
+            id3, info = audio.tags, audio.info
+        except HeaderNotFoundError:
+            id3, info = ID3(path, v2_version=4), None
+        if id3 is None:
+            return AudioTags(), _stream_info(info, [])
+        easy_tags = _EasyId3View(id3)
+        apic_frames = id3.getall("APIC") if headers_only else []
+        source = ArtworkSource(path=Path(path), locator=apic_frames[0].HashKey) if apic_frames else None
+        tags = AudioTags.from_mutagen(easy_tags, id3, artwork_source=source)
+        return tags, _stream_info(info, easy_tags.get("genre", []))
+
+    def read_artwork(self, path: Path, locator: str) -> bytes:
+        return ID3(path)[locator].data
 
     def write(self, path: Path, tags: AudioTags, policy: TagWritePolicy) -> None:
         id3 = ID3(path)
@@ -170,11 +232,13 @@ class Mp3Id3Backend:
             )
 
         if policy.manage_artwork:
+            embedded = [id3[key] for key in list(id3.keys()) if key.startswith("APIC:")]
+            artwork_data = _artwork_bytes(tags.artwork, embedded) if tags.artwork else None
             for key in list(id3.keys()):
                 if key.startswith("APIC:"):
                     del id3[key]
             if tags.artwork:
-                id3.add(APIC(encoding=3, mime=tags.artwork.mime, type=3, desc="Cover", data=tags.artwork.data))
+                id3.add(APIC(encoding=3, mime=tags.artwork.mime, type=3, desc="Cover", data=artwork_data))
         if policy.manage_lyrics:
             for key in list(id3.keys()):
                 if key.startswith("USLT:"):
@@ -191,12 +255,19 @@ class Mp3Id3Backend:
 class FlacVorbisBackend:
     supported_extensions = {".flac"}
 
-    def read(self, path: Path) -> AudioTags:
+    def read(self, path: Path, headers_only: bool = False) -> AudioTags:
+        return self.read_with_info(path, headers_only=headers_only)[0]
+
+    def read_with_info(self, path: Path, headers_only: bool = False) -> tuple[AudioTags, AudioInfo]:
         flac = FLAC(path)
         pictures = flac.pictures
-        artwork = Artwork(data=pictures[0].data, mime=pictures[0].mime) if pictures else None
+        artwork = None
+        if pictures and headers_only:
+            artwork = Artwork.described(pictures[0].data, pictures[0].mime, ArtworkSource(path=Path(path), locator="0"))
+        elif pictures:
+            artwork = Artwork(data=pictures[0].data, mime=pictures[0].mime)
         lyrics_text = _first(flac.get("lyrics"))
-        return AudioTags(
+        tags = AudioTags(
             title=_first(flac.get("title")),
             artist=_first(flac.get("artist")),
             album=_first(flac.get("album")),
@@ -215,6 +286,10 @@ class FlacVorbisBackend:
             lyrics=Lyrics(text=lyrics_text) if lyrics_text else None,
             lyrics_lookup=_first(flac.get(LYRICS_LOOKUP_VORBIS_KEY)) or None,
         )
+        return tags, _stream_info(getattr(flac, "info", None), flac.get("genre", []))
+
+    def read_artwork(self, path: Path, locator: str) -> bytes:
+        return FLAC(path).pictures[int(locator or 0)].data
 
     def write(self, path: Path, tags: AudioTags, policy: TagWritePolicy) -> None:
         flac = FLAC(path)
@@ -246,12 +321,13 @@ class FlacVorbisBackend:
             elif "lyrics" in flac:
                 del flac["lyrics"]
         if policy.manage_artwork and tags.artwork:
+            artwork_data = _artwork_bytes(tags.artwork, list(flac.pictures))
             flac.clear_pictures()
             picture = Picture()
             picture.type = 3
             picture.mime = tags.artwork.mime
             picture.desc = "Cover"
-            picture.data = tags.artwork.data
+            picture.data = artwork_data
             flac.add_picture(picture)
         flac.save()
 
@@ -263,6 +339,11 @@ class FlacVorbisBackend:
 BACKENDS: list[TagBackend] = [Mp3Id3Backend(), FlacVorbisBackend()]
 
 
+def load_artwork_bytes(source: ArtworkSource) -> bytes:
+    """Load embedded artwork bytes recorded by a headers-only read."""
+    return get_backend(source.path).read_artwork(source.path, source.locator)
+
+
 def get_backend(path: Path) -> TagBackend:
     suffix = path.suffix.lower()
     for backend in BACKENDS:
@@ -37,6 +37,12 @@ def _parse_args() -> tuple[argparse.Namespace, list[str]]:
         default=None,
         help="Enable or disable interactive confirmations.",
     )
+    parser.add_argument(
+        "--purge-cache",
+        dest="purge_cache",
+        action="store_true",
+        help="Delete cached album covers and provider lookups before scanning.",
+    )
     return parser.parse_known_args()
 
 
@@ -87,6 +93,8 @@ if args.dry:
     cfg.update("dry_run", True)
 if args.interactive is not None:
     cfg.update("interactive", args.interactive)
+if args.purge_cache:
+    cfg.update("purge_cache", True)
 
 cfg.update("tags.lastfm_api_key", _resolve_env(cfg.tags.lastfm_api_key, "LASTFM_API_KEY"))
 cfg.update("tags.lastfm_api_secret", _resolve_env(cfg.tags.lastfm_api_secret, "LASTFM_API_SECRET"))
@@ -2,78 +2,467 @@ from __future__ import annotations
 
 import hashlib
 import io
+import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Container, Optional, Tuple
 
-import requests
+import pylast
 from PIL import Image
 
+from kimp3 import provider_client, resilience
 from kimp3.config import APP_NAME, cfg
+from kimp3.metadata_cache import ProviderCache
 
 
 log = logging.getLogger(f"{APP_NAME}.{__name__}")
-_album_cover_cache: dict[tuple[str, str], tuple[bytes, str]] = {}
-_COVER_CACHE_DIR = Path(cfg.paths.cache_dir) / "album_covers"
+COVER_CACHE_DIRNAME = "album_covers"
+COVER_INDEX_FILENAME = "index.json"
+MIN_JPEG_QUALITY = 40
+JPEG_QUALITY_STEP = 10
+LASTFM_COVER_SIZES = {"small": 0, "medium": 1, "large": 2, "extralarge": 3, "mega": 4}
 
+_cover_urls = ProviderCache("covers.album_url")
 
-def _get_cover_cache_path(artist: str, album: str) -> Path:
-    cache_key = f"{artist}_{album}".encode("utf-8")
-    return _COVER_CACHE_DIR / (hashlib.md5(cache_key).hexdigest() + ".jpg")
 
+@dataclass(frozen=True)
+class CoverFormat:
+    """Shape of the embedded cover variant."""
+
+    max_dimension: int = 1000
+    quality: int = 85
+    target_bytes: int = 0
+
+    @classmethod
+    def from_config(cls, tags_config: object) -> CoverFormat:
+        return cls(
+            max_dimension=tags_config.cover_max_dimension,
+            quality=tags_config.cover_jpeg_quality,
+            target_bytes=tags_config.cover_target_kb * 1024,
+        )
+
+    def variant_name(self, url: str) -> str:
+        """Disk cache name of the variant of the image at url."""
+        key = f"{url}\n{self.max_dimension}\n{self.quality}\n{self.target_bytes}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:40] + ".jpg"
+
+
+def encode_cover(data: bytes, cover_format: CoverFormat) -> bytes:
+    """Decode an image, fit it into max_dimension and re-encode it as JPEG.
+
+    With a target size the JPEG quality is lowered step by step until the
+    image fits, but not below MIN_JPEG_QUALITY. Runs in worker processes.
+    """
+    image = Image.open(io.BytesIO(data))
+    image = image.convert("RGB")
+    if cover_format.max_dimension and max(image.size) > cover_format.max_dimension:
+        image.thumbnail((cover_format.max_dimension, cover_format.max_dimension), Image.LANCZOS)
+    quality = cover_format.quality
+    while True:
+        output = io.BytesIO()
+        image.save(output, format="JPEG", quality=quality, optimize=True)
+        encoded = output.getvalue()
+        if (
+            not cover_format.target_bytes
+            or len(encoded) <= cover_format.target_bytes
+            or quality <= MIN_JPEG_QUALITY
+        ):
+            return encoded
+        quality = max(quality - JPEG_QUALITY_STEP, MIN_JPEG_QUALITY)
+
+
+def _warm_up() -> int:
+    return os.getpid()
 
-def get_album_cover(artist: str, album: str, size: str = "mega") -> Tuple[Optional[bytes], str]:
-    """Get album cover from Last.FM or cache."""
-    import kimp3.lastfm as lastfm
 
-    cache_key = (artist, album)
-    if cache_key in _album_cover_cache:
-        return _album_cover_cache[cache_key]
+class CoverProcessor:
+    """Encodes cover variants in a process pool shared by the whole run.
 
-    cache_path = _get_cover_cache_path(artist, album)
-    if cache_path.exists():
+    Decoding and resizing large images holds the GIL, so fetch threads hand
+    them to worker processes. With one worker they are encoded in-process.
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self._pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def parallel(self) -> bool:
+        return self.workers > 1
+
+    def start(self) -> None:
+        """Start worker processes; call before other threads are running."""
+        with self._lock:
+            if not self.parallel or self._pool is not None:
+                return
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self._pool.submit(_warm_up).result()
+        log.info(f"`tags`Encoding covers with {self.workers} worker processes")
+
+    def encode(self, data: bytes, cover_format: CoverFormat) -> bytes:
+        if not self.parallel:
+            return encode_cover(data, cover_format)
+        self.start()
         try:
-            image_data = cache_path.read_bytes()
-            result = (image_data, "image/jpeg")
-            _album_cover_cache[cache_key] = result
-            return result
-        except OSError as exc:
-            log.warning(f"`files,tags`Failed to read cached cover for {artist} - {album}: {exc}")
+            return self._pool.submit(encode_cover, data, cover_format).result()
+        except BrokenProcessPool as e:
+            log.warning(f"`tags`Cover encoder pool failed, encoding in-process: {e}")
+            self.close()
+            self.workers = 1
+            return encode_cover(data, cover_format)
 
-    try:
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+class CoverDiskCache:
+    """Downloaded album covers kept on disk between runs.
+
+    An index file records the size and last access time of every cached
+    cover, so lookups do not stat the cache directory. Covers found in the
+    directory but missing from the index, e.g. written by a run that did
+    not get to save it, are added when the index is loaded. Once the total
+    size exceeds max_bytes the least recently used covers are deleted.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.index_path = self.directory / COVER_INDEX_FILENAME
+        self._entries: OrderedDict[str, tuple[int, float]] | None = None
+        self._total_bytes = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> OrderedDict[str, tuple[int, float]]:
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, tuple[int, float]] = {}
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+            entries = {name: (int(size), float(accessed)) for name, (size, accessed) in raw.items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as exc:
+            log.warning(f"`files,state`Cover cache index is unreadable, rebuilding: {exc}")
+        entries.update(self._scan_directory(entries))
+        self._entries = OrderedDict(sorted(entries.items(), key=lambda item: item[1][1]))
+        self._total_bytes = sum(size for size, _ in self._entries.values())
+        self._evict()
+        return self._entries
+
+    def _scan_directory(self, known: Container[str] = ()) -> dict[str, tuple[int, float]]:
+        """Return index entries for covers in the directory that are not known yet."""
+        entries: dict[str, tuple[int, float]] = {}
+        if not self.directory.is_dir():
+            return entries
+        for file in self.directory.iterdir():
+            if file.suffix != ".jpg" or file.name in known:
+                continue
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            entries[file.name] = (stat.st_size, stat.st_atime)
+        if entries:
+            self._dirty = True
+        return entries
+
+    def get(self, name: str) -> bytes | None:
+        with self._lock:
+            entries = self._load()
+            if name not in entries:
+                return None
+            try:
+                data = (self.directory / name).read_bytes()
+            except OSError as exc:
+                log.warning(f"`files,tags`Failed to read cached cover {name}: {exc}")
+                self._drop(name)
+                return None
+            entries[name] = (len(data), time.time())
+            entries.move_to_end(name)
+            self._dirty = True
+            return data
+
+    def put(self, name: str, data: bytes) -> None:
+        path = self.directory / name
+        with self._lock:
+            entries = self._load()
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                temp_path = path.with_suffix(".tmp")
+                temp_path.write_bytes(data)
+                os.replace(temp_path, path)
+            except OSError as exc:
+                log.warning(f"`files,state`Failed to cache cover {name}: {exc}")
+                return
+            if name in entries:
+                self._total_bytes -= entries[name][0]
+            entries[name] = (len(data), time.time())
+            entries.move_to_end(name)
+            self._total_bytes += len(data)
+            self._dirty = True
+            self._evict()
+
+    def _drop(self, name: str) -> None:
+        size, _ = self._entries.pop(name)
+        self._total_bytes -= size
+        self._dirty = True
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            name = next(iter(self._entries))
+            self._drop(name)
+            try:
+                (self.directory / name).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                log.warning(f"`files,state`Failed to delete cache file {name}: {exc}")
+            log.debug(f"`state`Cover cache evicted {name}")
+
+    def save(self) -> None:
+        """Write the index file if it changed."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                temp_path = self.index_path.with_suffix(".tmp")
+                temp_path.write_text(json.dumps(dict(self._entries)), encoding="utf-8")
+                os.replace(temp_path, self.index_path)
+            except OSError as exc:
+                log.warning(f"`files,state`Failed to write cover cache index: {exc}")
+                return
+            self._dirty = False
+
+    def purge(self) -> None:
+        """Delete every cached cover and the index."""
+        with self._lock:
+            if self.directory.exists():
+                for file in self.directory.iterdir():
+                    try:
+                        file.unlink()
+                    except OSError as exc:
+                        log.warning(f"`files,state`Failed to delete cache file {file}: {exc}")
+            self._entries = OrderedDict()
+            self._total_bytes = 0
+            self._dirty = False
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            entries = self._load()
+            return {"album_covers_on_disk": len(entries), "album_covers_disk_bytes": self._total_bytes}
+
+
+class CoverMemoryCache:
+    """Album covers of the current run in LRU order, bounded by max_bytes.
+
+    Evicted covers are still on disk, so an eviction costs a file read on
+    the next lookup rather than a download. A cover larger than the whole
+    budget is not kept in memory at all.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._covers: OrderedDict[tuple[str, str], tuple[bytes, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_stored = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, artist: str, album: str) -> tuple[bytes, str] | None:
+        key = (artist, album)
+        with self._lock:
+            cover = self._covers.get(key)
+            if cover is None:
+                self.misses += 1
+                return None
+            self._covers.move_to_end(key)
+            self.hits += 1
+            return cover
+
+    def put(self, artist: str, album: str, data: bytes, mime_type: str) -> None:
+        key = (artist, album)
+        with self._lock:
+            previous = self._covers.pop(key, None)
+            if previous is not None:
+                self.bytes_stored -= len(previous[0])
+            if len(data) > self.max_bytes:
+                return
+            self._covers[key] = (data, mime_type)
+            self.bytes_stored += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._covers and self.bytes_stored > self.max_bytes:
+            _, (evicted, _) = self._covers.popitem(last=False)
+            self.bytes_stored -= len(evicted)
+            self.evictions += 1
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._covers.clear()
+            self.bytes_stored = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._covers)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "album_covers_memory_bytes": self.bytes_stored,
+                "album_covers_memory_hits": self.hits,
+                "album_covers_memory_misses": self.misses,
+                "album_covers_memory_evictions": self.evictions,
+            }
+
+
+_disk_cache: CoverDiskCache | None = None
+_memory_cache: CoverMemoryCache | None = None
+_processor: CoverProcessor | None = None
+
+
+def get_cover_disk_cache() -> CoverDiskCache:
+    global _disk_cache
+    if _disk_cache is None:
+        _disk_cache = CoverDiskCache(
+            Path(cfg.paths.cache_dir) / COVER_CACHE_DIRNAME,
+            max_bytes=cfg.cache.cover_cache_mb * 1024 * 1024,
+        )
+    return _disk_cache
+
+
+def get_cover_memory_cache() -> CoverMemoryCache:
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = CoverMemoryCache(max_bytes=cfg.cache.cover_memory_mb * 1024 * 1024)
+    return _memory_cache
+
+
+def get_cover_processor() -> CoverProcessor:
+    global _processor
+    if _processor is None:
+        _processor = CoverProcessor(cfg.tags.cover_workers)
+    return _processor
+
+
+def close_cover_processor() -> None:
+    global _processor
+    processor, _processor = _processor, None
+    if processor is not None:
+        processor.close()
+
+
+def _get_cover_url(artist: str, album: str, size: str) -> str | None:
+    """Return the Last.FM cover URL; raises ProviderUnavailable while Last.FM is down."""
+    import kimp3.lastfm as lastfm
+
+    def load() -> str | None:
         album_obj = lastfm.network.get_album(artist, album)
-        size_mapping = {"small": 0, "medium": 1, "large": 2, "extralarge": 3, "mega": 4}
-        cover_url = album_obj.get_cover_image(size=size_mapping.get(size, 4))
+        try:
+            return resilience.call(
+                "lastfm", lambda: album_obj.get_cover_image(size=LASTFM_COVER_SIZES.get(size, 4))
+            ) or None
+        except (pylast.WSError, pylast.PyLastError) as exc:
+            log.info(f"`network,tags`Last.FM: No cover for {artist} - {album}: {exc}")
+            return None
+
+    return _cover_urls.get_or_load((artist, album, size), load)
+
+
+def _download_cover(url: str) -> bytes:
+    response = provider_client.download(
+        url,
+        provider="covers",
+        max_bytes=cfg.tags.cover_max_download_mb * 1024 * 1024,
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.content
+
+
+def get_album_cover(artist: str, album: str, size: str = "mega") -> Tuple[Optional[bytes], str]:
+    """Get album cover from the caches or download and encode it.
+
+    The encoded variant is cached on disk by the digest of its source URL
+    and format, so an image shared by several albums is encoded once.
+    """
+    memory_cache = get_cover_memory_cache()
+    cached = memory_cache.get(artist, album)
+    if cached is not None:
+        return cached
+
+    try:
+        cover_url = _get_cover_url(artist, album, size)
         if not cover_url:
             log.info(f"`network,tags`No cover found for {artist} - {album}")
             return None, ""
 
-        response = requests.get(cover_url, timeout=10)
-        response.raise_for_status()
-        image = Image.open(io.BytesIO(response.content))
-        output = io.BytesIO()
-        image.convert("RGB").save(output, format="JPEG", quality=85, optimize=True)
-        image_data = output.getvalue()
-
-        result = (image_data, "image/jpeg")
-        _album_cover_cache[cache_key] = result
-        _COVER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        cache_path.write_bytes(image_data)
-        return result
+        cover_format = CoverFormat.from_config(cfg.tags)
+        name = cover_format.variant_name(cover_url)
+        disk_cache = get_cover_disk_cache()
+        image_data = disk_cache.get(name)
+        if image_data is None:
+            image_data = get_cover_processor().encode(_download_cover(cover_url), cover_format)
+            disk_cache.put(name, image_data)
+
+        memory_cache.put(artist, album, image_data, "image/jpeg")
+        return image_data, "image/jpeg"
     except Exception as exc:
         log.error(f"`network,tags`Failed to get cover for {artist} - {album}: {exc}")
         return None, ""
 
 
 def clear_cover_cache() -> None:
-    _album_cover_cache.clear()
-    if _COVER_CACHE_DIR.exists():
-        for file in _COVER_CACHE_DIR.iterdir():
-            try:
-                file.unlink()
-            except OSError as exc:
-                log.warning(f"`files,state`Failed to delete cache file {file}: {exc}")
+    """Drop covers held in memory and flush the disk cache index.
+
+    Covers on disk are kept for later runs; use purge_cover_cache() to
+    delete them.
+    """
+    _cover_urls.clear()
+    if _memory_cache is not None:
+        _memory_cache.clear()
+    if _disk_cache is not None:
+        _disk_cache.save()
+
+
+def purge_cover_cache() -> None:
+    if _memory_cache is not None:
+        _memory_cache.clear()
+    get_cover_disk_cache().purge()
+    log.info("`state`Album cover cache purged")
 
 
 def cover_cache_size() -> int:
-    return len(_album_cover_cache)
+    return len(_memory_cache) if _memory_cache is not None else 0
+
+
+def cover_memory_cache_stats() -> dict[str, int]:
+    if _memory_cache is None:
+        return CoverMemoryCache(0).stats()
+    return _memory_cache.stats()
+
+
+def cover_disk_cache_stats() -> dict[str, int]:
+    if _disk_cache is None:
+        return {"album_covers_on_disk": 0, "album_covers_disk_bytes": 0}
+    return _disk_cache.stats()
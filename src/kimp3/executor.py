@@ -59,6 +59,13 @@ class ExecutionResult:
     def as_tuple(self) -> tuple[int, int, int]:
         return self.successes, self.failures, self.skips
 
+    def add(self, other: ExecutionResult) -> None:
+        """Add the counts and errors of other to this result."""
+        self.successes += other.successes
+        self.failures += other.failures
+        self.skips += other.skips
+        self.errors.extend(other.errors)
+
     def to_report_dict(self) -> dict[str, object]:
         return execution_result_to_report_dict(self)
 
@@ -298,23 +305,27 @@ class OperationExecutor:
             return
         try:
             existing_tags = get_backend(plan.path.target_path).read(
-                plan.path.target_path
+                plan.path.target_path, headers_only=True
             )
         except Exception as error:
             log.warning(f"`files,tags`Could not read existing target artwork for merge: {error}")
             return
-        existing_cover = existing_tags.album_cover
-        planned_cover = plan.tags.target_tags.album_cover
+        existing_cover = existing_tags.artwork
+        planned_cover = plan.tags.target_tags.artwork
         changed = False
         if existing_cover and (
-            not planned_cover or len(existing_cover) > len(planned_cover)
+            not planned_cover or existing_cover.size > planned_cover.size
         ):
-            plan.tags.target_tags.artwork = existing_tags.artwork
-            changed = True
-            log.info(
-                "`files,tags`Keeping larger existing artwork "
-                f"({len(existing_cover)} bytes > {len(planned_cover) if planned_cover else 0} bytes)"
-            )
+            # The target is replaced next, so its artwork must be loaded now.
+            try:
+                plan.tags.target_tags.artwork = existing_cover.materialize()
+                changed = True
+                log.info(
+                    "`files,tags`Keeping larger existing artwork "
+                    f"({existing_cover.size} bytes > {planned_cover.size if planned_cover else 0} bytes)"
+                )
+            except Exception as error:
+                log.warning(f"`files,tags`Could not load existing target artwork for merge: {error}")
         if existing_tags.lyrics:
             plan.tags.target_tags.lyrics = existing_tags.lyrics
             changed = True
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+# TagsSettings fields a GenreTaxonomy is compiled from.
+TAXONOMY_FIELDS = ("genres", "extended_genres", "genre_parents")
+
+
+class GenreCycleError(ValueError):
+    """genre_parents leads from a genre back to itself."""
+
+    def __init__(self, cycle: list[str]) -> None:
+        super().__init__(f"genre_parents contains a cycle: {' -> '.join(cycle)}")
+        self.cycle = cycle
+
+
+def genre_key(name: str) -> str:
+    """Return the lookup key of a genre name: casefolded, single spaces."""
+    return " ".join(name.casefold().split())
+
+
+def find_genre_cycle(parents: Mapping[str, str]) -> list[str] | None:
+    """Return the first cycle in parents as [a, b, ..., a], or None."""
+    edges = {genre_key(child): genre_key(parent) for child, parent in parents.items()}
+    finished: set[str] = set()
+    for start in edges:
+        path: list[str] = []
+        on_path: set[str] = set()
+        node: str | None = start
+        while node is not None and node not in finished:
+            if node in on_path:
+                return path[path.index(node):] + [node]
+            path.append(node)
+            on_path.add(node)
+            node = edges.get(node)
+        finished.update(path)
+    return None
+
+
+class GenreTaxonomy:
+    """Genre hierarchy compiled from genres, extended_genres and genre_parents.
+
+    Every genre has at most one parent, so the hierarchy is a forest. The
+    ancestor chain of each genre, its depth and its nearest main genre
+    (one listed in genres) are computed once, so promoting a sub-genre
+    through any number of levels is a dict lookup. Names are matched
+    case- and whitespace-insensitively and reported in their configured
+    spelling, the first one seen in genres, extended_genres, genre_parents.
+    """
+
+    def __init__(
+        self,
+        genres: Iterable[str],
+        extended_genres: Iterable[str] = (),
+        parents: Mapping[str, str] | None = None,
+    ) -> None:
+        parents = parents or {}
+        cycle = find_genre_cycle(parents)
+        if cycle:
+            raise GenreCycleError(cycle)
+
+        genres = list(genres)
+        self._canonical: dict[str, str] = {}
+        for name in [*genres, *extended_genres, *parents, *parents.values()]:
+            self._canonical.setdefault(genre_key(name), name)
+
+        self.main_genres = frozenset(self._canonical[genre_key(name)] for name in genres)
+        self.public_genres = self.main_genres | frozenset(
+            self._canonical[genre_key(name)] for name in [*extended_genres, *parents]
+        )
+        self._parents = {
+            self._canonical[genre_key(child)]: self._canonical[genre_key(parent)]
+            for child, parent in parents.items()
+        }
+        self._ancestors: dict[str, tuple[str, ...]] = {}
+        for name in self._canonical.values():
+            self._close(name)
+        self._main_ancestor: dict[str, tuple[str, int]] = {}
+        for name, ancestors in self._ancestors.items():
+            for levels, ancestor in enumerate(ancestors, start=1):
+                if ancestor in self.main_genres:
+                    self._main_ancestor[name] = (ancestor, levels)
+                    break
+
+    def _close(self, name: str) -> tuple[str, ...]:
+        chain: list[str] = []
+        node = name
+        while node not in self._ancestors:
+            parent = self._parents.get(node)
+            if parent is None:
+                self._ancestors[node] = ()
+                break
+            chain.append(node)
+            node = parent
+        ancestors = self._ancestors[node]
+        for child in reversed(chain):
+            ancestors = (self._parents[child], *ancestors)
+            self._ancestors[child] = ancestors
+        return self._ancestors[name]
+
+    def canonical(self, name: str) -> str | None:
+        """Return the configured spelling of name, or None for an unknown genre."""
+        return self._canonical.get(genre_key(name))
+
+    def is_main(self, name: str) -> bool:
+        return self.canonical(name) in self.main_genres
+
+    def is_public(self, name: str) -> bool:
+        return self.canonical(name) in self.public_genres
+
+    def ancestors(self, name: str) -> tuple[str, ...]:
+        """Return the ancestors of name, nearest first."""
+        canonical = self.canonical(name)
+        return self._ancestors.get(canonical, ()) if canonical else ()
+
+    def depth(self, name: str) -> int:
+        """Return the number of levels above name; 0 for roots and unknown names."""
+        return len(self.ancestors(name))
+
+    def main_ancestor(self, name: str) -> tuple[str, int] | None:
+        """Return the nearest main genre above name and how many levels up it is."""
+        canonical = self.canonical(name)
+        return self._main_ancestor.get(canonical) if canonical else None
+
+    def __len__(self) -> int:
+        return len(self._canonical)
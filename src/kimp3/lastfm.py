@@ -1,32 +1,91 @@
 from __future__ import annotations
 
 import logging
+import threading
 from datetime import date
 from hashlib import sha256
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
 
 import pylast
 from rich.pretty import pretty_repr
 
-from kimp3 import musicbrainz
+from kimp3 import musicbrainz, resilience
+from kimp3.album_matching import AlbumMatcher
 from kimp3.config import APP_NAME, cfg
-from kimp3.covers import clear_cover_cache, cover_cache_size, get_album_cover
-from kimp3.lyrics import get_lyrics
-from kimp3.models import AbstractSongDir, AudioTags, LyricsLookup
-from kimp3.strings_operations import album_title_similarity
-from kimp3.tag_processing import NUMBER_OF_TAGS, TAG_MIN_WEIGHT, process_lastfm_tags
+from kimp3.covers import (
+    clear_cover_cache,
+    cover_cache_size,
+    cover_disk_cache_stats,
+    cover_memory_cache_stats,
+    get_album_cover,
+)
+from kimp3.lyrics import clear_lyrics_cache, get_lyrics, lyrics_cache_size
+from kimp3.metadata_cache import ProviderCache, get_metadata_cache_stats
+from kimp3.models import AbstractSongDir, AudioTags, LyricsLookup, artwork_store
+from kimp3.rate_limit import install_pylast_limiter
+from kimp3.resilience import ProviderUnavailable
+from kimp3.tag_processing import (
+    NUMBER_OF_TAGS,
+    TAG_MIN_WEIGHT,
+    clear_llm_cache,
+    llm_cache_size,
+    process_lastfm_tags,
+)
 
 log = logging.getLogger(f"{APP_NAME}.{__name__}")
+T = TypeVar("T")
 network: pylast.LastFMNetwork
 LASTFM_ERRORS = (pylast.WSError, pylast.PyLastError)
+LASTFM_LOOKUP_ERRORS = LASTFM_ERRORS + (ProviderUnavailable,)
 
-_artist_corrections: Dict[str, str] = {}
-_album_corrections: Dict[Tuple[str, str], str] = {}
-_artist_albums_cache: Dict[str, List[pylast.TopItem]] = {}
-_album_tracks_cache: Dict[Tuple[str, str], List[pylast.Track]] = {}
-_genre_cache: Dict[Tuple[str, str], str] = {}
-_artist_tags_cache: Dict[str, List[pylast.TopItem]] = {}
-_album_tags_cache: Dict[Tuple[str, str], List[pylast.TopItem]] = {}
+
+def _lastfm_call(function: Callable[[], T]) -> T:
+    """Run a pylast call with retries and the Last.FM circuit breaker."""
+    return resilience.call("lastfm", function)
+
+
+
+def _encode_album_items(items: List[pylast.TopItem]) -> list:
+    return [[item.item.artist.name, item.item.title, int(item.weight)] for item in items]
+
+
+def _decode_album_items(rows: list) -> List[pylast.TopItem]:
+    return [pylast.TopItem(pylast.Album(artist, title, network), weight) for artist, title, weight in rows]
+
+
+def _encode_tracks(tracks: List[pylast.Track]) -> list:
+    return [[track.artist.name, track.title] for track in tracks]
+
+
+def _decode_tracks(rows: list) -> List[pylast.Track]:
+    return [pylast.Track(artist, title, network) for artist, title in rows]
+
+
+def _encode_tag_items(items: List[pylast.TopItem]) -> list:
+    return [[item.item.get_name(), int(item.weight)] for item in items]
+
+
+def _decode_tag_items(rows: list) -> List[pylast.TopItem]:
+    return [pylast.TopItem(pylast.Tag(name, network), weight) for name, weight in rows]
+
+
+_artist_corrections = ProviderCache("lastfm.artist_corrections")
+_album_corrections = ProviderCache("lastfm.album_corrections")
+_artist_albums_cache = ProviderCache(
+    "lastfm.artist_albums", encode=_encode_album_items, decode=_decode_album_items
+)
+_album_tracks_cache = ProviderCache(
+    "lastfm.album_tracks", encode=_encode_tracks, decode=_decode_tracks
+)
+_genre_cache = ProviderCache("lastfm.genres")
+_artist_tags_cache = ProviderCache(
+    "lastfm.artist_tags", encode=_encode_tag_items, decode=_decode_tag_items
+)
+_album_tags_cache = ProviderCache(
+    "lastfm.album_tags", encode=_encode_tag_items, decode=_decode_tag_items
+)
+# Indexes the album lists above; an index is rebuilt when its list is reloaded.
+_album_matcher = AlbumMatcher()
 
 
 def _lyrics_retry_days(artist: str, title: str) -> int:
@@ -50,79 +109,62 @@ def _lyrics_lookup_is_fresh(
     return (date.today() - lookup.checked_at).days < _lyrics_retry_days(artist, title)
 
 
-class TaggedTrack:
+class AlbumResolution:
+    """Album-level Last.FM data shared by the tracks of one album.
+
+    Artist and album-title corrections and the album track list are
+    resolved when the resolution is built. The track list comes from the
+    matching MusicBrainz release when the directory is an album and
+    MusicBrainz supplies its metadata, so track and disc numbers of the
+    whole album cost a single request; Last.FM album tracks are fetched
+    otherwise. Artist tags, album tags and the cover are fetched on first
+    use, so albums whose tracks already carry them cost no extra calls.
+    """
+
     def __init__(self, tags: AudioTags, songdir: AbstractSongDir):
         self.tags = tags
         self.songdir = songdir
 
         self.artist: pylast.Artist = network.get_artist(tags.artist)
         self.artist.name = self._correct_artist_name(self.artist)
-
-        self.track: pylast.Track = network.get_track(
-            self.artist.name or tags.artist, tags.title
-        )
-        self.track.title = self._correct_track_title(self.track)
-
         self.album: pylast.Album = network.get_album(
             self.artist.name or tags.artist, tags.album
         )
         self.album_artist: pylast.Artist = network.get_artist(
             tags.album_artist or tags.artist
         )
-        self.track_number: Optional[int] = tags.track_number
-        self.total_tracks: Optional[int] = tags.total_tracks
-        self.disc_number: Optional[int] = tags.disc_number
-        self.total_discs: Optional[int] = tags.total_discs
-        self.year: Optional[int] = tags.year
-        self.update_album_data()
-
-        self.genres: list[str] = list(tags.genres)
-        self.lastfm_tags: list[str] = list(tags.lastfm_tags)
-        self.update_tags()
-
-        self.rating: str = tags.rating
-        self.lyrics: Optional[str] = tags.lyrics_text
-        if cfg.tags.fetch_lyrics:
-            self.update_lyrics()
-        if cfg.tags.fetch_album_cover:
-            self.update_cover()
-
-    def __repr__(self) -> str:
-        track_info = {
-            "artist": self.artist.name if self.artist else None,
-            "album": self.album.title if self.album else None,
-            "album_artist": self.album_artist.name if self.album_artist else None,
-            "title": self.track.title if self.track else None,
-            "track": (
-                f"{self.track_number}/{self.total_tracks}"
-                if self.track_number
-                else None
-            ),
-            "disc": (
-                f"{self.disc_number}/{self.total_discs}" if self.disc_number else None
-            ),
-            "year": self.year if self.year else None,
-            "genre": self.genres if self.genres else None,
-            "lastfm_tags": self.lastfm_tags if self.lastfm_tags else None,
-            "rating": self.rating if self.rating else None,
-        }
-        return pretty_repr(
-            {key: value for key, value in track_info.items() if value is not None}
+        self.album_artist.name = self._correct_artist_name(self.album_artist)
+        self.album.title = self._correct_album_name(self.album)
+        self.release: Optional[musicbrainz.AlbumRelease] = (
+            _get_album_release(self.artist.name or tags.artist, tags.album, songdir.track_count)
+            if getattr(songdir, "is_album", False)
+            else None
+        )
+        self.tracks: List[pylast.Track] = (
+            [] if self.release else _get_album_tracks(self.album)
         )
 
+        self._lock = threading.Lock()
+        self._artist_tags: Optional[List[pylast.TopItem]] = None
+        self._album_tags: Optional[List[pylast.TopItem]] = None
+        self._cover: Optional[Tuple[Optional[bytes], str]] = None
+
     def _correct_artist_name(self, artist: pylast.Artist) -> Optional[str]:
         if not artist or not artist.name:
             log.warning(f"`network,tags`Artist doesn't exist - {artist}")
             return None
-        if artist.name in _artist_corrections:
-            return _artist_corrections[artist.name]
+
+        def load() -> str:
+            try:
+                return _lastfm_call(artist.get_correction) or artist.name
+            except LASTFM_ERRORS:
+                log.warning(f"`network,tags`Last.FM: Artist not found - {artist.name}")
+                return artist.name
+
         try:
-            corrected: str = artist.get_correction() or artist.name
-            _artist_corrections[artist.name] = corrected
-            artist.name = corrected
-        except LASTFM_ERRORS:
-            log.warning(f"`network,tags`Last.FM: Artist not found - {artist.name}")
-            _artist_corrections[artist.name] = artist.name
+            artist.name = _artist_corrections.get_or_load(artist.name, load)
+        except ProviderUnavailable as error:
+            log.warning(f"`network,tags`Artist correction skipped for {artist.name}: {error}")
         return artist.name
 
     def _correct_album_name(self, album: pylast.Album) -> Optional[str]:
@@ -130,29 +172,35 @@ class TaggedTrack:
             log.warning(f"`network,tags`Album doesn't have enough data - {album}")
             return None
 
-        cache_key = (album.artist.name, album.title)
-        if cache_key in _album_corrections:
-            return _album_corrections[cache_key]
-
-        try:
-            corrected, best_album, source = self._find_album_correction(
-                album.artist.name
-            )
+        def load() -> str:
+            try:
+                corrected, best_album, source = self._find_album_correction(
+                    album.artist.name
+                )
+            except LASTFM_ERRORS:
+                log.warning(
+                    f"`network,tags`Last.FM: Album not found - {self.tags.artist} - {self.tags.album}"
+                )
+                return album.title
             if best_album and self.songdir.track_count:
                 self._warn_track_count_mismatch(best_album, source)
+            return corrected
 
-            _album_corrections[cache_key] = corrected
-            album.title = corrected
-        except LASTFM_ERRORS:
-            log.warning(
-                f"`network,tags`Last.FM: Album not found - {self.tags.artist} - {self.tags.album}"
-            )
-            _album_corrections[cache_key] = album.title
+        cache_key = (album.artist.name, album.title)
+        try:
+            album.title = _album_corrections.get_or_load(cache_key, load)
+        except ProviderUnavailable as error:
+            log.warning(f"`network,tags`Album correction skipped for {album.title}: {error}")
         return album.title
 
     def _find_album_correction(
         self, artist_name: str
     ) -> tuple[str, object | None, str]:
+        """Return the best album match from the configured sources.
+
+        Raises ProviderUnavailable when nothing matched and a source could not
+        be asked, so the uncorrected title is not cached.
+        """
         source_order = {
             "musicbrainz_first": ["musicbrainz", "lastfm"],
             "lastfm_first": ["lastfm", "musicbrainz"],
@@ -160,11 +208,18 @@ class TaggedTrack:
             "lastfm_only": ["lastfm"],
         }[cfg.tags.album_metadata_source]
 
+        unavailable: ProviderUnavailable | None = None
         for source in source_order:
-            if source == "musicbrainz":
-                match = _best_musicbrainz_album_match(artist_name, self.tags.album)
-            else:
-                match = _best_lastfm_album_match(artist_name, self.tags.album)
+            try:
+                if source == "musicbrainz":
+                    match = _best_musicbrainz_album_match(
+                        artist_name, self.tags.album, self.songdir.track_count
+                    )
+                else:
+                    match = _best_lastfm_album_match(artist_name, self.tags.album)
+            except ProviderUnavailable as error:
+                unavailable = unavailable or error
+                continue
             if match:
                 title, album_obj, score = match
                 log.debug(
@@ -172,6 +227,8 @@ class TaggedTrack:
                 )
                 return title, album_obj, source
 
+        if unavailable is not None:
+            raise unavailable
         return self.tags.album, None, "none"
 
     def _warn_track_count_mismatch(self, best_album: object, source: str) -> None:
@@ -179,8 +236,8 @@ class TaggedTrack:
         track_count = getattr(best_album, "track_count", None)
         if track_count is None and isinstance(best_album, pylast.Album):
             try:
-                track_count = len(list(best_album.get_tracks()))
-            except LASTFM_ERRORS:
+                track_count = len(_lastfm_call(lambda: list(best_album.get_tracks())))
+            except LASTFM_LOOKUP_ERRORS:
                 log.warning(
                     f"`network,tags`Failed to get track count for album '{title}'"
                 )
@@ -191,12 +248,121 @@ class TaggedTrack:
                 f"`network,tags`Local: {self.songdir.track_count}, {source}: {track_count}"
             )
 
+    def artist_tags(self) -> List[pylast.TopItem]:
+        with self._lock:
+            if self._artist_tags is None:
+                self._artist_tags = _get_tags(self.artist, min_weight=50)
+            return self._artist_tags
+
+    def album_tags(self) -> List[pylast.TopItem]:
+        with self._lock:
+            if self._album_tags is None:
+                self._album_tags = _get_tags(self.album, min_weight=10)
+            return self._album_tags
+
+    def cover(self) -> Tuple[Optional[bytes], str]:
+        with self._lock:
+            if self._cover is None:
+                self._cover = get_album_cover(
+                    self.artist.name or self.tags.artist,
+                    self.album.title or self.tags.album,
+                )
+            return self._cover
+
+
+class AlbumResolver:
+    """Builds one AlbumResolution per album key of an album directory.
+
+    Tracks of a regular album share one key; compilation tracks are keyed
+    by their own artist. Concurrent callers for the same key wait for the
+    first resolution instead of repeating its lookups.
+    """
+
+    def __init__(self, songdir: AbstractSongDir):
+        self.songdir = songdir
+        self._resolutions: Dict[Tuple[str, str, str], AlbumResolution] = {}
+        self._key_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, tags: AudioTags) -> AlbumResolution:
+        key = (tags.artist, tags.album_artist or tags.artist, tags.album)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            if key not in self._resolutions:
+                self._resolutions[key] = AlbumResolution(tags, self.songdir)
+            return self._resolutions[key]
+
+    def __len__(self) -> int:
+        return len(self._resolutions)
+
+
+class TaggedTrack:
+    def __init__(
+        self,
+        tags: AudioTags,
+        songdir: AbstractSongDir,
+        album: Optional[AlbumResolution] = None,
+    ):
+        self.tags = tags
+        self.songdir = songdir
+        self.resolution = album or AlbumResolution(tags, songdir)
+
+        self.artist: pylast.Artist = self.resolution.artist
+        self.track: pylast.Track = network.get_track(
+            self.artist.name or tags.artist, tags.title
+        )
+        self.track.title = self._correct_track_title(self.track)
+
+        self.album: pylast.Album = self.resolution.album
+        self.album_artist: pylast.Artist = self.resolution.album_artist
+        self.track_number: Optional[int] = tags.track_number
+        self.total_tracks: Optional[int] = tags.total_tracks
+        self.disc_number: Optional[int] = tags.disc_number
+        self.total_discs: Optional[int] = tags.total_discs
+        self.year: Optional[int] = tags.year
+        self.update_album_data()
+
+        self.genres: list[str] = list(tags.genres)
+        self.lastfm_tags: list[str] = list(tags.lastfm_tags)
+        self.update_tags()
+
+        self.rating: str = tags.rating
+        self.lyrics: Optional[str] = tags.lyrics_text
+        if cfg.tags.fetch_lyrics:
+            self.update_lyrics()
+        if cfg.tags.fetch_album_cover:
+            self.update_cover()
+
+    def __repr__(self) -> str:
+        track_info = {
+            "artist": self.artist.name if self.artist else None,
+            "album": self.album.title if self.album else None,
+            "album_artist": self.album_artist.name if self.album_artist else None,
+            "title": self.track.title if self.track else None,
+            "track": (
+                f"{self.track_number}/{self.total_tracks}"
+                if self.track_number
+                else None
+            ),
+            "disc": (
+                f"{self.disc_number}/{self.total_discs}" if self.disc_number else None
+            ),
+            "year": self.year if self.year else None,
+            "genre": self.genres if self.genres else None,
+            "lastfm_tags": self.lastfm_tags if self.lastfm_tags else None,
+            "rating": self.rating if self.rating else None,
+        }
+        return pretty_repr(
+            {key: value for key, value in track_info.items() if value is not None}
+        )
+
     def _correct_track_title(self, track: pylast.Track) -> str:
         try:
-            title = track.get_correction() or track.title
+            title = _lastfm_call(track.get_correction) or track.title
             if title == self.artist.name and title != self.tags.title:
                 title = self.tags.title
-        except LASTFM_ERRORS:
+        except LASTFM_LOOKUP_ERRORS:
             log.warning(
                 f"`network,tags`Last.FM: Track not found - {self.artist.name} - {self.tags.title}"
             )
@@ -204,10 +370,19 @@ class TaggedTrack:
         return title
 
     def update_album_data(self) -> None:
-        self.album_artist.name = self._correct_artist_name(self.album_artist)
-        self.album.title = self._correct_album_name(self.album)
-
-        tracks = _get_album_tracks(self.album)
+        release = self.resolution.release
+        if release is not None:
+            if self.songdir.track_count and release.track_count != self.songdir.track_count:
+                return
+            track = release.find_track(self.track.title or self.tags.title)
+            if track is None:
+                return
+            self.track_number = track.position
+            self.total_tracks = release.disc_track_count(track.disc_number)
+            self.disc_number = track.disc_number
+            self.total_discs = release.total_discs
+            return
+        tracks = self.resolution.tracks
         if not tracks:
             return
         self.total_tracks = len(tracks)
@@ -223,8 +398,8 @@ class TaggedTrack:
             )
             return
 
-        artist_tags = _get_tags(self.artist, min_weight=50)
-        album_tags = _get_tags(self.album, min_weight=10)
+        artist_tags = self.resolution.artist_tags()
+        album_tags = self.resolution.album_tags()
         track_tags = _get_tags(self.track, min_weight=5)
         self.genres, self.lastfm_tags = process_lastfm_tags(
             artist_tags,
@@ -234,17 +409,17 @@ class TaggedTrack:
             existing_tags=self.lastfm_tags,
             artist_name=self.artist.name or self.tags.artist,
             track_title=self.track.title or self.tags.title,
+            llm_artist=self.tags.artist,
+            llm_title=self.tags.title,
         )
 
     def update_cover(self) -> None:
-        if cfg.tags.skip_existing_cover and self.tags.album_cover:
+        if cfg.tags.skip_existing_cover and self.tags.artwork:
             log.debug(
                 f"`tags`Skipping cover fetch for {self.artist.name} - {self.album.title} (cover already exists)"
             )
             return
-        cover_data, mime_type = get_album_cover(
-            self.artist.name or self.tags.artist, self.album.title or self.tags.album
-        )
+        cover_data, mime_type = self.resolution.cover()
         if cover_data:
             self.tags.album_cover = cover_data
             self.tags.album_cover_mime = mime_type
@@ -264,7 +439,11 @@ class TaggedTrack:
                 f'`tags`Skipping lyrics fetch for "{artist} - {title}" (recent not_found marker exists)'
             )
             return
-        lyrics = get_lyrics(artist, title)
+        try:
+            lyrics = get_lyrics(artist, title)
+        except ProviderUnavailable as error:
+            log.warning(f'`network,tags`Lyrics lookup skipped for "{artist} - {title}": {error}')
+            return
         if lyrics:
             self.lyrics = lyrics
             self.tags.lyrics_lookup = None
@@ -287,8 +466,7 @@ class TaggedTrack:
             genres=self.genres,
             lastfm_tags=self.lastfm_tags,
             rating=self.rating,
-            album_cover=self.tags.album_cover,
-            album_cover_mime=self.tags.album_cover_mime,
+            artwork=self.tags.artwork,
             lyrics=self.lyrics,
             lyrics_lookup=None if self.lyrics else self.tags.lyrics_lookup,
         )
@@ -311,6 +489,7 @@ def init_lastfm() -> None:
             api_key=cfg.tags.lastfm_api_key,
             api_secret=cfg.tags.lastfm_api_secret,
         )
+    install_pylast_limiter(network)
     log.info("`network,tags`Last.FM login")
 
 
@@ -319,13 +498,11 @@ def _get_album_tracks(album: pylast.Album) -> List[pylast.Track]:
         log.warning(f"`network,tags`Album doesn't have enough data - {album}")
         return []
     cache_key = (album.artist.name, album.title)
-    if cache_key in _album_tracks_cache:
-        return _album_tracks_cache[cache_key]
     try:
-        tracks = list(album.get_tracks())
-        _album_tracks_cache[cache_key] = tracks
-        return tracks
-    except LASTFM_ERRORS:
+        return _album_tracks_cache.get_or_load(
+            cache_key, lambda: _lastfm_call(lambda: list(album.get_tracks()))
+        )
+    except LASTFM_LOOKUP_ERRORS:
         log.warning(
             f"`network,tags`Last.FM: Failed to get album tracks - {album.artist.name} - {album.title}"
         )
@@ -333,12 +510,12 @@ def _get_album_tracks(album: pylast.Album) -> List[pylast.Track]:
 
 
 def _get_artist_albums(artist_name: str) -> List[pylast.TopItem]:
-    if artist_name in _artist_albums_cache:
-        return _artist_albums_cache[artist_name]
+    """Return top albums of an artist; raises ProviderUnavailable while Last.FM is down."""
     try:
-        top_albums = list(network.get_artist(artist_name).get_top_albums())
-        _artist_albums_cache[artist_name] = top_albums
-        return top_albums
+        return _artist_albums_cache.get_or_load(
+            artist_name,
+            lambda: _lastfm_call(lambda: list(network.get_artist(artist_name).get_top_albums())),
+        )
     except LASTFM_ERRORS:
         log.warning(
             f"`network,tags`Last.FM: Failed to get artist albums - {artist_name}"
@@ -349,31 +526,83 @@ def _get_artist_albums(artist_name: str) -> List[pylast.TopItem]:
 def _best_lastfm_album_match(
     artist_name: str, album_title: str
 ) -> tuple[str, pylast.Album, float] | None:
-    best_score = 0.0
-    best_album = None
-    for iter_album in _get_artist_albums(artist_name):
-        current_score = album_title_similarity(iter_album.item.title, album_title)
-        if current_score > best_score:
-            best_score = current_score
-            best_album = iter_album.item
-    if not best_album:
+    match = _album_matcher.best_match(
+        ("lastfm", artist_name),
+        _get_artist_albums(artist_name),
+        lambda top_item: top_item.item.title,
+        album_title,
+    )
+    if not match:
+        return None
+    top_item, score = match
+    return top_item.item.title, top_item.item, score
+
+
+def _get_album_release(
+    artist_name: str, album_title: str, track_count: Optional[int]
+) -> Optional[musicbrainz.AlbumRelease]:
+    """Return the MusicBrainz release matching the album, with its track list.
+
+    Nothing is looked up when Last.FM is the only source, or when it comes
+    first and matched the album. The candidates are the ones the album
+    correction already looked up, so only the release itself costs a
+    request, and that once per album.
+    """
+    source = cfg.tags.album_metadata_source
+    if source == "lastfm_only" or not artist_name or not album_title:
+        return None
+    if source == "lastfm_first" and _lastfm_album_matched(artist_name, album_title):
         return None
-    return best_album.title, best_album, best_score
+    try:
+        match = _best_musicbrainz_album_match(artist_name, album_title, track_count)
+        if not match:
+            return None
+        release = musicbrainz.get_album_release(match[1], track_count)
+    except ProviderUnavailable as error:
+        log.warning(f"`network,tags`MusicBrainz release lookup skipped for {album_title}: {error}")
+        return None
+    if release is None or not release.tracks:
+        return None
+    log.debug(
+        f"`network,tags`MusicBrainz release {release.mbid} for {artist_name} - {album_title}: "
+        f"{release.track_count} tracks on {release.total_discs} disc(s)"
+    )
+    return release
+
+
+def _lastfm_album_matched(artist_name: str, album_title: str) -> bool:
+    try:
+        return _best_lastfm_album_match(artist_name, album_title) is not None
+    except ProviderUnavailable:
+        return False
 
 
 def _best_musicbrainz_album_match(
-    artist_name: str, album_title: str
+    artist_name: str, album_title: str, track_count: Optional[int] = None
 ) -> tuple[str, musicbrainz.AlbumCandidate, float] | None:
-    best_score = 0.0
-    best_album = None
-    for iter_album in musicbrainz.get_artist_albums(artist_name, album_title):
-        current_score = album_title_similarity(iter_album.title, album_title)
-        if current_score > best_score:
-            best_score = current_score
-            best_album = iter_album
-    if not best_album:
+    match = _album_matcher.best_match(
+        ("musicbrainz", artist_name, album_title, track_count or 0),
+        musicbrainz.get_artist_albums(artist_name, album_title, track_count),
+        lambda candidate: candidate.title,
+        album_title,
+    )
+    if not match:
         return None
-    return best_album.title, best_album, best_score
+    candidate, score = match
+    return candidate.title, candidate, score
+
+
+def _fetch_top_tags(
+    obj: pylast.Album | pylast.Artist | pylast.Track, min_weight: int
+) -> List[pylast.TopItem]:
+    lastfm_tags = []
+    for tag_obj in _lastfm_call(obj.get_top_tags):
+        if int(tag_obj.weight) < min_weight:
+            continue
+        if len(tag_obj.item.get_name()) > 50:
+            continue
+        lastfm_tags.append(tag_obj)
+    return lastfm_tags[0 : NUMBER_OF_TAGS * 2]
 
 
 def _get_tags(
@@ -388,46 +617,29 @@ def _get_tags(
         cache_key = (obj.artist.name, obj.title)
         cache = _album_tags_cache
 
-    if cache_key is not None and cache is not None and cache_key in cache:
-        return cache[cache_key]  # type: ignore[index]
-
     try:
-        lastfm_raw_tags = obj.get_top_tags()
-    except LASTFM_ERRORS:
+        if cache is None:
+            return _fetch_top_tags(obj, min_weight)
+        return cache.get_or_load(cache_key, lambda: _fetch_top_tags(obj, min_weight))
+    except LASTFM_LOOKUP_ERRORS:
         log.warning("`network,tags`Last.FM: Failed to get tags")
         return []
 
-    lastfm_tags = []
-    for tag_obj in lastfm_raw_tags:
-        if int(tag_obj.weight) < min_weight:
-            continue
-        if len(tag_obj.item.get_name()) > 50:
-            continue
-        lastfm_tags.append(tag_obj)
-
-    result = lastfm_tags[0 : NUMBER_OF_TAGS * 2]
-    if cache is not None and cache_key is not None:
-        cache[cache_key] = result  # type: ignore[index]
-    return result
-
 
 def get_genre(tags: AudioTags) -> str:
-    cache_key = (tags.album_artist, tags.album)
-    if cache_key in _genre_cache:
-        return _genre_cache[cache_key]
-    try:
-        album = network.get_album(tags.album_artist, tags.album)
-        artist = network.get_artist(tags.artist)
-        names = [tag.item.get_name() for tag in _get_tags(album) + _get_tags(artist)]
-        genre = ", ".join(dict.fromkeys(names[:5])).title()
-        _genre_cache[cache_key] = genre
-        return genre
-    except LASTFM_ERRORS:
-        log.warning(
-            f"`network,tags`Last.FM: Failed to get genre for {tags.artist} - {tags.album}"
-        )
-        _genre_cache[cache_key] = ""
-        return ""
+    def load() -> str:
+        try:
+            album = network.get_album(tags.album_artist, tags.album)
+            artist = network.get_artist(tags.artist)
+            names = [tag.item.get_name() for tag in _get_tags(album) + _get_tags(artist)]
+            return ", ".join(dict.fromkeys(names[:5])).title()
+        except LASTFM_ERRORS:
+            log.warning(
+                f"`network,tags`Last.FM: Failed to get genre for {tags.artist} - {tags.album}"
+            )
+            return ""
+
+    return _genre_cache.get_or_load((tags.album_artist, tags.album), load)
 
 
 def clear_cache() -> None:
@@ -439,7 +651,11 @@ def clear_cache() -> None:
     _artist_tags_cache.clear()
     _album_tags_cache.clear()
     musicbrainz.clear_cache()
+    clear_lyrics_cache()
+    clear_llm_cache()
+    _album_matcher.clear()
     clear_cover_cache()
+    artwork_store.clear()
     log.debug("`state`All Last.FM caches cleared")
 
 
@@ -452,6 +668,13 @@ def get_cache_stats() -> Dict[str, int]:
         "album_tracks": len(_album_tracks_cache),
         "artist_tags": len(_artist_tags_cache),
         "album_tags": len(_album_tags_cache),
+        "lyrics": lyrics_cache_size(),
+        "llm_suggestions": llm_cache_size(),
         "album_covers": cover_cache_size(),
+        **cover_memory_cache_stats(),
+        **cover_disk_cache_stats(),
+        **artwork_store.stats(),
         **musicbrainz.get_cache_stats(),
+        **_album_matcher.stats(),
+        **get_metadata_cache_stats(),
     }
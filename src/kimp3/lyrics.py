@@ -1,17 +1,123 @@
 from __future__ import annotations
 
+import codecs
 import logging
 import re
-from typing import Optional
-
-import requests
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import Callable, Optional
 
+from kimp3 import provider_client
 from kimp3.config import APP_NAME, cfg
-from kimp3.strings_operations import string_similarity
+from kimp3.metadata_cache import ProviderCache
+from kimp3.resilience import ProviderUnavailable
+from kimp3.strings_operations import normalize_string, string_similarity
 
 
 log = logging.getLogger(f"{APP_NAME}.{__name__}")
 
+_lyrics_cache = ProviderCache("lyrics")
+_race_pool: ThreadPoolExecutor | None = None
+_race_pool_lock = threading.Lock()
+
+
+VOID_ELEMENTS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+)
+RAW_TEXT_ELEMENTS = frozenset({"script", "style", "template"})
+
+
+class GeniusLyricsParser(HTMLParser):
+    """Collects the text of Genius data-lyrics-container blocks from a page fed in chunks.
+
+    Text is gathered line by line, the same stripped strings the page would
+    show, and joined once at the end. A run of text may arrive in several
+    handle_data() calls when it straddles a chunk boundary, so it is
+    buffered and only becomes a line at the next tag. The containers are siblings, so once
+    the element holding them is closed the rest of the page is skipped and
+    feed_bytes() returns True to stop the download.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._start()
+
+    def _start(self) -> None:
+        self.reset()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._open_tags: list[str] = []
+        self._container_depth = 0
+        self._parent_depth = 0
+        self._raw_text_depth = 0
+        self._lines: list[str] = []
+        self._pending: list[str] = []
+        self.done = False
+
+    def restart(self) -> Callable[[bytes], bool]:
+        """Discard what was read so far and return the chunk callback."""
+        self._start()
+        return self.feed_bytes
+
+    def feed_bytes(self, chunk: bytes) -> bool:
+        if not self.done:
+            self.feed(self._decoder.decode(chunk))
+        return self.done
+
+    def _flush(self) -> None:
+        if self._pending:
+            text = "".join(self._pending).strip()
+            self._pending.clear()
+            if text:
+                self._lines.append(text)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush()
+        if self.done or tag in VOID_ELEMENTS:
+            return
+        self._open_tags.append(tag)
+        depth = len(self._open_tags)
+        if tag in RAW_TEXT_ELEMENTS and not self._raw_text_depth:
+            self._raw_text_depth = depth
+        if not self._container_depth and ("data-lyrics-container", "true") in attrs:
+            self._container_depth = depth
+            self._parent_depth = depth - 1
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush()
+
+    def handle_endtag(self, tag: str) -> None:
+        """Close tag and any elements left open inside it; stray end tags are ignored."""
+        self._flush()
+        if self.done or tag not in self._open_tags:
+            return
+        while self._open_tags:
+            depth = len(self._open_tags)
+            closed = self._open_tags.pop()
+            if depth == self._raw_text_depth:
+                self._raw_text_depth = 0
+            if depth == self._container_depth:
+                self._container_depth = 0
+            elif self._lines and not self._container_depth and depth == self._parent_depth:
+                self.done = True
+            if closed == tag:
+                return
+
+    def handle_data(self, data: str) -> None:
+        if self._container_depth and not self._raw_text_depth:
+            self._pending.append(data)
+
+    def text(self) -> Optional[str]:
+        self._flush()
+        return "\n".join(self._lines) or None
+
+
+def extract_genius_lyrics(html: str) -> Optional[str]:
+    """Return the lyrics text of a complete Genius song page."""
+    parser = GeniusLyricsParser()
+    parser.feed(html)
+    return parser.text()
+
 
 def _clean_title_for_comparison(title: str) -> str:
     return re.sub(r"\s*\([^)]*\)", "", title).strip()
@@ -28,8 +134,9 @@ def _get_lyrics_from_genius(artist: str, title: str) -> Optional[str]:
                 clean_artist = replace_list[1]
                 break
 
-        response = requests.get(
+        response = provider_client.get(
             "https://api.genius.com/search",
+            provider="genius",
             headers=headers,
             params={"q": f"{clean_artist} {clean_title}"},
             timeout=10,
@@ -52,47 +159,137 @@ def _get_lyrics_from_genius(artist: str, title: str) -> Optional[str]:
         if not best_match:
             return None
 
-        page_response = requests.get(best_match["result"]["url"], timeout=10)
+        parser = GeniusLyricsParser()
+        page_response = provider_client.stream(
+            best_match["result"]["url"], parser.restart, provider="genius", timeout=10
+        )
         if page_response.status_code != 200:
             return None
-
-        from bs4 import BeautifulSoup
-
-        soup = BeautifulSoup(page_response.text, "html.parser")
-        lyrics_containers = soup.find_all("div", attrs={"data-lyrics-container": "true"})
-        if not lyrics_containers:
-            return None
-
-        lyrics = ""
-        for container in lyrics_containers:
-            for elem in container.stripped_strings:
-                lyrics += elem + "\n"
-        return lyrics.strip()
+        return parser.text()
+    except ProviderUnavailable:
+        raise
     except Exception as exc:
         log.error(f'`network,tags`Error fetching lyrics from Genius for "{artist} - {title}": {exc}')
         return None
 
 
-def get_lyrics(artist: str, title: str) -> Optional[str]:
-    """Get lyrics from Lyrics.ovh API or Genius fallback."""
-    if not cfg.tags.fetch_lyrics:
-        return None
-
+def _get_lyrics_from_lyrics_ovh(artist: str, title: str) -> Optional[str]:
     try:
         artist_clean = artist.replace("/", "_").replace("?", "_")
         title_clean = title.replace("/", "_").replace("?", "_")
-        response = requests.get(f"https://api.lyrics.ovh/v1/{artist_clean}/{title_clean}", timeout=10)
-
+        response = provider_client.get(
+            f"https://api.lyrics.ovh/v1/{artist_clean}/{title_clean}", provider="lyrics_ovh", timeout=10
+        )
         if response.status_code == 200:
-            lyrics = response.json().get("lyrics")
-            if lyrics:
-                return lyrics
-
-        lyrics = _get_lyrics_from_genius(artist, title)
-        if lyrics:
-            return lyrics
-        log.info(f'`network,tags`No lyrics found for "{artist} - {title}"')
+            return response.json().get("lyrics") or None
         return None
+    except ProviderUnavailable:
+        raise
     except Exception as exc:
         log.error(f'`network,tags`Error fetching lyrics for "{artist} - {title}": {exc}')
         return None
+
+
+LyricsProvider = Callable[[str, str], Optional[str]]
+
+
+def _providers() -> tuple[LyricsProvider, ...]:
+    return (_get_lyrics_from_lyrics_ovh, _get_lyrics_from_genius)
+
+
+def _ask_in_order(providers: tuple[LyricsProvider, ...], artist: str, title: str) -> Optional[str]:
+    unavailable: ProviderUnavailable | None = None
+    for provider in providers:
+        try:
+            lyrics = provider(artist, title)
+        except ProviderUnavailable as error:
+            unavailable = unavailable or error
+            continue
+        if lyrics:
+            return lyrics
+    if unavailable is not None:
+        raise unavailable
+    return None
+
+
+def _get_race_pool() -> ThreadPoolExecutor:
+    global _race_pool
+    with _race_pool_lock:
+        if _race_pool is None:
+            _race_pool = ThreadPoolExecutor(
+                max_workers=max(cfg.tags.fetch_workers, 1) * len(_providers()),
+                thread_name_prefix="kimp3-lyrics",
+            )
+        return _race_pool
+
+
+def _ask_concurrently(providers: tuple[LyricsProvider, ...], artist: str, title: str) -> Optional[str]:
+    """Ask all providers at once and return the first non-empty answer.
+
+    Requests of slower providers that already started cannot be interrupted;
+    their answers are dropped, and requests still queued are cancelled.
+    """
+    pool = _get_race_pool()
+    pending: set[Future] = {pool.submit(provider, artist, title) for provider in providers}
+    unavailable: ProviderUnavailable | None = None
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    lyrics = future.result()
+                except ProviderUnavailable as error:
+                    unavailable = unavailable or error
+                    continue
+                if lyrics:
+                    return lyrics
+    finally:
+        for future in pending:
+            future.cancel()
+    if unavailable is not None:
+        raise unavailable
+    return None
+
+
+def _lyrics_key(artist: str, title: str) -> tuple[str, str]:
+    return normalize_string(artist), normalize_string(title)
+
+
+def get_lyrics(artist: str, title: str) -> Optional[str]:
+    """Get lyrics from the lyrics cache, Lyrics.ovh or Genius.
+
+    Providers are asked in order, or all at once with tags.lyrics_race.
+    Answers, including "not found", are cached by normalized artist and
+    title. Raises ProviderUnavailable when no lyrics were found and a
+    provider could not be asked, so callers do not record a not-found marker.
+    """
+    if not cfg.tags.fetch_lyrics:
+        return None
+
+    def load() -> Optional[str]:
+        providers = _providers()
+        if cfg.tags.lyrics_race and len(providers) > 1:
+            lyrics = _ask_concurrently(providers, artist, title)
+        else:
+            lyrics = _ask_in_order(providers, artist, title)
+        if not lyrics:
+            log.info(f'`network,tags`No lyrics found for "{artist} - {title}"')
+        return lyrics or None
+
+    return _lyrics_cache.get_or_load(_lyrics_key(artist, title), load)
+
+
+def clear_lyrics_cache() -> None:
+    _lyrics_cache.clear()
+
+
+def lyrics_cache_size() -> int:
+    return len(_lyrics_cache)
+
+
+def close_race_pool() -> None:
+    global _race_pool
+    with _race_pool_lock:
+        pool, _race_pool = _race_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
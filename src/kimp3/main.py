@@ -5,19 +5,28 @@
 import logging
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, List
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
 
 from rich.pretty import pretty_repr
 
+from kimp3 import lyrics, provider_client, rate_limit, resilience
 from kimp3.config import APP_NAME, HOME_DIR, args, cfg, config_files, unknown
 from kimp3.config_loader import get_active_config_files, load_logging_config
-from kimp3.executor import OperationExecutor
-from kimp3.interface.utils import sep_with_header
+from kimp3.covers import close_cover_processor, get_cover_processor, purge_cover_cache
+from kimp3.executor import ExecutionResult, OperationExecutor
 from kimp3.logging_setup import setup_logging
-from kimp3.reporting import ExecutionReporter, PlanReporter
+from kimp3.metadata_cache import MetadataCache, attach_metadata_cache
+from kimp3.models import artwork_store
+from kimp3.pipeline import EnrichmentScheduler, SongDirPipeline, TargetReservations
+from kimp3.reporting import ExecutionReporter
+from kimp3.scan_index import ScanIndex
 from kimp3.songdir import SongDir
+from kimp3.tag_reader import TagReader
 from kimp3.tags import clear_cache, get_cache_stats, init_lastfm
 
 setup_logging(load_logging_config(cfg, APP_NAME))
@@ -95,61 +104,119 @@ class ScanDir:
     
     This class handles the recursive scanning of directories for audio files,
     organizing them into SongDir objects, and providing methods for processing
-    and managing the found files.
+    and managing the found files. Directories are discovered lazily, so
+    processing can start as soon as the first one has been read.
     
     Attributes:
         path: Base directory path to scan
-        directories_list: List of SongDir objects containing found audio files
+        directories_list: SongDir objects collected by scan_directory()
+        scan_index: Optional persistent index used to skip unchanged files
+        tag_reader: Optional process pool used to read tags
+        scheduler: Optional enrichment pool that prefetches upcoming directories
+        reservations: Optional run-wide claims on collection target paths
+        execution_lock: Optional lock serializing execution across roots
+        result: Execution result of the last process_by_one() call
     """
 
-    def __init__(self, scanpath: str):
+    def __init__(
+        self,
+        scanpath: str,
+        scan_index: Optional[ScanIndex] = None,
+        tag_reader: Optional[TagReader] = None,
+        scheduler: Optional[EnrichmentScheduler] = None,
+        reservations: Optional[TargetReservations] = None,
+        execution_lock: Optional[ContextManager] = None,
+    ):
         """Initialize scanner with a base directory path.
         
         Args:
             scanpath: Directory path to start scanning from
+            scan_index: Optional persistent scan index shared by all roots
+            tag_reader: Optional tag reader pool shared by all roots
+            scheduler: Optional enrichment scheduler shared by all roots
+            reservations: Optional target reservations shared by all roots
+            execution_lock: Optional lock held while a directory is executed
         """
         self.path = Path(scanpath).expanduser().resolve(strict=False)
         self.directories_list: List[SongDir] = []
-        self.scan_directory(self.path)
+        self.scan_index = scan_index
+        self.tag_reader = tag_reader
+        self.scheduler = scheduler
+        self.reservations = reservations
+        self.execution_lock = execution_lock
+        self.result = ExecutionResult()
+        self.index_hits = 0
+        self.index_misses = 0
+        self.total_directories = 0
+        self.total_files = 0
+        self.albums = 0
+        self.compilations = 0
 
-    def scan_directory(self, scanpath):
-        """Recursively scan directory for audio files and add them to directories_list.
+    def iter_song_dirs(self, scanpath=None) -> Iterator[SongDir]:
+        """Recursively scan a directory and yield SongDirs as they are read.
         
-        Walks through the directory tree, identifying audio files and creating
-        SongDir objects for directories containing them. Skips directories and files
-        specified in configuration.
+        Skips directories and files specified in configuration and updates the
+        running scan statistics for every yielded directory.
 
         Args:
-            scanpath: Path to scan for audio files
+            scanpath: Path to scan for audio files, defaults to the base path
         """
+        scanpath = self.path if scanpath is None else scanpath
         log.debug(f"`scan`Scanning {scanpath}…")
 
         try:
             # Get all items in directory at once
             items = list(os.scandir(scanpath))
+        except PermissionError:
+            log.warning(f"`scan,files`Permission denied accessing {scanpath}")
+            return
+        except OSError as e:
+            log.error(f"`scan,files`Error scanning {scanpath}: {e}")
+            return
 
-            # Split into dirs and files
-            dirs = [item for item in items 
-                   if item.is_dir() and item.name not in cfg.scan.skip_dirs]
+        # Split into dirs and files
+        dirs = [item for item in items 
+               if item.is_dir() and item.name not in cfg.scan.skip_dirs]
 
-            audio_files = [item for item in items 
-                          if item.is_file() and 
-                          os.path.splitext(item.name)[1] in cfg.scan.valid_extensions]
+        audio_files = [item for item in items 
+                      if item.is_file() and 
+                      os.path.splitext(item.name)[1] in cfg.scan.valid_extensions]
 
-            # If audio files found, create SongDir
-            if audio_files:
-                self.directories_list.append(SongDir(scanpath, self))
+        # If audio files found, create SongDir
+        if audio_files:
+            song_dir = self._read_song_dir(scanpath)
+            if song_dir is not None:
                 log.info(f'`scan`Added "{str(scanpath).replace(HOME_DIR, "~")}" to directory list ({len(audio_files)} audio files)')
                 log.debug("`scan`" + "─" * 90)
+                yield song_dir
 
-            # Recursively scan subdirectories
-            for dir_entry in dirs:
-                self.scan_directory(dir_entry.path)
+        # Recursively scan subdirectories
+        for dir_entry in dirs:
+            yield from self.iter_song_dirs(dir_entry.path)
 
-        except PermissionError:
-            log.warning(f"`scan,files`Permission denied accessing {scanpath}")
+    def _read_song_dir(self, scanpath) -> Optional[SongDir]:
+        try:
+            song_dir = SongDir(scanpath, self)
         except OSError as e:
             log.error(f"`scan,files`Error scanning {scanpath}: {e}")
+            return None
+        self.index_hits += song_dir.index_hits
+        self.index_misses += song_dir.index_misses
+        if not song_dir.audio_files:
+            return None
+        self.total_directories += 1
+        self.total_files += len(song_dir.audio_files)
+        self.albums += int(song_dir.is_album)
+        self.compilations += int(song_dir.is_compilation)
+        return song_dir
+
+    def scan_directory(self, scanpath=None):
+        """Scan the whole tree up front and add every SongDir to directories_list.
+
+        Args:
+            scanpath: Path to scan for audio files, defaults to the base path
+        """
+        self.directories_list.extend(self.iter_song_dirs(scanpath))
 
     def check_tags(self):
         """Check tags in all found directories.
@@ -163,37 +230,29 @@ class ScanDir:
         return changes
     
     def process_by_one(self) -> Dict[str, List[int]]:
-        """Process each directory one by one.
+        """Stream directories through the scan, enrich, plan and execute stages.
         
         For each directory:
-        1. Fetches tags if configured
-        2. Processes files (move/copy)
-        3. Executes pending file operations
-        4. Writes updated tags
+        1. Reads tags as the tree is walked
+        2. Fetches tags if configured
+        3. Processes files (move/copy)
+        4. Executes pending file operations and writes updated tags
+        
+        Directories are released once executed instead of being kept for the
+        whole run.
         """
-        stats: Dict[str, List[int]] = {"write_tags": [0, 0]}
-        for d in self.directories_list:
-            print(sep_with_header(f"Processing {str(d.path)}"))
-            if cfg.tags.fetch_tags:
-                changes = d.fetch_tags()
-            d.process_missing_tags_from_local_data()
-            d.process_files(cfg.scan.operation)
-            validation_errors = d.validate_plans()
-            plans = [audio_file.operation_plan for audio_file in d.audio_files if audio_file.operation_plan]
-            if validation_errors:
-                for error in validation_errors:
-                    log.error(f"`files`{error}")
-                if cfg.scan.conflict_policy == "fail":
-                    if plans:
-                        PlanReporter().print_interesting_details(plans)
-                    continue
-            if plans and not cfg.dry_run:
-                PlanReporter().print_interesting_details(plans)
-            result = OperationExecutor().execute_song_dir(d)
-            ExecutionReporter().print_result(result, title=f"Execution: {d.path}")
-            stats["write_tags"][0] += result.successes
-            stats["write_tags"][1] += result.failures
-        return stats
+        song_dirs = self.directories_list or self.iter_song_dirs()
+        result = SongDirPipeline(
+            song_dirs,
+            depth=cfg.scan.pipeline_depth,
+            scan_index=self.scan_index,
+            scheduler=self.scheduler,
+            reservations=self.reservations,
+            execution_lock=self.execution_lock,
+        ).run()
+        self.result = result
+        self.directories_list = []
+        return {"write_tags": [result.successes, result.failures]}
 
     @staticmethod
     def _update_stats(func: Callable, stats: Dict[str, List[int]]) -> Dict[str, List[int]]:
@@ -218,57 +277,131 @@ class ScanDir:
                 - total_files: Total number of audio files found
                 - albums: Number of album directories
                 - compilations: Number of compilation directories
+                - index_served: Files skipped because the scan index marked them unchanged
+                - index_parsed: Files whose tags were read from disk
         """
-        total_dirs = len(self.directories_list)
-        total_files = sum(len(d.audio_files) for d in self.directories_list)
-        albums = sum(1 for d in self.directories_list if d.is_album)
-        compilations = sum(1 for d in self.directories_list if d.is_compilation)
-        
         return {
-            'total_directories': total_dirs,
-            'total_files': total_files,
-            'albums': albums,
-            'compilations': compilations
+            'total_directories': self.total_directories,
+            'total_files': self.total_files,
+            'albums': self.albums,
+            'compilations': self.compilations,
+            'index_served': self.index_hits,
+            'index_parsed': self.index_misses,
         }
 
 
+def process_roots(dirs_to_scan: List[ScanDir], workers: int = 1) -> ExecutionResult:
+    """Process scan roots, up to workers at a time, and merge their results.
+
+    Roots share the scan index, tag reader, enrichment pool and provider
+    caches and rate limits, which are all run-wide. A root that fails is
+    logged and does not stop the others.
+    """
+    total = ExecutionResult()
+
+    def process(directory: ScanDir) -> None:
+        try:
+            directory.process_by_one()
+        except Exception:
+            log.exception(f"`scan`Processing {directory.path} failed")
+            return
+        log.debug("`scan`Scanning stats:")
+        log.debug(f"`scan`{directory.path}:\n" + pretty_repr(directory.stats))
+
+    workers = min(max(workers, 1), len(dirs_to_scan) or 1)
+    if workers == 1:
+        for directory in dirs_to_scan:
+            process(directory)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kimp3-root") as pool:
+            list(pool.map(process, dirs_to_scan))
+    for directory in dirs_to_scan:
+        total.add(directory.result)
+    return total
+
+
 def main():
     """Main program entry point.
     
     Performs the following steps:
-    1. Scans configured directories for audio files
-    2. Initializes LastFM if tag fetching is enabled
-    3. Processes each directory (tag fetching, file operations)
+    1. Initializes LastFM if tag fetching is enabled
+    2. Streams each configured directory through scanning, tag fetching,
+       planning and file operations, scan.root_workers roots at a time
+    3. Prints the execution summary merged over all roots
     4. Cleans up broken symlinks
     5. Optionally deletes empty directories
+    6. Closes worker pools, the scan index and the caches, also when a
+       step above raised
     
     Returns:
         int: Exit code (0 for success)
     """
-    dirs_to_scan = []
-    for directory in cfg.scan.dir_list:
-        if os.path.isdir(directory):
-            if os.access(directory, os.R_OK):
-                dirs_to_scan.append(ScanDir(directory))
+    artwork_store.resize(cfg.tags.artwork_store_mb * 1024 * 1024)
+    with ExitStack() as resources:
+        scan_index = ScanIndex.open(cfg)
+        if scan_index is not None:
+            resources.callback(scan_index.close)
+        metadata_cache = MetadataCache.open(cfg)
+        if metadata_cache is not None:
+            resources.callback(metadata_cache.close)
+        rate_limit.configure(cfg.tags.rate_limits)
+        resilience.configure(cfg)
+        provider_client.configure(cfg)
+        resources.callback(provider_client.close)
+        attach_metadata_cache(metadata_cache)
+        resources.callback(attach_metadata_cache, None)
+        # Drops the in-memory provider caches and writes the cover cache index.
+        resources.callback(clear_cache)
+        if cfg.purge_cache:
+            purge_cover_cache()
+            if metadata_cache is not None:
+                metadata_cache.purge()
+                log.info("`state`Metadata cache purged")
+        resources.callback(lyrics.close_race_pool)
+        resources.callback(close_cover_processor)
+        tag_reader = TagReader(cfg.scan.read_workers)
+        resources.callback(tag_reader.close)
+        tag_reader.start()
+        if cfg.tags.fetch_tags and cfg.tags.fetch_album_cover:
+            get_cover_processor().start()
+        scheduler = EnrichmentScheduler(cfg.scan.prefetch_depth, cfg.scan.prefetch_max_files)
+        resources.callback(scheduler.close)
+        reservations = TargetReservations()
+        execution_lock = threading.Lock() if cfg.interactive else None
+        dirs_to_scan = []
+        for directory in cfg.scan.dir_list:
+            if os.path.isdir(directory):
+                if os.access(directory, os.R_OK):
+                    dirs_to_scan.append(
+                        ScanDir(directory, scan_index, tag_reader, scheduler, reservations, execution_lock)
+                    )
+                else:
+                    log.critical('`scan,files`Access to ' + str(directory) + ' denied.')
             else:
-                log.critical('`scan,files`Access to ' + str(directory) + ' denied.')
-        else:
-            log.critical('`scan,files`Directory ' + str(directory) + ' doesn\'t exist.')
-    
-    for d in dirs_to_scan:
-        log.debug("`scan`Scanning stats:")
-        log.debug(f"`scan`{d.path}:\n" + pretty_repr(d.stats))
+                log.critical('`scan,files`Directory ' + str(directory) + ' doesn\'t exist.')
 
-    if cfg.tags.fetch_tags:
-        init_lastfm()
+        if cfg.tags.fetch_tags:
+            init_lastfm()
 
-    for directory in dirs_to_scan:
-        directory.process_by_one()
+        result = process_roots(dirs_to_scan, cfg.scan.root_workers)
+        if len(dirs_to_scan) > 1:
+            ExecutionReporter().print_result(result, title="Execution: all scan roots")
+
+        OperationExecutor().cleanup_collection([directory.path for directory in dirs_to_scan])
 
-    OperationExecutor().cleanup_collection([directory.path for directory in dirs_to_scan])
+        served = sum(directory.index_hits for directory in dirs_to_scan)
+        parsed = sum(directory.index_misses for directory in dirs_to_scan)
+        log.info(f"`scan`Scan index: {served} files served from index, {parsed} files re-parsed")
 
-    log.debug(f"`state`Cache stats: {pretty_repr(get_cache_stats())}")
-    clear_cache()
+        log.debug(f"`state`Cache stats: {pretty_repr(get_cache_stats())}")
+        log.debug(f"`network`Rate limiter stats: {pretty_repr(rate_limit.get_stats())}")
+        for provider, stats in resilience.get_stats().items():
+            if stats["failures"] or stats["skipped"]:
+                log.info(
+                    f"`network`{provider}: {stats['failures']} failed calls, "
+                    f"{stats['skipped']} skipped while unavailable, {stats['retried']} retries"
+                )
+        log.debug(f"`network`Provider stats: {pretty_repr(resilience.get_stats())}")
     return 0
 
 
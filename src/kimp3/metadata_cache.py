@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterator
+
+from kimp3.config import APP_NAME
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+CACHE_FILENAME = "metadata_cache.sqlite"
+SCHEMA_VERSION = 1
+DAY_SECONDS = 86400
+EVICTION_CHECK_INTERVAL = 100
+
+_MISSING = object()
+
+
+def _is_negative(value: object) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _encode_key(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return json.dumps(list(key), ensure_ascii=False)
+    return json.dumps(key, ensure_ascii=False)
+
+
+class MetadataCache:
+    """SQLite store for provider lookups that survives between runs.
+
+    Every entry carries its own expiry. Empty results get the shorter
+    negative TTL, and the least recently used entries are evicted once the
+    store grows past max_entries.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_days: float = 30,
+        negative_ttl_days: float = 3,
+        max_entries: int = 200_000,
+        namespace_ttl_days: dict[str, float] | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_days = ttl_days
+        self.negative_ttl_days = negative_ttl_days
+        self.max_entries = max_entries
+        self.namespace_ttl_days = dict(namespace_ttl_days or {})
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._ensure_schema()
+
+    @classmethod
+    def open(cls, settings: object) -> MetadataCache | None:
+        """Open the cache configured in settings, or return None when disabled."""
+        cache_settings = settings.cache
+        if not cache_settings.enabled:
+            return None
+        cache_path = Path(settings.paths.cache_dir) / CACHE_FILENAME
+        try:
+            return cls(
+                cache_path,
+                ttl_days=cache_settings.ttl_days,
+                negative_ttl_days=cache_settings.negative_ttl_days,
+                max_entries=cache_settings.max_entries,
+                namespace_ttl_days=cache_settings.namespace_ttl_days,
+            )
+        except (OSError, sqlite3.Error) as error:
+            log.warning(f"`state`Metadata cache unavailable at {cache_path}: {error}")
+            return None
+
+    def _ensure_schema(self) -> None:
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS entries")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+            )
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def ttl_seconds(self, namespace: str, negative: bool) -> float:
+        if negative:
+            return self.negative_ttl_days * DAY_SECONDS
+        return self.namespace_ttl_days.get(namespace, self.ttl_days) * DAY_SECONDS
+
+    def get(self, namespace: str, key: Hashable) -> tuple[str, Any]:
+        """Return ("hit", value), ("miss", None) or ("expired", None)."""
+        encoded_key = _encode_key(key)
+        now = time.time()
+        try:
+            with self._lock, self._connection:
+                row = self._connection.execute(
+                    "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, encoded_key),
+                ).fetchone()
+                if row is None:
+                    return "miss", None
+                value, expires_at = row
+                if expires_at <= now:
+                    self._connection.execute(
+                        "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                        (namespace, encoded_key),
+                    )
+                    return "expired", None
+                self._connection.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, encoded_key),
+                )
+        except sqlite3.Error as error:
+            log.warning(f"`state`Metadata cache read failed: {error}")
+            return "miss", None
+        return "hit", json.loads(value)
+
+    def put(self, namespace: str, key: Hashable, value: Any, negative: bool = False) -> None:
+        now = time.time()
+        row = (
+            namespace,
+            _encode_key(key),
+            json.dumps(value, ensure_ascii=False),
+            now + self.ttl_seconds(namespace, negative),
+            now,
+        )
+        try:
+            with self._lock, self._connection:
+                self._connection.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", row)
+                self._writes += 1
+                if self._writes % EVICTION_CHECK_INTERVAL == 0:
+                    self._evict()
+        except sqlite3.Error as error:
+            log.warning(f"`state`Metadata cache write failed: {error}")
+
+    def _evict(self) -> None:
+        self._connection.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        count = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM entries WHERE rowid IN "
+                "(SELECT rowid FROM entries ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            log.debug(f"`state`Metadata cache evicted {excess} least recently used entries")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def purge(self) -> None:
+        """Remove every entry."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                with self._connection:
+                    self._evict()
+            except sqlite3.Error as error:
+                log.warning(f"`state`Metadata cache eviction failed: {error}")
+            self._connection.close()
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one call.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs wait and get its result or exception.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = function()
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+
+class ProviderCache:
+    """In-memory cache for one provider lookup, optionally backed by MetadataCache.
+
+    Behaves like the dict it replaces. Values are converted with encode/decode
+    on their way to and from the durable store, so provider objects can be
+    stored as plain data. clear() only drops the in-memory layer.
+    get_or_load() coalesces concurrent misses for the same key.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        encode: Callable[[Any], Any] | None = None,
+        decode: Callable[[Any], Any] | None = None,
+    ) -> None:
+        self.namespace = namespace
+        self.encode = encode or (lambda value: value)
+        self.decode = decode or (lambda value: value)
+        self.store: MetadataCache | None = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._memory: dict[Hashable, Any] = {}
+        self._lock = threading.RLock()
+        self._flight = SingleFlight()
+        _registry.append(self)
+
+    def _lookup(self, key: Hashable) -> Any:
+        with self._lock:
+            if key in self._memory:
+                self.hits += 1
+                return self._memory[key]
+            store = self.store
+        if store is not None:
+            status, encoded = store.get(self.namespace, key)
+            if status == "hit":
+                value = self.decode(encoded)
+                with self._lock:
+                    self.hits += 1
+                    self._memory[key] = value
+                return value
+            if status == "expired":
+                with self._lock:
+                    self.expired += 1
+        with self._lock:
+            self.misses += 1
+        return _MISSING
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, calling loader once on a miss.
+
+        Concurrent callers missing the same key wait for the first loader.
+        Exceptions raised by loader reach every waiter and are not cached.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        def load() -> Any:
+            with self._lock:
+                if key in self._memory:
+                    return self._memory[key]
+            loaded = loader()
+            self[key] = loaded
+            return loaded
+
+        return self._flight.do(key, load)
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            store = self.store
+        if store is not None:
+            store.put(self.namespace, key, self.encode(value), negative=_is_negative(value))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._memory)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            return iter(list(self._memory))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.expired = 0
+            self._flight.coalesced = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "coalesced": self._flight.coalesced,
+            }
+
+
+_registry: list[ProviderCache] = []
+
+
+def attach_metadata_cache(store: MetadataCache | None) -> None:
+    """Back every provider cache with store, or detach them when store is None."""
+    for cache in _registry:
+        cache.store = store
+
+
+def get_metadata_cache_stats() -> dict[str, int]:
+    """Return hit/miss/expired/coalesced counts summed over all provider caches."""
+    totals = {
+        "metadata_cache_hits": 0,
+        "metadata_cache_misses": 0,
+        "metadata_cache_expired": 0,
+        "coalesced_requests": 0,
+    }
+    for cache in _registry:
+        stats = cache.stats()
+        totals["metadata_cache_hits"] += stats["hits"]
+        totals["metadata_cache_misses"] += stats["misses"]
+        totals["metadata_cache_expired"] += stats["expired"]
+        totals["coalesced_requests"] += stats["coalesced"]
+    return totals
+
+
+def reset_metadata_cache_stats() -> None:
+    for cache in _registry:
+        cache.reset_stats()
@@ -5,9 +5,12 @@ This module contains the core data structures used throughout the application
 for representing audio metadata, file operations, and configuration options.
 """
 
+import hashlib
 import json
 import logging
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from datetime import date
 from enum import Enum
 from pathlib import Path
@@ -80,14 +83,150 @@ class DiscNumber(BaseModel):
         return value if value is not None and value > 0 else None
 
 
+class ArtworkStore:
+    """Digest-keyed buffers shared by all Artwork instances with the same image.
+
+    Buffers are kept in LRU order up to max_bytes. An evicted image is stored
+    again the next time it is seen, so eviction only costs sharing.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._buffers: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_stored = 0
+        self.hits = 0
+        self.bytes_saved = 0
+
+    def intern(self, digest: str, data: bytes) -> bytes:
+        """Return the shared buffer for digest, storing data if it is new."""
+        with self._lock:
+            shared = self._buffers.get(digest)
+            if shared is not None:
+                self._buffers.move_to_end(digest)
+                if shared is not data:
+                    self.hits += 1
+                    self.bytes_saved += len(data)
+                return shared
+            if len(data) > self.max_bytes:
+                return data
+            self._buffers[digest] = data
+            self.bytes_stored += len(data)
+            while self.bytes_stored > self.max_bytes:
+                _, evicted = self._buffers.popitem(last=False)
+                self.bytes_stored -= len(evicted)
+            return data
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._buffers.get(digest)
+            if data is not None:
+                self._buffers.move_to_end(digest)
+            return data
+
+    def resize(self, max_bytes: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            while self._buffers and self.bytes_stored > self.max_bytes:
+                _, evicted = self._buffers.popitem(last=False)
+                self.bytes_stored -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffers.clear()
+            self.bytes_stored = 0
+            self.hits = 0
+            self.bytes_saved = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "artwork_buffers": len(self._buffers),
+                "artwork_bytes": self.bytes_stored,
+                "artwork_shared_hits": self.hits,
+                "artwork_bytes_saved": self.bytes_saved,
+            }
+
+
+artwork_store = ArtworkStore()
+
+
+class ArtworkSource(BaseModel):
+    """Location of embedded artwork inside an audio file."""
+
+    path: Path
+    locator: str = ""
+
+
 class Artwork(BaseModel):
-    """Embedded front-cover artwork."""
+    """Embedded front-cover artwork.
+
+    Artwork read in headers-only mode keeps digest, size and source but no
+    bytes; read_bytes() loads them from the source file when needed. Bytes an
+    Artwork keeps or loads are interned in artwork_store, so equal images
+    share one buffer; described() handles never touch the store.
+    """
 
     model_config = ConfigDict(validate_assignment=True)
 
-    data: bytes
+    data: Optional[bytes] = None
     mime: str = "image/jpeg"
     kind: Literal["front"] = "front"
+    digest: str = ""
+    size: int = 0
+    source: Optional[ArtworkSource] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def describe_data(cls, data: object) -> object:
+        if isinstance(data, dict) and data.get("data") is not None:
+            data = dict(data)
+            digest = hashlib.sha256(data["data"]).hexdigest()
+            data["digest"] = digest
+            data["size"] = len(data["data"])
+            data["data"] = artwork_store.intern(digest, bytes(data["data"]))
+        return data
+
+    @classmethod
+    def described(cls, data: bytes, mime: str, source: ArtworkSource) -> 'Artwork':
+        """Return a handle with the digest and size of data that reloads it from source."""
+        return cls(mime=mime, digest=hashlib.sha256(data).hexdigest(), size=len(data), source=source)
+
+    @model_validator(mode="after")
+    def require_content(self) -> 'Artwork':
+        if self.data is None and not self.digest:
+            raise ValueError("Artwork requires data or a digest")
+        return self
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.data is not None
+
+    def read_bytes(self) -> bytes:
+        """Return image bytes, loading them from the source file if needed."""
+        if self.data is not None:
+            return self.data
+        shared = artwork_store.get(self.digest)
+        if shared is not None:
+            return shared
+        if self.source is None:
+            raise ValueError("Artwork has neither data nor a source")
+        from kimp3.backends import load_artwork_bytes
+
+        data = load_artwork_bytes(self.source)
+        if hashlib.sha256(data).hexdigest() != self.digest:
+            raise ValueError(f"Artwork in {self.source.path} changed since it was read")
+        return artwork_store.intern(self.digest, data)
+
+    def materialize(self) -> 'Artwork':
+        """Load and keep the image bytes."""
+        if self.data is None:
+            self.data = self.read_bytes()
+        return self
+
+    def managed_value(self) -> dict[str, object]:
+        """Value compared for no-op detection and verify, independent of loading."""
+        return {"mime": self.mime, "kind": self.kind, "digest": self.digest, "size": self.size}
 
 
 class Lyrics(BaseModel):
@@ -100,6 +239,14 @@ class Lyrics(BaseModel):
     description: str = ""
 
 
+class AudioInfo(BaseModel):
+    """Stream properties read together with the tags of one audio file."""
+
+    bitrate: int = 0
+    length: float = 0.0
+    raw_genres: List[str] = Field(default_factory=list)
+
+
 class LyricsLookup(BaseModel):
     """Embedded state for lyrics lookup attempts."""
 
@@ -272,7 +419,7 @@ class AudioTags(BaseModel):
 
     @property
     def album_cover(self) -> Optional[bytes]:
-        return self.artwork.data if self.artwork else None
+        return self.artwork.read_bytes() if self.artwork else None
 
     @album_cover.setter
     def album_cover(self, value: Optional[bytes]) -> None:
@@ -312,8 +459,8 @@ class AudioTags(BaseModel):
             self.compilation,
             self.rating,
             tuple(self.lastfm_tags),
-            self.album_cover,
-            self.album_cover_mime if self.album_cover else None,
+            self.artwork.digest if self.artwork else None,
+            self.artwork.mime if self.artwork else None,
             self.lyrics.model_dump() if self.lyrics else None,
             self.lyrics_lookup.model_dump() if self.lyrics_lookup else None,
         )
@@ -323,8 +470,16 @@ class AudioTags(BaseModel):
         return self.managed_fingerprint() == other.managed_fingerprint()
 
     @classmethod
-    def from_mutagen(cls, easy_tags: EasyID3 | object | None, id3: ID3 | None = None) -> 'AudioTags':
-        """Creates AudioTags object from EasyID3 and ID3."""
+    def from_mutagen(
+        cls,
+        easy_tags: EasyID3 | object | None,
+        id3: ID3 | None = None,
+        artwork_source: ArtworkSource | None = None,
+    ) -> 'AudioTags':
+        """Creates AudioTags object from EasyID3 and ID3.
+
+        With artwork_source the cover is only described, its bytes are not kept.
+        """
         if easy_tags is None:
             return cls()
         if id3 is None and hasattr(easy_tags, "tags"):
@@ -362,6 +517,11 @@ class AudioTags(BaseModel):
             if comm.desc:  # Only process comments with descriptions
                 comments[comm.desc] = comm.text[0]
 
+        described = {}
+        if cover_data is not None and artwork_source is not None:
+            described["artwork"] = Artwork.described(cover_data, cover_mime, artwork_source)
+            cover_data = None
+
         track_info = cls._parse_track_number(get_tag_value('tracknumber'))
         disc_info = cls._parse_track_number(get_tag_value('discnumber'))
 
@@ -384,6 +544,7 @@ class AudioTags(BaseModel):
             album_cover_mime=cover_mime,
             lyrics=lyrics,
             lyrics_lookup=comments.get('KiMP3 lyrics lookup') or None,
+            **described,
         )
 
     @staticmethod
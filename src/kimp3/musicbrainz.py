@@ -1,27 +1,23 @@
 from __future__ import annotations
 
 import logging
-import threading
-import time
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any
 
 import httpx
 
-from kimp3 import __version__
+from kimp3 import __version__, provider_client
 from kimp3.config import APP_NAME, cfg
+from kimp3.metadata_cache import ProviderCache
 from kimp3.strings_operations import split_album_title, string_similarity
 
 log = logging.getLogger(f"{APP_NAME}.{__name__}")
 
 BASE_URL = "https://musicbrainz.org/ws/2"
-REQUEST_INTERVAL_SECONDS = 1.0
 MUSICBRAINZ_ERRORS = (httpx.HTTPError, ValueError, KeyError, TypeError)
 
-_request_lock = threading.Lock()
-_last_request_at = 0.0
-_artist_mbid_cache: dict[str, str | None] = {}
-_artist_albums_cache: dict[tuple[str, str], list[AlbumCandidate]] = {}
+
+TRACK_TITLE_MATCH_THRESHOLD = 0.8
 
 
 @dataclass(frozen=True)
@@ -30,6 +26,78 @@ class AlbumCandidate:
     track_count: int | None = None
     release_date: str | None = None
     source: str = "musicbrainz"
+    mbid: str | None = None
+    # "release" for a concrete release, "release-group" for all its editions.
+    entity: str = "release"
+
+
+@dataclass(frozen=True)
+class ReleaseTrack:
+    title: str
+    position: int
+    disc_number: int = 1
+
+
+@dataclass(frozen=True)
+class AlbumRelease:
+    """Track list of one MusicBrainz release, read with a single lookup."""
+
+    mbid: str
+    title: str
+    tracks: tuple[ReleaseTrack, ...] = ()
+    total_discs: int = 1
+    release_date: str | None = None
+
+    @property
+    def track_count(self) -> int:
+        return len(self.tracks)
+
+    def disc_track_count(self, disc_number: int) -> int:
+        return sum(1 for track in self.tracks if track.disc_number == disc_number)
+
+    def find_track(self, title: str) -> ReleaseTrack | None:
+        """Return the track whose title matches title best, if any is close enough."""
+        folded = title.casefold()
+        for track in self.tracks:
+            if track.title.casefold() == folded:
+                return track
+        best_track = None
+        best_score = 0.0
+        for track in self.tracks:
+            score = string_similarity(track.title, title, min_ratio=TRACK_TITLE_MATCH_THRESHOLD)
+            if score > best_score:
+                best_score = score
+                best_track = track
+        return best_track
+
+
+def _encode_albums(albums: list[AlbumCandidate]) -> list[dict[str, Any]]:
+    return [asdict(album) for album in albums]
+
+
+def _decode_albums(rows: list[dict[str, Any]]) -> list[AlbumCandidate]:
+    return [AlbumCandidate(**row) for row in rows]
+
+
+def _encode_release(release: AlbumRelease | None) -> dict[str, Any] | None:
+    return None if release is None else asdict(release)
+
+
+def _decode_release(row: dict[str, Any] | None) -> AlbumRelease | None:
+    if row is None:
+        return None
+    tracks = tuple(ReleaseTrack(**track) for track in row.get("tracks", []))
+    return AlbumRelease(**{**row, "tracks": tracks})
+
+
+_artist_mbid_cache = ProviderCache("musicbrainz.artist_mbid")
+_artist_albums_cache = ProviderCache(
+    "musicbrainz.artist_albums", encode=_encode_albums, decode=_decode_albums
+)
+_release_cache = ProviderCache(
+    "musicbrainz.release", encode=_encode_release, decode=_decode_release
+)
+_group_release_cache = ProviderCache("musicbrainz.group_release")
 
 
 def _user_agent() -> str:
@@ -37,21 +105,13 @@ def _user_agent() -> str:
 
 
 def _get_json(path: str, params: dict[str, str | int]) -> dict[str, Any]:
-    global _last_request_at
-
-    with _request_lock:
-        elapsed = time.monotonic() - _last_request_at
-        if elapsed < REQUEST_INTERVAL_SECONDS:
-            time.sleep(REQUEST_INTERVAL_SECONDS - elapsed)
-
-        response = httpx.get(
-            f"{BASE_URL}/{path}",
-            params={**params, "fmt": "json"},
-            headers={"Accept": "application/json", "User-Agent": _user_agent()},
-            timeout=20.0,
-        )
-        _last_request_at = time.monotonic()
-
+    response = provider_client.get(
+        f"{BASE_URL}/{path}",
+        provider="musicbrainz",
+        params={**params, "fmt": "json"},
+        headers={"Accept": "application/json", "User-Agent": _user_agent()},
+        timeout=20.0,
+    )
     response.raise_for_status()
     data = response.json()
     if not isinstance(data, dict):
@@ -60,9 +120,10 @@ def _get_json(path: str, params: dict[str, str | int]) -> dict[str, Any]:
 
 
 def _find_artist_mbid(artist_name: str) -> str | None:
-    if artist_name in _artist_mbid_cache:
-        return _artist_mbid_cache[artist_name]
+    return _artist_mbid_cache.get_or_load(artist_name, lambda: _load_artist_mbid(artist_name))
+
 
+def _load_artist_mbid(artist_name: str) -> str | None:
     try:
         data = _get_json(
             "artist",
@@ -72,7 +133,6 @@ def _find_artist_mbid(artist_name: str) -> str | None:
         log.warning(
             f"`network,tags`MusicBrainz: Failed to find artist - {artist_name}: {error}"
         )
-        _artist_mbid_cache[artist_name] = None
         return None
 
     best_mbid = None
@@ -88,17 +148,33 @@ def _find_artist_mbid(artist_name: str) -> str | None:
             best_score = score
             best_mbid = str(artist.get("id") or "") or None
 
-    _artist_mbid_cache[artist_name] = best_mbid
     return best_mbid
 
 
 def _append_unique_album(
-    albums: list[AlbumCandidate], seen_titles: set[str], candidate: AlbumCandidate
+    albums: list[AlbumCandidate],
+    seen_titles: set[str],
+    candidate: AlbumCandidate,
+    track_count: int | None = None,
 ) -> None:
-    if not candidate.title or candidate.title.casefold() in seen_titles:
+    """Append candidate unless its title is taken.
+
+    A same-title edition with track_count tracks replaces one with a
+    different count in place, as _choose_group_release() prefers it.
+    """
+    if not candidate.title:
         return
-    seen_titles.add(candidate.title.casefold())
-    albums.append(candidate)
+    key = candidate.title.casefold()
+    if key not in seen_titles:
+        seen_titles.add(key)
+        albums.append(candidate)
+        return
+    if not track_count or candidate.track_count != track_count:
+        return
+    for index, album in enumerate(albums):
+        if album.title.casefold() == key and album.track_count != track_count:
+            albums[index] = candidate
+            return
 
 
 def _display_release_title(release: dict[str, Any], query_qualifier: str) -> str:
@@ -113,7 +189,9 @@ def _display_release_title(release: dict[str, Any], query_qualifier: str) -> str
     return title
 
 
-def _search_releases(artist_name: str, album_title: str) -> list[AlbumCandidate]:
+def _search_releases(
+    artist_name: str, album_title: str, track_count: int | None = None
+) -> list[AlbumCandidate]:
     if not album_title:
         return []
     base_title, query_qualifier = split_album_title(album_title)
@@ -138,24 +216,39 @@ def _search_releases(artist_name: str, album_title: str) -> list[AlbumCandidate]
         _append_unique_album(
             albums,
             seen_titles,
-            AlbumCandidate(title=title, release_date=release.get("date") or None),
+            AlbumCandidate(
+                title=title,
+                track_count=_int_or_none(release.get("track-count")),
+                release_date=release.get("date") or None,
+                mbid=release.get("id") or None,
+            ),
+            track_count,
         )
     return albums
 
 
 def get_artist_albums(
-    artist_name: str, album_title: str | None = None
+    artist_name: str, album_title: str | None = None, track_count: int | None = None
 ) -> list[AlbumCandidate]:
-    cache_key = (artist_name, album_title or "")
-    if cache_key in _artist_albums_cache:
-        return _artist_albums_cache[cache_key]
+    """Return album candidates; raises ProviderUnavailable while MusicBrainz is down.
+
+    Of the releases titled like album_title, the one with track_count
+    tracks is preferred.
+    """
+    return _artist_albums_cache.get_or_load(
+        (artist_name, album_title or "", track_count or 0),
+        lambda: _load_artist_albums(artist_name, album_title or "", track_count),
+    )
+
 
-    albums = _search_releases(artist_name, album_title or "")
+def _load_artist_albums(
+    artist_name: str, album_title: str, track_count: int | None = None
+) -> list[AlbumCandidate]:
+    albums = _search_releases(artist_name, album_title, track_count)
     seen_titles = {album.title.casefold() for album in albums}
 
     artist_mbid = _find_artist_mbid(artist_name)
     if not artist_mbid:
-        _artist_albums_cache[cache_key] = albums
         return albums
 
     try:
@@ -171,7 +264,6 @@ def get_artist_albums(
         log.warning(
             f"`network,tags`MusicBrainz: Failed to get artist albums - {artist_name}: {error}"
         )
-        _artist_albums_cache[cache_key] = albums
         return albums
 
     for release_group in data.get("release-groups", []):
@@ -182,20 +274,100 @@ def get_artist_albums(
             AlbumCandidate(
                 title=title,
                 release_date=release_group.get("first-release-date") or None,
+                mbid=release_group.get("id") or None,
+                entity="release-group",
             ),
         )
 
-    _artist_albums_cache[cache_key] = albums
     return albums
 
 
+def _int_or_none(value: object) -> int | None:
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+
+
+def get_album_release(
+    candidate: AlbumCandidate, track_count: int | None = None
+) -> AlbumRelease | None:
+    """Return the track list of candidate, fetched with recordings in one request.
+
+    For a release group the edition whose track count matches track_count is
+    chosen, falling back to the first official release. Raises
+    ProviderUnavailable while MusicBrainz is down.
+    """
+    if not candidate.mbid:
+        return None
+    release_mbid: str | None = candidate.mbid
+    if candidate.entity == "release-group":
+        release_mbid = _group_release_cache.get_or_load(
+            (candidate.mbid, track_count or 0),
+            lambda: _choose_group_release(candidate.mbid, track_count),
+        )
+        if not release_mbid:
+            return None
+    return _release_cache.get_or_load(release_mbid, lambda: _load_release(release_mbid))
+
+
+def _choose_group_release(group_mbid: str, track_count: int | None) -> str | None:
+    try:
+        data = _get_json("release", {"release-group": group_mbid, "inc": "media", "limit": 100})
+    except MUSICBRAINZ_ERRORS as error:
+        log.warning(f"`network,tags`MusicBrainz: Failed to browse releases of {group_mbid}: {error}")
+        return None
+    releases = [release for release in data.get("releases", []) if release.get("id")]
+    if not releases:
+        return None
+    if track_count:
+        for release in releases:
+            media = release.get("media") or []
+            if sum(_int_or_none(medium.get("track-count")) or 0 for medium in media) == track_count:
+                return str(release["id"])
+    official = [release for release in releases if release.get("status") == "Official"]
+    return str((official or releases)[0]["id"])
+
+
+def _load_release(release_mbid: str) -> AlbumRelease | None:
+    try:
+        data = _get_json(f"release/{release_mbid}", {"inc": "recordings"})
+    except MUSICBRAINZ_ERRORS as error:
+        log.warning(f"`network,tags`MusicBrainz: Failed to get release {release_mbid}: {error}")
+        return None
+    tracks: list[ReleaseTrack] = []
+    media = data.get("media") or []
+    for disc_index, medium in enumerate(media, start=1):
+        disc_number = _int_or_none(medium.get("position")) or disc_index
+        for track_index, track in enumerate(medium.get("tracks") or [], start=1):
+            title = str(track.get("title") or (track.get("recording") or {}).get("title") or "").strip()
+            if title:
+                tracks.append(
+                    ReleaseTrack(
+                        title=title,
+                        position=_int_or_none(track.get("position")) or track_index,
+                        disc_number=disc_number,
+                    )
+                )
+    return AlbumRelease(
+        mbid=release_mbid,
+        title=str(data.get("title") or "").strip(),
+        tracks=tuple(tracks),
+        total_discs=max(len(media), 1),
+        release_date=data.get("date") or None,
+    )
+
+
 def clear_cache() -> None:
     _artist_mbid_cache.clear()
     _artist_albums_cache.clear()
+    _release_cache.clear()
+    _group_release_cache.clear()
 
 
 def get_cache_stats() -> dict[str, int]:
     return {
         "musicbrainz_artists": len(_artist_mbid_cache),
         "musicbrainz_artist_albums": len(_artist_albums_cache),
+        "musicbrainz_releases": len(_release_cache),
     }
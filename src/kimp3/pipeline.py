@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, ContextManager, Iterable, Iterator
+
+from kimp3.config import APP_NAME, cfg
+from kimp3.executor import ExecutionResult, OperationExecutor
+from kimp3.interface.utils import sep_with_header
+from kimp3.reporting import ExecutionReporter, PlanReporter
+from kimp3.scan_index import ScanIndex
+from kimp3.songdir import SongDir
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+_DONE = object()
+_POLL_SECONDS = 0.2
+
+
+def enrich_song_dir(song_dir: SongDir) -> SongDir:
+    """Fetch provider metadata for all files of one directory."""
+    if cfg.tags.fetch_tags:
+        song_dir.fetch_tags()
+    return song_dir
+
+
+def plan_song_dir(song_dir: SongDir) -> SongDir:
+    """Fill local tag gaps and build operation plans."""
+    song_dir.process_missing_tags_from_local_data()
+    song_dir.process_files(cfg.scan.operation)
+    return song_dir
+
+
+def execute_song_dir(
+    song_dir: SongDir,
+    scan_index: ScanIndex | None = None,
+    claim: TargetClaim | None = None,
+) -> ExecutionResult | None:
+    """Validate plans against the current filesystem and execute them.
+
+    Validation runs here rather than in the plan stage so that targets written
+    by the previous directory are visible to conflict resolution. Conflict
+    resolution may rename targets, so claim is extended with the validated
+    targets; if that had to wait for another root, the plans are validated
+    again from their original targets.
+    """
+    print(sep_with_header(f"Processing {str(song_dir.path)}"))
+    plans = [audio_file.operation_plan for audio_file in song_dir.audio_files if audio_file.operation_plan]
+    original_targets = [(plan, plan.path.target_path) for plan in plans]
+    validation_errors = song_dir.validate_plans()
+    while claim is not None and not claim.extend(planned_targets(song_dir)):
+        for plan, target in original_targets:
+            plan.path.target_path = target
+        validation_errors = song_dir.validate_plans()
+    if validation_errors:
+        for error in validation_errors:
+            log.error(f"`files`{error}")
+        if cfg.scan.conflict_policy == "fail":
+            if plans:
+                PlanReporter().print_interesting_details(plans)
+            return None
+    if plans and not cfg.dry_run:
+        PlanReporter().print_interesting_details(plans)
+    result = OperationExecutor().execute_song_dir(song_dir)
+    ExecutionReporter().print_result(result, title=f"Execution: {song_dir.path}")
+    if scan_index is not None:
+        scan_index.record_song_dir(song_dir)
+    return result
+
+
+class EnrichmentScheduler:
+    """Run-wide pool that enriches upcoming directories ahead of execution.
+
+    Up to lookahead directories are fetched concurrently while earlier ones
+    are planned and executed. max_files caps the audio files held by
+    directories in the prefetch window; one directory is always admitted so
+    a large album cannot stall the run. The pool is shared by all scan roots.
+    """
+
+    def __init__(self, lookahead: int = 1, max_files: int = 1000) -> None:
+        self.lookahead = max(lookahead, 1)
+        self.max_files = max(max_files, 1)
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, song_dir: SongDir) -> Future:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.lookahead, thread_name_prefix="kimp3-enrich"
+                )
+            return self._pool.submit(enrich_song_dir, song_dir)
+
+    def admits(self, window_files: int, window_size: int, files: int) -> bool:
+        """Return True if a directory with files audio files fits the window."""
+        if window_size == 0:
+            return True
+        return window_size < self.lookahead and window_files + files <= self.max_files
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def planned_targets(song_dir: SongDir) -> set[Path]:
+    """Return the collection paths the plans of song_dir would write, genre links included."""
+    targets: set[Path] = set()
+    for audio_file in song_dir.audio_files:
+        plan = getattr(audio_file, "operation_plan", None)
+        if plan is not None:
+            if plan.requires_file_operation:
+                targets.add(plan.path.target_path.resolve(strict=False))
+            links = plan.path.genre_links
+        else:
+            if getattr(audio_file, "new_filepath", None):
+                targets.add(Path(audio_file.new_filepath).resolve(strict=False))
+            links = getattr(audio_file, "genre_paths", None) or []
+        # Links are claimed by their own path, not the file they point to.
+        targets.update(Path(os.path.abspath(link)) for link in links)
+    return targets
+
+
+class TargetClaim:
+    """Targets held by one directory in TargetReservations."""
+
+    def __init__(self, reservations: TargetReservations, owner: Path, targets: set[Path]) -> None:
+        self.reservations = reservations
+        self.owner = owner
+        self.targets = targets
+
+    def extend(self, targets: Iterable[Path]) -> bool:
+        """Add targets to the claim.
+
+        Returns False when another directory held one of them. The claim
+        is then released while waiting, so nothing deadlocks, and the
+        targets the caller validated may have been written meanwhile.
+        """
+        return self.reservations._extend(self, set(targets))
+
+
+class TargetReservations:
+    """Run-wide claims on the collection paths of directories being executed.
+
+    Scan roots processed in parallel validate and execute their directories
+    independently, so two roots could both see a target as free and write it.
+    A directory claims all its targets and genre links at once before
+    validation and keeps them until it has been executed; a directory
+    sharing a target waits and then sees the written file, exactly as in a
+    sequential run. Targets renamed by conflict resolution are added with
+    TargetClaim.extend(). A directory never waits while holding claims, so
+    two directories can never deadlock.
+    """
+
+    def __init__(self) -> None:
+        self._claims: dict[Path, Path] = {}
+        self._released = threading.Condition()
+        self.waits = 0
+
+    @contextmanager
+    def hold(self, owner: Path, targets: Iterable[Path]) -> Iterator[TargetClaim]:
+        claim = TargetClaim(self, owner, set(targets))
+        with self._released:
+            self._acquire(claim.owner, claim.targets)
+        try:
+            yield claim
+        finally:
+            with self._released:
+                self._release(claim.owner, claim.targets)
+
+    def _extend(self, claim: TargetClaim, targets: set[Path]) -> bool:
+        with self._released:
+            new_targets = targets - claim.targets
+            if not new_targets:
+                return True
+            busy = self._busy(claim.owner, new_targets)
+            if busy:
+                self._release(claim.owner, claim.targets)
+            claim.targets |= new_targets
+            self._acquire(claim.owner, claim.targets)
+            return not busy
+
+    def _acquire(self, owner: Path, targets: set[Path]) -> None:
+        if self._busy(owner, targets):
+            self.waits += 1
+            log.debug(f"`files`{owner}: waiting for another scan root to write a shared target")
+            self._released.wait_for(lambda: not self._busy(owner, targets))
+        for target in targets:
+            self._claims[target] = owner
+
+    def _release(self, owner: Path, targets: set[Path]) -> None:
+        for target in targets:
+            if self._claims.get(target) is owner:
+                del self._claims[target]
+        self._released.notify_all()
+
+    def _busy(self, owner: Path, targets: set[Path]) -> bool:
+        return any(self._claims.get(target, owner) is not owner for target in targets)
+
+    def __len__(self) -> int:
+        with self._released:
+            return len(self._claims)
+
+
+class SongDirPipeline:
+    """Stream song directories through scan, enrich, plan and execute stages.
+
+    Every stage runs in its own thread and hands directories to the next one
+    through a bounded queue, so a slow stage applies backpressure upstream and
+    at most a few directories are held in memory at any time. Execution runs
+    in the calling thread to keep interactive prompts on the main thread.
+    The enrich stage hands directories to an EnrichmentScheduler, so several
+    upcoming directories can be fetched while the current one is executed.
+    When several roots run in parallel, reservations keep them from writing
+    the same target and execution_lock serializes interactive execution.
+    """
+
+    def __init__(
+        self,
+        song_dirs: Iterable[SongDir],
+        depth: int = 2,
+        scan_index: ScanIndex | None = None,
+        scheduler: EnrichmentScheduler | None = None,
+        reservations: TargetReservations | None = None,
+        execution_lock: ContextManager | None = None,
+    ) -> None:
+        self.song_dirs = song_dirs
+        self.depth = max(depth, 1)
+        self.scan_index = scan_index
+        self.scheduler = scheduler
+        self.reservations = reservations
+        self.execution_lock = execution_lock
+        self._stop = threading.Event()
+
+    def run(self) -> ExecutionResult:
+        """Process all directories and return the summed execution result."""
+        discovered: queue.Queue = queue.Queue(maxsize=self.depth)
+        enriched: queue.Queue = queue.Queue(maxsize=self.depth)
+        planned: queue.Queue = queue.Queue(maxsize=self.depth)
+        threads = [
+            threading.Thread(target=self._produce, args=(discovered,), name="kimp3-scan", daemon=True),
+            threading.Thread(
+                target=self._enrich_stage, args=(discovered, enriched), name="kimp3-enrich", daemon=True
+            ),
+            threading.Thread(
+                target=self._stage, args=(enriched, planned, plan_song_dir), name="kimp3-plan", daemon=True
+            ),
+        ]
+        for thread in threads:
+            thread.start()
+
+        total = ExecutionResult()
+        try:
+            for song_dir in self._drain(planned):
+                result = self._execute(song_dir)
+                if result is not None:
+                    total.add(result)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        return total
+
+    def _execute(self, song_dir: SongDir) -> ExecutionResult | None:
+        reservation = (
+            nullcontext()
+            if self.reservations is None
+            else self.reservations.hold(song_dir.path, planned_targets(song_dir))
+        )
+        # The execution lock is taken first: extending a claim may wait for
+        # another root, which must not be queued behind this lock.
+        with self.execution_lock or nullcontext(), reservation as claim:
+            return execute_song_dir(song_dir, self.scan_index, claim)
+
+    def _produce(self, output: queue.Queue) -> None:
+        try:
+            for song_dir in self.song_dirs:
+                if not self._put(output, song_dir):
+                    return
+        except Exception:
+            log.exception("`scan`Directory scan stage failed")
+        finally:
+            self._put(output, _DONE)
+
+    def _stage(
+        self,
+        source: queue.Queue,
+        output: queue.Queue,
+        handler: Callable[[SongDir], SongDir],
+    ) -> None:
+        try:
+            for song_dir in self._drain(source):
+                try:
+                    result = handler(song_dir)
+                except Exception:
+                    log.exception(f"`state`Pipeline stage {handler.__name__} failed for {song_dir.path}")
+                    continue
+                if not self._put(output, result):
+                    return
+        finally:
+            self._put(output, _DONE)
+
+    def _enrich_stage(self, source: queue.Queue, output: queue.Queue) -> None:
+        if self.scheduler is None:
+            self._stage(source, output, enrich_song_dir)
+            return
+        window: deque[tuple[SongDir, Future, int]] = deque()
+        window_files = 0
+        try:
+            for song_dir in self._drain(source):
+                files = len(song_dir.audio_files)
+                while not self.scheduler.admits(window_files, len(window), files):
+                    window_files -= window[0][2]
+                    if not self._emit_enriched(window.popleft(), output):
+                        return
+                window.append((song_dir, self.scheduler.submit(song_dir), files))
+                window_files += files
+            while window:
+                if not self._emit_enriched(window.popleft(), output):
+                    return
+        finally:
+            for _, future, _ in window:
+                future.cancel()
+            self._put(output, _DONE)
+
+    def _emit_enriched(self, entry: tuple[SongDir, Future, int], output: queue.Queue) -> bool:
+        song_dir, future, _ = entry
+        try:
+            result = future.result()
+        except Exception:
+            log.exception(f"`state`Pipeline stage enrich_song_dir failed for {song_dir.path}")
+            return True
+        return self._put(output, result)
+
+    def _drain(self, source: queue.Queue) -> Iterator[SongDir]:
+        while True:
+            try:
+                item = source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                return
+            yield item
+
+    def _put(self, output: queue.Queue, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                output.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
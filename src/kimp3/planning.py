@@ -8,7 +8,7 @@ from typing import Any
 from mutagen import File as MutagenFile
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
-from kimp3.models import AudioTags, FileOperation
+from kimp3.models import Artwork, AudioInfo, AudioTags, FileOperation
 from kimp3.strings_operations import sanitize_path_component
 
 
@@ -77,6 +77,7 @@ class OperationPlan(BaseModel):
     skip_execution: bool = False
     skip_reason: str = ""
     replace_existing: bool = False
+    source_info: AudioInfo | None = None
 
     @property
     def operation(self) -> FileOperation:
@@ -302,6 +303,8 @@ MANAGED_TAG_FIELDS = [
 
 def _tag_value(tags: AudioTags, field: str) -> Any:
     value = getattr(tags, field)
+    if isinstance(value, Artwork):
+        return value.managed_value()
     if hasattr(value, "model_dump"):
         return value.model_dump()
     return value
@@ -318,7 +321,9 @@ def build_tag_change_plan(source_tags: AudioTags, target_tags: AudioTags) -> Tag
     return TagChangePlan(source_tags=source_tags, target_tags=target_tags, changes=changes)
 
 
-def _needs_genre_separator_rewrite(source_path: Path) -> bool:
+def _needs_genre_separator_rewrite(source_path: Path, source_info: AudioInfo | None = None) -> bool:
+    if source_info is not None:
+        return any("/" in genre for genre in source_info.raw_genres)
     try:
         audio = MutagenFile(source_path, easy=True)
     except Exception:
@@ -338,11 +343,16 @@ def build_operation_plan(
     target_tags: AudioTags,
     song_dir: object,
     settings: object,
+    source_info: AudioInfo | None = None,
 ) -> OperationPlan:
-    """Build a complete path+tag operation plan for one audio file."""
+    """Build a complete path+tag operation plan for one audio file.
+
+    source_info comes from the initial tag read; passing it avoids opening
+    the source file again.
+    """
     path_plan = build_path_plan(source_path, target_tags, song_dir, settings)
     tag_plan = build_tag_change_plan(source_tags, target_tags)
-    if _needs_genre_separator_rewrite(source_path) and not any(
+    if _needs_genre_separator_rewrite(source_path, source_info) and not any(
         change.field == "genres" for change in tag_plan.changes
     ):
         tag_plan.changes.append(
@@ -352,7 +362,12 @@ def build_operation_plan(
                 new_value=target_tags.genres,
             )
         )
-    return OperationPlan(path=path_plan, tags=tag_plan, warnings=[*path_plan.warnings])
+    return OperationPlan(
+        path=path_plan,
+        tags=tag_plan,
+        warnings=[*path_plan.warnings],
+        source_info=source_info,
+    )
 
 
 def validate_audio_plans(plans: list[PathPlan]) -> list[str]:
@@ -455,13 +470,22 @@ FORMAT_SCORE = {
 }
 
 
-def score_candidate(path: Path, tags: AudioTags | None = None, existing_library_file: bool = False) -> CandidateQuality:
-    """Score one candidate for keep-best conflict resolution."""
+def score_candidate(
+    path: Path,
+    tags: AudioTags | None = None,
+    existing_library_file: bool = False,
+    info: AudioInfo | None = None,
+) -> CandidateQuality:
+    """Score one candidate for keep-best conflict resolution.
+
+    Stream info is read from disk only when info was not already collected.
+    """
     score = FORMAT_SCORE.get(path.suffix.lower(), 0.0)
     reasons = [f"format={path.suffix.lower() or '<none>'}:{score:.0f}"]
     try:
-        audio = MutagenFile(path)
-        info = getattr(audio, "info", None)
+        if info is None:
+            audio = MutagenFile(path)
+            info = getattr(audio, "info", None)
         bitrate = int(getattr(info, "bitrate", 0) or 0)
         length = float(getattr(info, "length", 0.0) or 0.0)
         if bitrate:
@@ -577,7 +601,12 @@ def resolve_operation_conflicts(plans: list[OperationPlan]) -> list[ConflictDeci
                     )
                 )
                 continue
-            winner = max(group, key=lambda item: score_candidate(item.path.source_path, item.tags.target_tags).score)
+            winner = max(
+                group,
+                key=lambda item: score_candidate(
+                    item.path.source_path, item.tags.target_tags, info=item.source_info
+                ).score,
+            )
             losers = [plan for plan in group if plan is not winner]
             for loser in losers:
                 loser.skip_execution = True
@@ -649,7 +678,7 @@ def resolve_operation_conflicts(plans: list[OperationPlan]) -> list[ConflictDeci
                     )
                 )
                 continue
-            source_quality = score_candidate(plan.path.source_path, plan.tags.target_tags)
+            source_quality = score_candidate(plan.path.source_path, plan.tags.target_tags, info=plan.source_info)
             existing_quality = score_candidate(plan.path.target_path, None, existing_library_file=True)
             if existing_quality.score >= source_quality.score:
                 plan.skip_execution = True
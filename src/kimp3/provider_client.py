@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from typing import Any, Callable, Coroutine
+from urllib.parse import urlsplit
+
+import httpx
+
+from kimp3 import rate_limit, resilience
+from kimp3.config import APP_NAME
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+PROVIDER_ERRORS = (httpx.HTTPError, resilience.ProviderUnavailable)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(httpx.HTTPError):
+    """A streamed response body exceeded the allowed size."""
+
+    def __init__(self, url: str, max_bytes: int) -> None:
+        super().__init__(f"Response from {url} exceeds {max_bytes} bytes")
+        self.url = url
+        self.max_bytes = max_bytes
+
+
+class ProviderClient:
+    """Pooled HTTP clients for metadata providers, driven by one asyncio loop.
+
+    The loop runs in a background thread and keeps one httpx.AsyncClient per
+    host, so connections stay alive between lookups. Coroutines can await
+    request() directly; synchronous callers use get()/post(), which block
+    until the request finishes on the loop. Requests tagged with a provider
+    name are paced by that provider's limiter from rate_limit; blocking
+    calls are also retried and circuit-broken by resilience, raising
+    ProviderUnavailable once the provider gives up.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+    ) -> None:
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            log.debug("`network`HTTP/2 requested but the h2 package is not installed")
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: object) -> ProviderClient:
+        network = settings.network
+        return cls(
+            max_connections=network.max_connections,
+            max_keepalive_connections=network.max_keepalive_connections,
+            keepalive_expiry=network.keepalive_expiry,
+            http2=network.http2,
+        )
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="kimp3-network", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the client for the host of url. Must run on the loop."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=self.limits, http2=self.http2, follow_redirects=True
+            )
+            self._clients[host] = client
+        return client
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        return await self._client_for(url).request(method, url, **kwargs)
+
+    async def _stream(self, method: str, url: str, max_bytes: int, **kwargs: Any) -> httpx.Response:
+        """Read the body in chunks and give up as soon as it exceeds max_bytes."""
+        async with self._client_for(url).stream(method, url, **kwargs) as streamed:
+            if not streamed.is_success:
+                await streamed.aread()
+                return streamed
+            declared = streamed.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > max_bytes:
+                raise ResponseTooLarge(url, max_bytes)
+            chunks: list[bytes] = []
+            received = 0
+            async for chunk in streamed.aiter_raw(STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                if received > max_bytes:
+                    raise ResponseTooLarge(url, max_bytes)
+                chunks.append(chunk)
+        return httpx.Response(
+            streamed.status_code,
+            headers=streamed.headers,
+            content=b"".join(chunks),
+            request=streamed.request,
+        )
+
+    async def request(
+        self, method: str, url: str, provider: str | None = None, **kwargs: Any
+    ) -> httpx.Response:
+        """Send a request from any event loop; it is performed on the client loop.
+
+        With provider set, the request waits for that provider's rate limiter.
+        """
+        loop = self._ensure_loop()
+        limiter = rate_limit.get_limiter(provider) if provider else None
+        if limiter is not None:
+            await asyncio.get_running_loop().run_in_executor(None, limiter.acquire)
+        try:
+            if asyncio.get_running_loop() is loop:
+                response = await self._send(method, url, **kwargs)
+            else:
+                future = asyncio.run_coroutine_threadsafe(self._send(method, url, **kwargs), loop)
+                response = await asyncio.wrap_future(future)
+        finally:
+            if limiter is not None:
+                limiter.release()
+        if limiter is not None:
+            limiter.observe(response.status_code, response.headers)
+        return response
+
+    def run(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the client loop and wait for its result."""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("ProviderClient.run() called from the network loop")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    async def _consume(
+        self, method: str, url: str, on_chunk: Callable[[bytes], bool], **kwargs: Any
+    ) -> httpx.Response:
+        """Hand decoded body chunks to on_chunk until it returns True."""
+        async with self._client_for(url).stream(method, url, **kwargs) as streamed:
+            if streamed.is_success:
+                async for chunk in streamed.aiter_bytes(STREAM_CHUNK_SIZE):
+                    if on_chunk(chunk):
+                        break
+        headers = [
+            (name, value)
+            for name, value in streamed.headers.items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(streamed.status_code, headers=headers, request=streamed.request)
+
+    def _call_once(
+        self, send: Callable[[], Coroutine[Any, Any, httpx.Response]], provider: str | None
+    ) -> httpx.Response:
+        limiter = rate_limit.get_limiter(provider) if provider else None
+        if limiter is None:
+            response = self.run(send())
+        else:
+            with limiter.slot():
+                response = self.run(send())
+            limiter.observe(response.status_code, response.headers)
+        if response.status_code in resilience.TRANSIENT_STATUS_CODES:
+            response.raise_for_status()
+        return response
+
+    def _call(
+        self, send: Callable[[], Coroutine[Any, Any, httpx.Response]], provider: str | None
+    ) -> httpx.Response:
+        if provider is None:
+            return self._call_once(send, provider)
+        return resilience.call(provider, lambda: self._call_once(send, provider))
+
+    def get(self, url: str, provider: str | None = None, **kwargs: Any) -> httpx.Response:
+        return self._call(lambda: self._send("GET", url, **kwargs), provider)
+
+    def post(self, url: str, provider: str | None = None, **kwargs: Any) -> httpx.Response:
+        return self._call(lambda: self._send("POST", url, **kwargs), provider)
+
+    def download(
+        self, url: str, provider: str | None = None, max_bytes: int = 0, **kwargs: Any
+    ) -> httpx.Response:
+        """GET url, streaming the body; raises ResponseTooLarge past max_bytes (0 = no limit)."""
+        if not max_bytes:
+            return self.get(url, provider, **kwargs)
+        return self._call(lambda: self._stream("GET", url, max_bytes, **kwargs), provider)
+
+    def stream(
+        self,
+        url: str,
+        start: Callable[[], Callable[[bytes], bool]],
+        provider: str | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """GET url and feed its body to a chunk callback that can stop the download.
+
+        start() is called before every attempt, retries included, and returns
+        the callback; the callback returns True once it has read enough. The
+        returned response carries status and headers but no body.
+        """
+        return self._call(lambda: self._consume("GET", url, start(), **kwargs), provider)
+
+    def stats(self) -> dict[str, int]:
+        return {"http_clients": len(self._clients)}
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def close_clients() -> None:
+            for client in self._clients.values():
+                await client.aclose()
+            self._clients.clear()
+
+        asyncio.run_coroutine_threadsafe(close_clients(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+_client: ProviderClient | None = None
+_client_lock = threading.Lock()
+
+
+def configure(settings: object) -> ProviderClient:
+    """Replace the shared client with one built from settings."""
+    global _client
+    with _client_lock:
+        previous, _client = _client, ProviderClient.from_settings(settings)
+    if previous is not None:
+        previous.close()
+    return _client
+
+
+def get_client() -> ProviderClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ProviderClient()
+        return _client
+
+
+async def request(method: str, url: str, provider: str | None = None, **kwargs: Any) -> httpx.Response:
+    return await get_client().request(method, url, provider, **kwargs)
+
+
+def get(url: str, provider: str | None = None, **kwargs: Any) -> httpx.Response:
+    return get_client().get(url, provider, **kwargs)
+
+
+def post(url: str, provider: str | None = None, **kwargs: Any) -> httpx.Response:
+    return get_client().post(url, provider, **kwargs)
+
+
+def download(url: str, provider: str | None = None, max_bytes: int = 0, **kwargs: Any) -> httpx.Response:
+    return get_client().download(url, provider, max_bytes, **kwargs)
+
+
+def stream(
+    url: str,
+    start: Callable[[], Callable[[bytes], bool]],
+    provider: str | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    return get_client().stream(url, start, provider, **kwargs)
+
+
+def get_stats() -> dict[str, int]:
+    return _client.stats() if _client is not None else {"http_clients": 0}
+
+
+def close() -> None:
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import email.utils
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Mapping
+
+from kimp3.config import APP_NAME
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+THROTTLE_STATUS_CODES = (429, 503)
+DEFAULT_BACKOFF_SECONDS = 5.0
+MAX_BACKOFF_SECONDS = 300.0
+
+
+class TokenBucket:
+    """Token bucket refilled at rate tokens per second, holding up to burst.
+
+    reserve() takes a token and returns how long the caller has to wait
+    before using it. The lock is held only for the arithmetic, so waiting
+    callers never block each other.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(self._blocked_until - now, 0.0) + delay
+
+    def block_for(self, seconds: float) -> None:
+        """Hold back all reservations for seconds, e.g. after Retry-After."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class ProviderLimiter:
+    """Request pacing for one provider: a token bucket plus an in-flight cap."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_second: float,
+        burst: int = 1,
+        max_in_flight: int = 1,
+    ) -> None:
+        self.name = name
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_in_flight = max_in_flight
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._stats_lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Wait for a token without taking an in-flight slot."""
+        delay = self.bucket.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        with self._stats_lock:
+            self.requests += 1
+            self.waited_seconds += delay
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold an in-flight slot and a token for the duration of one request."""
+        with self._slots:
+            self.wait()
+            yield
+
+    def acquire(self) -> None:
+        self._slots.acquire()
+        try:
+            self.wait()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def observe(self, status_code: int, headers: Mapping[str, str] | None = None) -> None:
+        """Back off the provider after a 429/503 response."""
+        if status_code not in THROTTLE_STATUS_CODES:
+            return
+        delay = retry_after_seconds(headers or {})
+        self.bucket.block_for(delay)
+        with self._stats_lock:
+            self.throttled += 1
+        log.warning(f"`network`{self.name}: HTTP {status_code}, pausing requests for {delay:.1f}s")
+
+    def stats(self) -> dict[str, float]:
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+def retry_after_seconds(headers: Mapping[str, str], default: float = DEFAULT_BACKOFF_SECONDS) -> float:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    value = next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+    if not value:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return default
+        seconds = retry_at.timestamp() - time.time()
+    return min(max(seconds, 0.0), MAX_BACKOFF_SECONDS)
+
+
+_limiters: dict[str, ProviderLimiter] = {}
+_limits: Mapping[str, object] = {}
+_lock = threading.Lock()
+
+
+def configure(limits: Mapping[str, object]) -> None:
+    """Set per-provider budgets; objects need requests_per_second, burst and max_in_flight."""
+    global _limits
+    with _lock:
+        _limits = dict(limits)
+        _limiters.clear()
+
+
+def get_limiter(provider: str) -> ProviderLimiter | None:
+    """Return the limiter for provider, or None when it has no budget."""
+    with _lock:
+        limiter = _limiters.get(provider)
+        if limiter is None and provider in _limits:
+            limit = _limits[provider]
+            limiter = _limiters[provider] = ProviderLimiter(
+                provider,
+                requests_per_second=limit.requests_per_second,
+                burst=limit.burst,
+                max_in_flight=limit.max_in_flight,
+            )
+        return limiter
+
+
+def install_pylast_limiter(network: object, provider: str = "lastfm") -> None:
+    """Pace pylast requests of network with the provider's token bucket.
+
+    pylast calls network._delay_call() before every request when rate
+    limiting is enabled, so the bucket replaces its fixed 0.2 s spacing.
+    pylast has no hook after the request, so max_in_flight does not apply.
+    """
+    limiter = get_limiter(provider)
+    if limiter is None:
+        return
+    network.limit_rate = True
+    network._delay_call = limiter.wait
+
+
+def get_stats() -> dict[str, dict[str, float]]:
+    with _lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+import httpx
+import pylast
+
+from kimp3.config import APP_NAME
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+T = TypeVar("T")
+
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Last.FM web service codes for "operation failed", "service offline",
+# "temporarily unavailable" and "rate limit exceeded".
+TRANSIENT_LASTFM_STATUSES = frozenset({"8", "11", "16", "29"})
+
+
+class ProviderUnavailable(Exception):
+    """A provider could not answer: retries were exhausted or its circuit is open.
+
+    Unlike a "not found" answer this says nothing about the looked-up item,
+    so callers must not cache it as a negative result.
+    """
+
+    def __init__(self, provider: str, cause: BaseException | None = None) -> None:
+        self.provider = provider
+        self.cause = cause
+        reason = f": {cause}" if cause else " (circuit open)"
+        super().__init__(f"{provider} unavailable{reason}")
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return True for errors worth retrying: transport failures and overload."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, (pylast.NetworkError, pylast.MalformedResponseError)):
+        return True
+    if isinstance(error, pylast.WSError):
+        return str(error.status) in TRANSIENT_LASTFM_STATUSES
+    return False
+
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures for cooldown seconds.
+
+    Once the cool-down has passed one trial call is let through; its outcome
+    closes the circuit again or re-opens it for another cool-down.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 60.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.consecutive_failures = 0
+        self.opened = 0
+        self._open_until = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.consecutive_failures < self.failure_threshold:
+                return True
+            if time.monotonic() < self._open_until or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> bool:
+        """Count a failure; return True when it opened the circuit."""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_running = False
+            if self.consecutive_failures < self.failure_threshold:
+                return False
+            self._open_until = time.monotonic() + self.cooldown_seconds
+            self.opened += 1
+            return True
+
+    def end_trial(self) -> None:
+        """Let the next trial through if the current one ended without an outcome."""
+        with self._lock:
+            self._trial_running = False
+
+
+class ProviderGuard:
+    """Retries transient provider errors and tracks the provider's circuit."""
+
+    def __init__(
+        self,
+        name: str,
+        retries: int = 2,
+        backoff_seconds: float = 0.5,
+        backoff_max_seconds: float = 8.0,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 60.0,
+    ) -> None:
+        self.name = name
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.breaker = CircuitBreaker(failure_threshold, cooldown_seconds)
+        self.calls = 0
+        self.retried = 0
+        self.failures = 0
+        self.skipped = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, field: str) -> None:
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def call(self, function: Callable[[], T]) -> T:
+        """Call function with retries.
+
+        Non-transient errors are re-raised unchanged, so callers can treat
+        them as negative answers. Exhausted retries and an open circuit
+        raise ProviderUnavailable.
+        """
+        if not self.breaker.allow():
+            self._count("skipped")
+            raise ProviderUnavailable(self.name)
+        self._count("calls")
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    result = function()
+                except Exception as error:
+                    if not is_transient(error):
+                        self.breaker.record_success()
+                        raise
+                    if attempt < self.retries:
+                        self._count("retried")
+                        delay = min(self.backoff_seconds * 2**attempt, self.backoff_max_seconds)
+                        log.debug(f"`network`{self.name}: {error}, retrying in {delay:.1f}s")
+                        time.sleep(delay)
+                        continue
+                    self._count("failures")
+                    if self.breaker.record_failure():
+                        log.warning(
+                            f"`network`{self.name}: {self.breaker.consecutive_failures} consecutive failures, "
+                            f"skipping calls for {self.breaker.cooldown_seconds:.0f}s"
+                        )
+                    raise ProviderUnavailable(self.name, error) from error
+                self.breaker.record_success()
+                return result
+        finally:
+            # KeyboardInterrupt and other BaseExceptions skip both record calls.
+            self.breaker.end_trial()
+        raise AssertionError("unreachable")
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "retried": self.retried,
+                "failures": self.failures,
+                "skipped": self.skipped,
+                "circuit_opened": self.breaker.opened,
+            }
+
+
+_guards: dict[str, ProviderGuard] = {}
+_options: dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def configure(settings: object) -> None:
+    """Read retry and circuit breaker options from settings.network."""
+    global _options
+    network = settings.network
+    with _lock:
+        _options = {
+            "retries": network.retries,
+            "backoff_seconds": network.backoff_seconds,
+            "backoff_max_seconds": network.backoff_max_seconds,
+            "failure_threshold": network.failure_threshold,
+            "cooldown_seconds": network.cooldown_seconds,
+        }
+        _guards.clear()
+
+
+def get_guard(provider: str) -> ProviderGuard:
+    with _lock:
+        guard = _guards.get(provider)
+        if guard is None:
+            guard = _guards[provider] = ProviderGuard(provider, **_options)
+        return guard
+
+
+def call(provider: str, function: Callable[[], T]) -> T:
+    return get_guard(provider).call(function)
+
+
+def get_stats() -> dict[str, dict[str, int]]:
+    with _lock:
+        guards = list(_guards.values())
+    return {guard.name: guard.stats() for guard in guards}
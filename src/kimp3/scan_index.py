@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from kimp3.config import APP_NAME
+from kimp3.models import AudioTags
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+INDEX_FILENAME = "scan_index.sqlite"
+SCHEMA_VERSION = 2
+SETTLED_OUTCOME = "noop"
+SETTINGS_EXCLUDED_SECTIONS = {"runtime", "logging", "cache", "network", "interactive", "dry_run", "purge_cache"}
+SETTINGS_EXCLUDED_FIELDS = {
+    "scan": {"pipeline_depth", "read_workers", "prefetch_depth", "prefetch_max_files", "root_workers"},
+    "tags": {
+        "rate_limits",
+        "cover_max_download_mb",
+        "cover_workers",
+        "lyrics_race",
+        "llm_batch_size",
+        "artwork_store_mb",
+    },
+}
+
+
+@dataclass(frozen=True)
+class FileStat:
+    """Stat tuple used to detect unchanged files between runs."""
+
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_path(cls, path: Path) -> FileStat:
+        stat = os.stat(path)
+        return cls(inode=stat.st_ino, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """One file recorded after planning, with the target and genre links its plan expects."""
+
+    path: Path
+    stat: FileStat
+    fingerprint: str
+    outcome: str
+    target: Path | None = None
+    links: tuple[Path, ...] = ()
+
+
+def settings_digest(settings: object) -> str:
+    """Digest settings that influence planning, so config changes invalidate the index."""
+    exclude = {**{section: True for section in SETTINGS_EXCLUDED_SECTIONS}, **SETTINGS_EXCLUDED_FIELDS}
+    dumped = settings.model_dump(exclude=exclude)
+    return hashlib.sha256(repr(dumped).encode("utf-8")).hexdigest()
+
+
+def fingerprint_digest(tags: AudioTags) -> str:
+    """Digest the managed tag fingerprint without repr()-ing artwork bytes."""
+    digest = hashlib.sha256()
+    for value in tags.managed_fingerprint():
+        if isinstance(value, bytes):
+            digest.update(hashlib.sha256(value).digest())
+        else:
+            digest.update(repr(value).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def plan_is_settled(plan: object) -> bool:
+    """Return True when a plan would not change the file, its path or its genre links."""
+    if plan is None or plan.errors or plan.skip_execution:
+        return False
+    if plan.requires_tag_write or plan.requires_file_operation:
+        return False
+    return _links_in_place(plan.path.target_path, plan.path.genre_links)
+
+
+def _links_in_place(target: Path, links: Iterable[Path]) -> bool:
+    resolved = os.path.realpath(target)
+    return all(link.is_symlink() and os.path.realpath(link) == resolved for link in links)
+
+
+def _targets_in_place(target: str, links: str) -> bool:
+    """Return True when the recorded target exists and every genre link still points at it."""
+    if not target:
+        return True
+    return os.path.exists(target) and _links_in_place(Path(target), map(Path, json.loads(links)))
+
+
+class ScanIndex:
+    """SQLite index of file stat tuples and the outcome of their last plan.
+
+    Files whose path, inode, size and mtime are unchanged and whose last plan
+    was a no-op are served from the index instead of being parsed again, as
+    long as the target and genre links that plan expected are still in place.
+    """
+
+    def __init__(self, path: Path, settings_key: str, max_age_days: int = 30) -> None:
+        self.path = Path(path)
+        self.settings_key = settings_key
+        self.max_age_seconds = max(0, max_age_days) * 86400
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._ensure_schema()
+
+    @classmethod
+    def open(cls, settings: object) -> ScanIndex | None:
+        """Open the index configured in settings, or return None when disabled."""
+        if not settings.scan.use_index:
+            return None
+        index_path = Path(settings.paths.cache_dir) / INDEX_FILENAME
+        try:
+            return cls(
+                index_path,
+                settings_digest(settings),
+                max_age_days=settings.scan.index_max_age_days,
+            )
+        except (OSError, sqlite3.Error) as error:
+            log.warning(f"`scan,state`Scan index unavailable at {index_path}: {error}")
+            return None
+
+    def _ensure_schema(self) -> None:
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                self._connection.execute("DROP TABLE IF EXISTS files")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    inode INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    settings TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    outcome TEXT NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    target TEXT NOT NULL,
+                    links TEXT NOT NULL
+                )
+                """
+            )
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def is_settled(self, path: Path, stat: FileStat) -> bool:
+        """Return True when path is unchanged since a no-op plan was recorded.
+
+        A deleted target or a removed or retargeted genre link makes the
+        file unsettled, so the next plan recreates it.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT inode, size, mtime_ns, settings, outcome, recorded_at, target, links"
+                " FROM files WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+        if row is None:
+            return False
+        inode, size, mtime_ns, settings_key, outcome, recorded_at, target, links = row
+        if (inode, size, mtime_ns) != (stat.inode, stat.size, stat.mtime_ns):
+            return False
+        if settings_key != self.settings_key or outcome != SETTLED_OUTCOME:
+            return False
+        if time.time() - recorded_at >= self.max_age_seconds:
+            return False
+        return _targets_in_place(target, links)
+
+    def record(self, entries: Iterable[IndexEntry]) -> None:
+        """Store the latest plan outcome for each entry."""
+        now = time.time()
+        rows = [
+            (
+                str(entry.path),
+                entry.stat.inode,
+                entry.stat.size,
+                entry.stat.mtime_ns,
+                self.settings_key,
+                entry.fingerprint,
+                entry.outcome,
+                now,
+                str(entry.target) if entry.target is not None else "",
+                json.dumps([str(link) for link in entry.links]),
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error as error:
+            log.warning(f"`scan,state`Failed to update scan index: {error}")
+
+    def record_song_dir(self, song_dir: object) -> None:
+        """Record plan outcomes for every audio file scanned in song_dir."""
+        entries = []
+        for audio_file in song_dir.audio_files:
+            stat = getattr(audio_file, "file_stat", None)
+            plan = audio_file.operation_plan
+            if stat is None or plan is None:
+                continue
+            entries.append(
+                IndexEntry(
+                    path=plan.path.source_path,
+                    stat=stat,
+                    fingerprint=fingerprint_digest(audio_file.original_tags),
+                    outcome=SETTLED_OUTCOME if plan_is_settled(plan) else "changed",
+                    target=plan.path.target_path,
+                    links=tuple(plan.path.genre_links),
+                )
+            )
+        self.record(entries)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -5,6 +5,7 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from kimp3.genres import GenreCycleError, find_genre_cycle
 from kimp3.models import FileOperation
 
 
@@ -39,6 +40,13 @@ class ScanSettings(BaseModel):
     )
     create_symlinks_in_none: bool = False
     common_files: list[str] = Field(default_factory=list)
+    use_index: bool = True
+    index_max_age_days: int = 30
+    pipeline_depth: int = Field(default=2, ge=1)
+    read_workers: int = Field(default=1, ge=0)
+    prefetch_depth: int = Field(default=2, ge=1)
+    prefetch_max_files: int = Field(default=1000, ge=1)
+    root_workers: int = Field(default=1, ge=1)
 
     @field_validator("dir_list", mode="before")
     @classmethod
@@ -106,6 +114,25 @@ class PathsSettings(BaseModel):
         return str(Path(str(value)).expanduser())
 
 
+class ProviderRateLimit(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    requests_per_second: float = Field(gt=0)
+    burst: int = Field(default=1, ge=1)
+    max_in_flight: int = Field(default=1, ge=1)
+
+
+def _default_rate_limits() -> dict[str, ProviderRateLimit]:
+    return {
+        "lastfm": ProviderRateLimit(requests_per_second=5, burst=5, max_in_flight=8),
+        "musicbrainz": ProviderRateLimit(requests_per_second=1, burst=1, max_in_flight=1),
+        "covers": ProviderRateLimit(requests_per_second=10, burst=10, max_in_flight=8),
+        "lyrics_ovh": ProviderRateLimit(requests_per_second=5, burst=5, max_in_flight=4),
+        "genius": ProviderRateLimit(requests_per_second=5, burst=5, max_in_flight=4),
+        "llm": ProviderRateLimit(requests_per_second=2, burst=2, max_in_flight=2),
+    }
+
+
 class TagsSettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -113,15 +140,23 @@ class TagsSettings(BaseModel):
     fetch_workers: int = 4
     fetch_album_cover: bool = True
     fetch_lyrics: bool = True
+    lyrics_race: bool = False
     lyrics_not_found_retry_days: int = 90
     lyrics_not_found_retry_jitter_days: int = 30
     skip_existing_tags: bool = True
     skip_existing_cover: bool = True
+    artwork_store_mb: int = Field(default=64, ge=0)
+    cover_max_dimension: int = Field(default=1000, ge=0)
+    cover_jpeg_quality: int = Field(default=85, ge=1, le=95)
+    cover_target_kb: int = Field(default=500, ge=0)
+    cover_max_download_mb: int = Field(default=20, ge=1)
+    cover_workers: int = Field(default=2, ge=0)
     skip_existing_lyrics: bool = True
     album_metadata_source: Literal[
         "musicbrainz_first", "lastfm_first", "musicbrainz_only", "lastfm_only"
     ] = "musicbrainz_first"
     musicbrainz_contact: str = "https://github.com/kimifish/kimp3"
+    rate_limits: dict[str, ProviderRateLimit] = Field(default_factory=_default_rate_limits)
     lastfm_api_key: str | None = None
     lastfm_api_secret: str | None = None
     genius_token: str | None = None
@@ -164,6 +199,14 @@ class TagsSettings(BaseModel):
     use_llm: bool = False
     llm_url: str = ""
     llm_timeout: int = 30
+    llm_batch_size: int = Field(default=20, ge=0)
+
+    @field_validator("rate_limits", mode="after")
+    @classmethod
+    def merge_default_rate_limits(
+        cls, value: dict[str, ProviderRateLimit]
+    ) -> dict[str, ProviderRateLimit]:
+        return {**_default_rate_limits(), **value}
 
     @field_validator("banned_tags", mode="before")
     @classmethod
@@ -194,6 +237,14 @@ class TagsSettings(BaseModel):
             for tag, artists in value.items()
         }
 
+    @field_validator("genre_parents", mode="after")
+    @classmethod
+    def reject_genre_cycles(cls, value: dict[str, str]) -> dict[str, str]:
+        cycle = find_genre_cycle(value)
+        if cycle:
+            raise GenreCycleError(cycle)
+        return value
+
 
 class LoggerSuppressSettings(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -211,15 +262,44 @@ class LoggingSettings(BaseModel):
     )
 
 
+class CacheSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    enabled: bool = True
+    ttl_days: float = Field(default=30, ge=0)
+    negative_ttl_days: float = Field(default=3, ge=0)
+    max_entries: int = Field(default=200_000, ge=1)
+    namespace_ttl_days: dict[str, float] = Field(default_factory=dict)
+    cover_cache_mb: int = Field(default=256, ge=1)
+    cover_memory_mb: int = Field(default=32, ge=0)
+
+
+class NetworkSettings(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    max_connections: int = Field(default=20, ge=1)
+    max_keepalive_connections: int = Field(default=10, ge=0)
+    keepalive_expiry: float = Field(default=30.0, ge=0)
+    http2: bool = True
+    retries: int = Field(default=2, ge=0)
+    backoff_seconds: float = Field(default=0.5, ge=0)
+    backoff_max_seconds: float = Field(default=8.0, ge=0)
+    failure_threshold: int = Field(default=5, ge=1)
+    cooldown_seconds: float = Field(default=60.0, ge=0)
+
+
 class Settings(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     interactive: bool = True
     dry_run: bool = False
+    purge_cache: bool = False
     scan: ScanSettings = Field(default_factory=ScanSettings)
     collection: CollectionSettings = Field(default_factory=CollectionSettings)
     paths: PathsSettings = Field(default_factory=PathsSettings)
     tags: TagsSettings = Field(default_factory=TagsSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    network: NetworkSettings = Field(default_factory=NetworkSettings)
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
     runtime: RuntimeSettings = Field(default_factory=RuntimeSettings)
 
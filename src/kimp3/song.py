@@ -9,10 +9,11 @@ from typing import List
 import kimp3.tags
 from kimp3.backends import TagWritePolicy, get_backend
 from kimp3.config import APP_NAME, cfg
-from kimp3.encoding import repair_audio_tags_text_encoding
 from kimp3.interface.utils import yes_or_no
-from kimp3.models import AbstractSongDir, AudioTags, FileOperation, UsualFile
+from kimp3.models import AbstractSongDir, AudioInfo, AudioTags, FileOperation, UsualFile
 from kimp3.planning import OperationPlan, build_operation_plan
+from kimp3.scan_index import FileStat
+from kimp3.tag_reader import TagRecord, prepare_tags
 from kimp3.title_case import normalize_audio_tag_titles
 
 log = logging.getLogger(f"{APP_NAME}.{__name__}")
@@ -21,23 +22,37 @@ log = logging.getLogger(f"{APP_NAME}.{__name__}")
 class AudioFile(UsualFile):
     """Class for working with MP3 files, including tags and file operations."""
     
-    def __init__(self, filepath: str | Path, song_dir: AbstractSongDir):
+    def __init__(
+        self,
+        filepath: str | Path,
+        song_dir: AbstractSongDir,
+        tag_record: TagRecord | None = None,
+    ):
         super().__init__(filepath, song_dir)
         
         self.genre_paths: List[Path] = []
-        self.tags = self._read_tags()
-        self.original_tags = self.tags.model_copy(deep=True)
-        self.tags = repair_audio_tags_text_encoding(self.tags)
-        self.tags = normalize_audio_tag_titles(self.tags, cfg.tags)
+        self.audio_info: AudioInfo | None = None
+        if tag_record is None:
+            raw_tags = self._read_tags()
+            tag_record = TagRecord(
+                path=self.filepath,
+                original=raw_tags.model_copy(deep=True),
+                tags=prepare_tags(raw_tags, cfg.tags),
+            )
+        else:
+            self.audio_info = tag_record.info
+        self.original_tags = tag_record.original
+        self.tags = tag_record.tags
         self.old_tags = AudioTags()
         self.skip_tag_write = False
         self.tag_write_success = False
         self.operation_plan: OperationPlan | None = None
+        self.file_stat: FileStat | None = None
 
     def _read_tags(self) -> AudioTags:
         """Reads tags from file using mutagen."""
         try:
-            tags = get_backend(self.filepath).read(self.filepath)
+            tags, self.audio_info = get_backend(self.filepath).read_with_info(self.filepath, headers_only=True)
             if tags.lyrics:
                 log.debug(f"`tags`Found lyrics: {tags.lyrics.text[:100]}...")
             else:
@@ -58,7 +73,10 @@ class AudioFile(UsualFile):
 
     def fetch_tags(self) -> dict[str, tuple[str, str]]:
         """Checks and corrects tags via Last.FM.
-        
+
+        Album-level lookups go through the song directory's album resolver
+        when it has one, so they are done once per album.
+
         Returns:
             Dictionary of changes in format {field: (old_value, new_value)}
         """
@@ -83,7 +101,9 @@ class AudioFile(UsualFile):
         try:
             # Update tags via Last.FM
             if cfg.tags.fetch_tags:
-                self.tags = kimp3.tags.TaggedTrack(self.tags, self.song_dir).get_audiotags()
+                album_resolver = getattr(self.song_dir, "album_resolver", None)
+                album = album_resolver.resolve(self.tags) if album_resolver else None
+                self.tags = kimp3.tags.TaggedTrack(self.tags, self.song_dir, album).get_audiotags()
             
             # Handle 'The' article in artist name
             for field in ['artist', 'album_artist']:
@@ -141,7 +161,14 @@ class AudioFile(UsualFile):
         """Calculates new path for file based on tags and configuration."""
         self.genre_paths = []
         try:
-            plan = build_operation_plan(self.filepath, self.original_tags, self.tags, self.song_dir, cfg)
+            plan = build_operation_plan(
+                self.filepath,
+                self.original_tags,
+                self.tags,
+                self.song_dir,
+                cfg,
+                source_info=getattr(self, "audio_info", None),
+            )
             self.operation_plan = plan
             self.operation_processed = FileOperation.NONE
             self.planned_operation = plan.operation
@@ -217,12 +244,12 @@ class AudioFile(UsualFile):
             console.print(genre_panel)
 
         # Print album cover
-        if show_cover and self.tags.album_cover:
-            cover_size = len(self.tags.album_cover) / 1024  # Convert to KB
+        if show_cover and self.tags.artwork:
+            cover_size = self.tags.artwork.size / 1024  # Convert to KB
             cover_content = (
                 f"[green]Cover image present[/green]\n"
                 f"Size: [cyan]{cover_size:.1f}[/cyan] KB\n"
-                f"Type: [cyan]{self.tags.album_cover_mime}[/cyan]"
+                f"Type: [cyan]{self.tags.artwork.mime}[/cyan]"
             )
             cover_panel = Panel(
                 cover_content,
@@ -4,6 +4,7 @@
 
 import logging
 from concurrent.futures import ThreadPoolExecutor
+import kimp3.tags
 from kimp3.interface.utils import yes_or_no
 from kimp3.song import AudioFile, UsualFile
 from pathlib import Path
@@ -13,6 +14,9 @@ from kimp3.config import cfg, APP_NAME
 from kimp3.checks import test_is_album, test_is_compilation
 from kimp3.models import AbstractSongDir, FileOperation
 from kimp3.planning import PathPlan, score_candidate, validate_audio_plans, validate_operation_plans
+from kimp3.scan_index import FileStat
+from kimp3.tag_processing import prefetch_llm_tag_suggestions
+from kimp3.tag_reader import TagRecord, TitleSettings
 
 log = logging.getLogger(f"{APP_NAME}.{__name__}")
 
@@ -33,6 +37,9 @@ class SongDir(AbstractSongDir):
         """
         super().__init__(scan_path)
         self.parent = parent
+        self.index_hits = 0
+        self.index_misses = 0
+        self.album_resolver = None
 
         self._scan_directory()
         self._analyze_directory()
@@ -45,22 +52,64 @@ class SongDir(AbstractSongDir):
     def _scan_directory(self) -> None:
         """Scan directory for audio files and common album files."""
         try:
-            for entry in self.path.iterdir():
-                if not entry.is_file():
-                    continue
-                    
+            entries = [entry for entry in self.path.iterdir() if entry.is_file()]
+            audio_entries = [entry for entry in entries if entry.suffix.lower() in cfg.scan.valid_extensions]
+            file_stats = self._stat_files(audio_entries)
+            if self._served_from_index(audio_entries, file_stats):
+                self.index_hits = len(audio_entries)
+                log.debug(f"`scan`Unchanged since last no-op plan, served from scan index: {self.path}")
+                return
+
+            tag_records = self._read_tag_records(audio_entries)
+            for entry in entries:
                 if entry.suffix.lower() in cfg.scan.valid_extensions:
                     log.debug(f"`scan`+ {str(entry).replace(str(self.path), '…')}")
-                    audio_file = AudioFile(filepath=entry, song_dir=self)
+                    audio_file = AudioFile(filepath=entry, song_dir=self, tag_record=tag_records.get(entry))
                     if audio_file:
+                        audio_file.file_stat = file_stats.get(entry)
                         self.audio_files.append(audio_file)
                 elif entry.name.lower() in [f.lower() for f in cfg.scan.common_files]:
                     log.debug(f"`scan`+ {str(entry).replace(str(self.path), '…')}")
                     self.common_files.append(UsualFile(filepath=entry, song_dir=self))
+            self.index_misses = len(self.audio_files)
 
         except OSError as e:
             log.error(f"`scan,files`Error scanning directory {self.path}: {e}")
 
+    def _read_tag_records(self, audio_entries: List[Path]) -> Dict[Path, TagRecord]:
+        """Read tags through the run-wide process pool when one is configured."""
+        tag_reader = getattr(self.parent, "tag_reader", None)
+        if tag_reader is None or not tag_reader.parallel:
+            return {}
+        return tag_reader.read(audio_entries, TitleSettings.from_config(cfg.tags))
+
+    @staticmethod
+    def _stat_files(entries: List[Path]) -> Dict[Path, FileStat]:
+        """Collect stat tuples used by the scan index."""
+        file_stats = {}
+        for entry in entries:
+            try:
+                file_stats[entry] = FileStat.from_path(entry)
+            except OSError:
+                continue
+        return file_stats
+
+    def _served_from_index(self, audio_entries: List[Path], file_stats: Dict[Path, FileStat]) -> bool:
+        """Return True when every audio file is unchanged since a no-op plan.
+
+        Album, compilation and track-count detection look at the whole
+        directory, so a directory is either served from the index entirely
+        or parsed entirely.
+        """
+        scan_index = getattr(self.parent, "scan_index", None)
+        if scan_index is None or not audio_entries:
+            return False
+        return all(
+            entry in file_stats
+            and scan_index.is_settled(entry.resolve(strict=False), file_stats[entry])
+            for entry in audio_entries
+        )
+
     def _analyze_directory(self) -> None:
         """Analyze directory contents to determine if it's an album/compilation."""
         if not self.audio_files:
@@ -113,7 +162,12 @@ class SongDir(AbstractSongDir):
         for (_album_dir, _disc, track_number), files in groups.items():
             if len(files) <= 1:
                 continue
-            winner = max(files, key=lambda item: score_candidate(item.filepath, item.tags).score)
+            winner = max(
+                files,
+                key=lambda item: score_candidate(
+                    item.filepath, item.tags, info=getattr(item, "audio_info", None)
+                ).score,
+            )
             for audio_file in files:
                 if audio_file is winner:
                     continue
@@ -183,8 +237,12 @@ class SongDir(AbstractSongDir):
 
     def fetch_tags(self):
         """Check and correct tags for all songs in directory."""
-        log.info("`network,tags`Fetching tags...")
+        log.info(f"`network,tags`Fetching tags for {self.path}...")
         changes = {}
+        if getattr(self, "is_album", False) and cfg.tags.fetch_tags:
+            self.album_resolver = kimp3.tags.AlbumResolver(self)
+        if cfg.tags.fetch_tags and cfg.tags.use_llm:
+            self._prefetch_llm_suggestions()
         workers = min(max(cfg.tags.fetch_workers, 1), len(self.audio_files) or 1)
         if workers == 1:
             for audio_file in self.audio_files:
@@ -197,6 +255,15 @@ class SongDir(AbstractSongDir):
                 changes[str(audio_file.filepath).replace(str(self.path.parent), '')] = future.result()
         return changes
 
+    def _prefetch_llm_suggestions(self) -> None:
+        """Ask the LLM about the directory's tracks in batches instead of one by one."""
+        skip_tagged = cfg.tags.skip_existing_tags
+        prefetch_llm_tag_suggestions(
+            (audio_file.tags.artist, audio_file.tags.title)
+            for audio_file in self.audio_files
+            if not (skip_tagged and audio_file.tags.genre and audio_file.tags.lastfm_tags)
+        )
+
     def gather_tag_values(self, tag_name: str) -> Set[str]:
         """Gather unique values of specified tag from all audio files.
         
@@ -83,26 +83,32 @@ def split_album_title(title: str) -> tuple[str, str]:
     return base or title.strip(), " ".join(item for item in qualifiers if item)
 
 
-def _casefolded_ratio(str1: str, str2: str) -> float:
+def _ratio(str1: str, str2: str) -> float:
     if not str1 and not str2:
         return 1.0
     if not str1 or not str2:
         return 0.0
-    return SequenceMatcher(None, str1.casefold(), str2.casefold()).ratio()
+    return SequenceMatcher(None, str1, str2).ratio()
 
 
-def album_title_similarity(
-    candidate: str,
-    query: str,
+def album_title_parts(title: str) -> tuple[str, str]:
+    """Return the casefolded primary title and qualifier compared by album_parts_similarity."""
+    base, qualifier = split_album_title(title)
+    return base.casefold(), qualifier.casefold()
+
+
+def album_parts_similarity(
+    candidate: tuple[str, str],
+    query: tuple[str, str],
     min_ratio: float = ALBUM_TITLE_MATCH_THRESHOLD,
 ) -> float:
-    """Compare album titles while treating parenthetical qualifiers as weak evidence."""
-    candidate_base, candidate_qualifier = split_album_title(candidate)
-    query_base, query_qualifier = split_album_title(query)
+    """album_title_similarity() for titles already split by album_title_parts()."""
+    candidate_base, candidate_qualifier = candidate
+    query_base, query_qualifier = query
 
-    base_ratio = _casefolded_ratio(candidate_base, query_base)
+    base_ratio = _ratio(candidate_base, query_base)
     if candidate_qualifier and query_qualifier:
-        qualifier_ratio = _casefolded_ratio(candidate_qualifier, query_qualifier)
+        qualifier_ratio = _ratio(candidate_qualifier, query_qualifier)
     elif candidate_qualifier == query_qualifier:
         qualifier_ratio = 1.0
     else:
@@ -112,3 +118,14 @@ def album_title_similarity(
         1.0 - ALBUM_TITLE_BASE_WEIGHT
     )
     return score if score >= min_ratio else 0.0
+
+
+def album_title_similarity(
+    candidate: str,
+    query: str,
+    min_ratio: float = ALBUM_TITLE_MATCH_THRESHOLD,
+) -> float:
+    """Compare album titles while treating parenthetical qualifiers as weak evidence."""
+    return album_parts_similarity(
+        album_title_parts(candidate), album_title_parts(query), min_ratio
+    )
@@ -3,18 +3,39 @@ from __future__ import annotations
 import json
 import logging
 import re
-from dataclasses import dataclass
-from typing import List, Literal
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Iterable, List, Literal
 from urllib.parse import urlsplit, urlunsplit
 from uuid import uuid4
 
 import pylast
-import requests
 
+from kimp3 import provider_client
 from kimp3.config import APP_NAME, cfg
+from kimp3.genres import TAXONOMY_FIELDS, GenreTaxonomy
+from kimp3.metadata_cache import ProviderCache
+from kimp3.strings_operations import normalize_string
 
 NUMBER_OF_TAGS = 15
 TAG_MIN_WEIGHT = 10
+# Score kept by a sub-genre promoted to its main genre, per level.
+GENRE_PROMOTION_FACTOR = 0.9
+TAG_POLICY_FIELDS = (
+    "similar_tags",
+    "similar_tags_patterns",
+    "banned_tags",
+    "banned_tags_patterns",
+    "banned_artists_from_tags",
+)
+TAG_POLICY_MEMO_SIZE = 8192
+_DEFAULT_REGEX_FLAGS = re.compile("").flags
+# Part of the suggestions cache key; bump it when the prompt changes.
+LLM_PROMPT_VERSION = 1
+LLM_BATCH_INSTRUCTIONS = (
+    "Each numbered line is one track. Answer with a JSON array holding one "
+    'object per line, {"index": <line number>, "genres": [...], "tags": [...]}.'
+)
 
 log = logging.getLogger(f"{APP_NAME}.{__name__}")
 
@@ -87,32 +108,131 @@ def _format_lastfm_tags_for_log(tags: List[pylast.TopItem]) -> list[str]:
     return result
 
 
-def _normalize_tag(tag: str) -> str:
-    for similar_tags in cfg.tags.similar_tags:
-        if tag in similar_tags:
-            return similar_tags[0]
+def _compile_plain(patterns: list[Any]) -> list[re.Pattern[str]] | None:
+    """Compile patterns, or return None if any cannot be joined into an alternation.
+
+    Patterns with capturing groups (backreferences would be renumbered) or
+    inline global flags (they would apply to the whole alternation) are
+    matched one by one instead.
+    """
+    compiled = [re.compile(pattern) for pattern in patterns]
+    if any(item.groups or item.flags != _DEFAULT_REGEX_FLAGS for item in compiled):
+        return None
+    return compiled
+
+
+class TagPolicy:
+    """Tag normalization and ban rules of one TagsSettings, compiled once.
+
+    Exact synonyms are a dict lookup. All similar_tags_patterns are joined
+    into one alternation with a capturing group per pattern list, so a
+    single re.match() finds the first list that matches, as the sequential
+    scan did. banned_tags_patterns become one alternation as well. Results
+    of normalize() and of the artist-independent ban check are memoized.
+    """
+
+    def __init__(self, settings: Any, memo_size: int = TAG_POLICY_MEMO_SIZE) -> None:
+        self._settings = settings
+        self._sources = {name: getattr(settings, name) for name in TAG_POLICY_FIELDS}
+
+        self.synonyms: dict[str, str] = {}
+        for similar_tags in settings.similar_tags:
+            for tag in similar_tags:
+                self.synonyms.setdefault(tag, similar_tags[0])
+
+        pattern_lists = [group for group in settings.similar_tags_patterns if len(group) > 1]
+        self._canonical_names = [group[0] for group in pattern_lists]
+        compiled_lists = [_compile_plain(group[1:]) for group in pattern_lists]
+        self._similar_pattern: re.Pattern[str] | None = None
+        self._similar_lists: list[list[re.Pattern[str]]] = []
+        if all(compiled is not None for compiled in compiled_lists):
+            if compiled_lists:
+                self._similar_pattern = re.compile(
+                    "|".join(
+                        "(" + "|".join(f"(?:{item.pattern})" for item in compiled) + ")"
+                        for compiled in compiled_lists
+                    )
+                )
+        else:
+            self._similar_lists = [
+                [re.compile(pattern) for pattern in group[1:]] for group in pattern_lists
+            ]
+
+        self.banned_tags = frozenset(tag.casefold() for tag in settings.banned_tags)
+        banned_patterns = _compile_plain(settings.banned_tags_patterns)
+        self._banned_patterns = (
+            [re.compile("|".join(f"(?:{item.pattern})" for item in banned_patterns))]
+            if banned_patterns
+            else [re.compile(pattern) for pattern in settings.banned_tags_patterns]
+        )
+        self.banned_artists = {
+            tag.casefold(): frozenset(artist.casefold() for artist in artists)
+            for tag, artists in settings.banned_artists_from_tags.items()
+        }
 
-    for pattern_list in cfg.tags.similar_tags_patterns:
-        if any(re.match(pattern, tag) for pattern in pattern_list[1:]):
-            return pattern_list[0]
+        self.normalize = lru_cache(maxsize=memo_size)(self._normalize)
+        self._is_banned_anywhere = lru_cache(maxsize=memo_size)(self._banned_for_all)
 
-    return tag
+    def built_from(self, settings: Any) -> bool:
+        """Return True while settings and its tag rule lists are the ones compiled."""
+        return settings is self._settings and all(
+            getattr(settings, name) is source for name, source in self._sources.items()
+        )
 
+    def _normalize(self, tag: str) -> str:
+        synonym = self.synonyms.get(tag)
+        if synonym is not None:
+            return synonym
+        if self._similar_pattern is not None:
+            match = self._similar_pattern.match(tag)
+            if match:
+                return self._canonical_names[match.lastindex - 1]
+            return tag
+        for canonical, patterns in zip(self._canonical_names, self._similar_lists):
+            if any(pattern.match(tag) for pattern in patterns):
+                return canonical
+        return tag
+
+    def _banned_for_all(self, tag: str) -> bool | None:
+        """Return True if tag is banned for every artist, None if that depends on the artist."""
+        if tag.casefold() in self.banned_tags:
+            return True
+        if any(pattern.match(tag) for pattern in self._banned_patterns):
+            return True
+        return None if tag.casefold() in self.banned_artists else False
+
+    def is_banned(self, tag: str, artist_name: str) -> bool:
+        banned = self._is_banned_anywhere(tag)
+        if banned is not None:
+            return banned
+        return artist_name.casefold() in self.banned_artists[tag.casefold()]
+
+    def memo_info(self) -> dict[str, int]:
+        normalize = self.normalize.cache_info()
+        banned = self._is_banned_anywhere.cache_info()
+        return {
+            "hits": normalize.hits + banned.hits,
+            "misses": normalize.misses + banned.misses,
+            "size": normalize.currsize + banned.currsize,
+        }
+
+
+_tag_policy: TagPolicy | None = None
 
-def _is_banned_tag(tag: str, artist_name: str) -> bool:
-    tag_key = tag.casefold()
-    artist_key = artist_name.casefold()
-    if tag_key in {item.casefold() for item in cfg.tags.banned_tags}:
-        return True
-    if any(re.match(pattern, tag) for pattern in cfg.tags.banned_tags_patterns):
-        return True
-    banned_artists = {
-        key.casefold(): [artist.casefold() for artist in artists]
-        for key, artists in cfg.tags.banned_artists_from_tags.items()
-    }
-    if tag_key in banned_artists:
-        return artist_key in banned_artists[tag_key]
-    return False
+
+def get_tag_policy(settings: Any = None) -> TagPolicy:
+    """Return the TagPolicy of settings (cfg.tags by default), rebuilt when they change.
+
+    Settings are compared by identity, so replacing cfg.tags or one of its
+    rule lists (as the config loader and tests do) compiles a new policy.
+    Lists edited in place are not noticed.
+    """
+    global _tag_policy
+    settings = cfg.tags if settings is None else settings
+    policy = _tag_policy
+    if policy is None or not policy.built_from(settings):
+        policy = _tag_policy = TagPolicy(settings)
+    return policy
 
 
 def _source_score(candidate: TagCandidate) -> float:
@@ -138,6 +258,7 @@ def _aggregate_candidates(
     candidates: list[TagCandidate], artist_name: str, track_title: str
 ) -> dict[str, AggregatedTag]:
     aggregated: dict[str, AggregatedTag] = {}
+    policy = get_tag_policy()
     ignored_names = {artist_name.lower(), track_title.lower()}
     for index, candidate in enumerate(candidates):
         tag = candidate.name.strip().lower()
@@ -146,8 +267,8 @@ def _aggregate_candidates(
         if not tag or len(tag) > cfg.tags.max_length:
             continue
 
-        tag = _normalize_tag(tag)
-        if _is_banned_tag(tag, artist_name):
+        tag = policy.normalize(tag)
+        if policy.is_banned(tag, artist_name):
             continue
 
         score = _source_score(candidate)
@@ -162,27 +283,35 @@ def _aggregate_candidates(
     return aggregated
 
 
-def _public_genres() -> set[str]:
-    return (
-        set(cfg.tags.genres)
-        | set(cfg.tags.extended_genres)
-        | set(cfg.tags.genre_parents)
-    )
+_genre_taxonomy: GenreTaxonomy | None = None
+_genre_taxonomy_sources: tuple[Any, ...] = ()
 
 
-def _genre_parent(tag: str) -> str | None:
-    parent = cfg.tags.genre_parents.get(tag)
-    if parent in cfg.tags.genres:
-        return parent
-    return None
+def get_genre_taxonomy(settings: Any = None) -> GenreTaxonomy:
+    """Return the GenreTaxonomy of settings (cfg.tags by default), rebuilt when they change.
+
+    Like get_tag_policy(), settings and their genre lists are compared by identity.
+    """
+    global _genre_taxonomy, _genre_taxonomy_sources
+    settings = cfg.tags if settings is None else settings
+    sources = (settings, *(getattr(settings, name) for name in TAXONOMY_FIELDS))
+    taxonomy = _genre_taxonomy
+    if taxonomy is None or any(
+        current is not compiled for current, compiled in zip(sources, _genre_taxonomy_sources)
+    ):
+        taxonomy = GenreTaxonomy(
+            settings.genres, settings.extended_genres, settings.genre_parents
+        )
+        _genre_taxonomy, _genre_taxonomy_sources = taxonomy, sources
+    return taxonomy
 
 
 def _is_lastfm_confirmed(item: AggregatedTag) -> bool:
     return bool(item.sources & LASTFM_SOURCES)
 
 
-def _is_llm_confirmed_genre(item: AggregatedTag) -> bool:
-    return "llm_genre" in item.sources and item.name in _public_genres()
+def _is_llm_confirmed_genre(item: AggregatedTag, taxonomy: GenreTaxonomy) -> bool:
+    return "llm_genre" in item.sources and taxonomy.is_public(item.name)
 
 
 def _can_promote_parent(item: AggregatedTag) -> bool:
@@ -193,23 +322,33 @@ def _can_promote_parent(item: AggregatedTag) -> bool:
 
 
 def _select_genres(aggregated: dict[str, AggregatedTag]) -> list[str]:
+    taxonomy = get_genre_taxonomy()
     candidates: dict[str, AggregatedTag] = {}
     for item in aggregated.values():
-        if item.name in cfg.tags.genres:
+        if taxonomy.is_main(item.name):
             if (
                 _is_lastfm_confirmed(item)
                 or "existing_genre" in item.sources
-                or _is_llm_confirmed_genre(item)
+                or _is_llm_confirmed_genre(item, taxonomy)
             ):
-                candidates[item.name] = item
+                genre = taxonomy.canonical(item.name)
+                candidates[genre] = (
+                    item
+                    if genre == item.name
+                    else AggregatedTag(genre, item.sources, item.score, item.first_index)
+                )
             continue
 
-        parent = _genre_parent(item.name)
-        if parent and _can_promote_parent(item):
+        promotion = taxonomy.main_ancestor(item.name)
+        if promotion and _can_promote_parent(item):
+            parent, levels = promotion
             candidates.setdefault(
                 parent,
                 AggregatedTag(
-                    parent, set(item.sources), item.score * 0.9, item.first_index
+                    parent,
+                    set(item.sources),
+                    item.score * GENRE_PROMOTION_FACTOR**levels,
+                    item.first_index,
                 ),
             )
 
@@ -237,12 +376,19 @@ def process_lastfm_tags(
     artist_name: str = "",
     track_title: str = "",
     num: int = NUMBER_OF_TAGS,
+    llm_artist: str = "",
+    llm_title: str = "",
 ) -> tuple[list[str], list[str]]:
-    """Process Last.FM tags into ordered genre and auxiliary tag lists."""
+    """Process Last.FM tags into ordered genre and auxiliary tag lists.
+
+    The LLM is asked about llm_artist - llm_title, which default to
+    artist_name and track_title. Callers pass the names read from the file
+    there, the ones prefetch_llm_tag_suggestions() was given.
+    """
     candidates: list[TagCandidate] = []
 
     if cfg.tags.use_llm:
-        llm_tags = get_llm_tag_suggestions(artist_name, track_title)
+        llm_tags = get_llm_tag_suggestions(llm_artist or artist_name, llm_title or track_title)
         candidates.extend(TagCandidate(tag, "llm_genre") for tag in llm_tags.genres)
         candidates.extend(TagCandidate(tag, "llm_tag") for tag in llm_tags.tags)
 
@@ -318,78 +464,205 @@ def _parse_llm_tags_answer(answer: object) -> LlmTagSuggestions:
     return LlmTagSuggestions(genres, tags)
 
 
+class LlmServiceError(Exception):
+    """The LLM service answered with an error; the answer is not cached."""
+
+
+def _encode_suggestions(suggestions: LlmTagSuggestions | None) -> dict[str, list[str]] | None:
+    return None if suggestions is None else asdict(suggestions)
+
+
+def _decode_suggestions(row: dict[str, list[str]] | None) -> LlmTagSuggestions | None:
+    return None if row is None else LlmTagSuggestions(row["genres"], row["tags"])
+
+
+# Empty answers are cached as None, so they expire with the negative TTL.
+_llm_cache = ProviderCache(
+    "llm.tag_suggestions", encode=_encode_suggestions, decode=_decode_suggestions
+)
+
+
+def _llm_key(artist: str, title: str) -> tuple[int, str, str]:
+    return LLM_PROMPT_VERSION, normalize_string(artist), normalize_string(title)
+
+
+def _llm_payload(message: str, additional_instructions: str = "") -> dict[str, object]:
+    return {
+        "message": message,
+        "thread_id": "vault_kimp3",
+        "user": "kimp3",
+        "location": "Undefined",
+        "additional_instructions": additional_instructions,
+        "agent": "music_machine",
+        "source": "kimp3",
+        "actor_type": "program",
+        "request_id": f"req_kimp3_{uuid4().hex}",
+        "stream": False,
+        "include_reasoning": False,
+        "follow_up": False,
+        "metadata": {
+            "turn_id": f"turn_kimp3_{uuid4().hex}",
+            "ephemeral": True,
+            "skip_memory": True,
+            "client_id": "kimp3",
+        },
+    }
+
+
+def _request_llm_answer(message: str, additional_instructions: str = "") -> object:
+    """Send message to the LLM service; return its answer, None when it has none."""
+    log.debug(f"`network,tags`Requesting LLM tags for: {message}")
+    response = provider_client.post(
+        _llm_chat_url(cfg.tags.llm_url),
+        provider="llm",
+        headers={"Content-Type": "application/json"},
+        json=_llm_payload(message, additional_instructions),
+        timeout=cfg.tags.llm_timeout,
+    )
+    if response.status_code != 200:
+        error_code = "unknown_error"
+        error_message = ""
+        try:
+            error = response.json().get("detail", {}).get("error", {})
+            error_code = error.get("code", error_code)
+            error_message = error.get("message", "")
+        except (json.JSONDecodeError, AttributeError):
+            pass
+        log.warning(
+            f"`network,tags`LLM service returned HTTP {response.status_code}: {error_code} {error_message}".strip()
+        )
+        raise LlmServiceError(response.status_code)
+
+    response_data = response.json()
+    if response_data.get("status") == "ignored":
+        return None
+    answer = response_data.get("answer")
+    if not answer:
+        log.warning("`network,tags`LLM service returned empty tags")
+        return None
+    return answer
+
+
+def _load_llm_tag_suggestions(artist: str, title: str) -> LlmTagSuggestions | None:
+    answer = _request_llm_answer(f"{artist} - {title}")
+    if answer is None:
+        return None
+    suggestions = _parse_llm_tags_answer(answer)
+    if not suggestions.genres and not suggestions.tags:
+        log.warning("`network,tags`LLM service returned no parseable tags")
+        return None
+    log.debug(f"`network,tags`LLM tags received: {suggestions}")
+    return suggestions
+
+
 def get_llm_tag_suggestions(artist: str, title: str) -> LlmTagSuggestions:
-    """Get structured music tag suggestions from configured LLM service."""
+    """Get structured music tag suggestions from configured LLM service.
+
+    Answers are cached by normalized artist and title, so tracks already
+    answered by a batch from prefetch_llm_tag_suggestions() cost no request.
+    """
     if not cfg.tags.llm_url:
         return LlmTagSuggestions([], [])
     try:
-        message = f"{artist} - {title}"
-        headers = {"Content-Type": "application/json"}
-        payload = {
-            "message": message,
-            "thread_id": "vault_kimp3",
-            "user": "kimp3",
-            "location": "Undefined",
-            "additional_instructions": "",
-            "agent": "music_machine",
-            "source": "kimp3",
-            "actor_type": "program",
-            "request_id": f"req_kimp3_{uuid4().hex}",
-            "stream": False,
-            "include_reasoning": False,
-            "follow_up": False,
-            "metadata": {
-                "turn_id": f"turn_kimp3_{uuid4().hex}",
-                "ephemeral": True,
-                "skip_memory": True,
-                "client_id": "kimp3",
-            },
-        }
-
-        log.debug(f"`network,tags`Requesting LLM tags for: {message}")
-        response = requests.post(
-            _llm_chat_url(cfg.tags.llm_url),
-            headers=headers,
-            json=payload,
-            timeout=cfg.tags.llm_timeout,
+        suggestions = _llm_cache.get_or_load(
+            _llm_key(artist, title), lambda: _load_llm_tag_suggestions(artist, title)
         )
-        if response.status_code != 200:
-            error_code = "unknown_error"
-            error_message = ""
-            try:
-                error = response.json().get("detail", {}).get("error", {})
-                error_code = error.get("code", error_code)
-                error_message = error.get("message", "")
-            except (json.JSONDecodeError, AttributeError):
-                pass
-            log.warning(
-                f"`network,tags`LLM service returned HTTP {response.status_code}: {error_code} {error_message}".strip()
-            )
-            return LlmTagSuggestions([], [])
-
-        response_data = response.json()
-        if response_data.get("status") == "ignored":
-            return LlmTagSuggestions([], [])
-        answer = response_data.get("answer")
-        if not answer:
-            log.warning("`network,tags`LLM service returned empty tags")
-            return LlmTagSuggestions([], [])
-
-        suggestions = _parse_llm_tags_answer(answer)
-        if not suggestions.genres and not suggestions.tags:
-            log.warning("`network,tags`LLM service returned no parseable tags")
-            return LlmTagSuggestions([], [])
-        log.debug(f"`network,tags`LLM tags received: {suggestions}")
-        return suggestions
-    except requests.exceptions.RequestException as exc:
+    except LlmServiceError:
+        suggestions = None
+    except provider_client.PROVIDER_ERRORS as exc:
         log.error(f"`network,tags`Failed to connect to LLM service: {exc}")
-        return LlmTagSuggestions([], [])
+        suggestions = None
     except json.JSONDecodeError as exc:
         log.error(f"`network,tags`Failed to parse LLM response: {exc}")
-        return LlmTagSuggestions([], [])
+        suggestions = None
     except Exception as exc:
         log.error(f"`network,tags`Unexpected error getting LLM tags: {exc}")
-        return LlmTagSuggestions([], [])
+        suggestions = None
+    return suggestions or LlmTagSuggestions([], [])
+
+
+def _parse_llm_batch_answer(answer: object, count: int) -> dict[int, LlmTagSuggestions]:
+    """Map 0-based track positions to the suggestions found in a batch answer.
+
+    Accepts a JSON list of per-track objects, either in request order or
+    carrying a 1-based "index", optionally wrapped in {"tracks": [...]}.
+    Tracks the answer does not cover are left out.
+    """
+    if isinstance(answer, str):
+        answer = json.loads(_strip_json_fence(answer))
+    if isinstance(answer, dict):
+        answer = answer.get("tracks")
+    if not isinstance(answer, list):
+        return {}
+    items = [item for item in answer if isinstance(item, dict)]
+    indexed = {}
+    for item in items:
+        index = item.get("index")
+        if isinstance(index, int) and 1 <= index <= count:
+            indexed[index - 1] = item
+    if not indexed and len(items) == count:
+        indexed = dict(enumerate(items))
+    return {position: _parse_llm_tags_answer(item) for position, item in indexed.items()}
+
+
+def _request_llm_batch(tracks: list[tuple[str, str]]) -> dict[int, LlmTagSuggestions]:
+    message = "\n".join(
+        f"{number}. {artist} - {title}" for number, (artist, title) in enumerate(tracks, start=1)
+    )
+    answer = _request_llm_answer(message, LLM_BATCH_INSTRUCTIONS)
+    if answer is None:
+        return {}
+    return _parse_llm_batch_answer(answer, len(tracks))
+
+
+def prefetch_llm_tag_suggestions(tracks: Iterable[tuple[str, str]]) -> int:
+    """Ask the LLM service about uncached tracks in batches of tags.llm_batch_size.
+
+    Answers go to the suggestions cache; tracks a batch fails to cover are
+    asked one by one later by get_llm_tag_suggestions(). Returns the number
+    of tracks answered.
+    """
+    if not cfg.tags.use_llm or not cfg.tags.llm_url:
+        return 0
+    pending: dict[tuple[int, str, str], tuple[str, str]] = {}
+    for artist, title in tracks:
+        key = _llm_key(artist, title)
+        if artist and title and key not in pending and key not in _llm_cache:
+            pending[key] = (artist, title)
+    batch_size = cfg.tags.llm_batch_size or len(pending)
+    if batch_size < 2 or len(pending) < 2:
+        return 0
+
+    keys = list(pending)
+    answered = 0
+    for start in range(0, len(keys), batch_size):
+        batch_keys = keys[start : start + batch_size]
+        try:
+            suggestions = _request_llm_batch([pending[key] for key in batch_keys])
+        except LlmServiceError:
+            continue
+        except provider_client.PROVIDER_ERRORS as exc:
+            log.error(f"`network,tags`Failed to connect to LLM service: {exc}")
+            continue
+        except json.JSONDecodeError as exc:
+            log.error(f"`network,tags`Failed to parse LLM batch response: {exc}")
+            continue
+        for position, suggestion in suggestions.items():
+            has_tags = bool(suggestion.genres or suggestion.tags)
+            _llm_cache[batch_keys[position]] = suggestion if has_tags else None
+            answered += 1
+        log.debug(
+            f"`network,tags`LLM batch answered {len(suggestions)} of {len(batch_keys)} tracks"
+        )
+    return answered
+
+
+def clear_llm_cache() -> None:
+    _llm_cache.clear()
+
+
+def llm_cache_size() -> int:
+    return len(_llm_cache)
 
 
 def get_llm_tags(artist: str, title: str) -> List[str]:
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from kimp3.backends import get_backend
+from kimp3.config import APP_NAME
+from kimp3.encoding import repair_audio_tags_text_encoding
+from kimp3.models import AudioInfo, AudioTags
+from kimp3.title_case import normalize_audio_tag_titles
+
+log = logging.getLogger(f"{APP_NAME}.{__name__}")
+
+
+@dataclass(frozen=True)
+class TitleSettings:
+    """Picklable subset of tag settings used by title normalization."""
+
+    title_normalization: str = "title_case_safe"
+    title_case_exceptions: tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, tags_config: object) -> TitleSettings:
+        return cls(
+            title_normalization=getattr(tags_config, "title_normalization", "title_case_safe"),
+            title_case_exceptions=tuple(getattr(tags_config, "title_case_exceptions", ())),
+        )
+
+
+@dataclass
+class TagRecord:
+    """Tags of one file as read from disk and after repair/normalization.
+
+    Tags are read headers-only, so records carry artwork digests and
+    locators but no image bytes and stay small when sent between processes.
+    """
+
+    path: Path
+    original: AudioTags
+    tags: AudioTags
+    info: AudioInfo | None = None
+
+
+def prepare_tags(raw: AudioTags, tags_config: object) -> AudioTags:
+    """Repair mojibake and normalize title fields of freshly read tags."""
+    tags = repair_audio_tags_text_encoding(raw)
+    return normalize_audio_tag_titles(tags, tags_config)
+
+
+def read_tag_record(path: Path, title_settings: TitleSettings) -> TagRecord:
+    """Read and normalize tags of one file, returning empty tags on failure."""
+    try:
+        raw, info = get_backend(path).read_with_info(path, headers_only=True)
+    except Exception as e:
+        log.error(f"`files,tags`Error reading tags from {path}: {e}")
+        log.exception("`files,tags`Full traceback:")
+        raw, info = AudioTags(), None
+    return TagRecord(
+        path=path,
+        original=raw.model_copy(deep=True),
+        tags=prepare_tags(raw, title_settings),
+        info=info,
+    )
+
+
+def _read_chunk(paths: list[Path], title_settings: TitleSettings) -> list[TagRecord]:
+    """Worker entry point: read a chunk of files."""
+    return [read_tag_record(path, title_settings) for path in paths]
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _chunks(paths: list[Path], count: int) -> list[list[Path]]:
+    """Split paths into contiguous chunks so files of one album share a chunk."""
+    size = -(-len(paths) // count)
+    return [paths[start:start + size] for start in range(0, len(paths), size)]
+
+
+class TagReader:
+    """Reads tag records serially or in a process pool shared by the whole run."""
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def parallel(self) -> bool:
+        return self.workers > 1
+
+    def start(self) -> None:
+        """Start worker processes.
+
+        Called before the pipeline threads exist, so workers are not forked
+        from a process that holds locks in other threads.
+        """
+        if not self.parallel or self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._pool.submit(_warm_up).result()
+        log.info(f"`scan`Reading tags with {self.workers} worker processes")
+
+    def read(self, paths: Iterable[Path], title_settings: TitleSettings) -> dict[Path, TagRecord]:
+        """Return tag records for paths, keyed by path."""
+        paths = list(paths)
+        if not paths:
+            return {}
+        if not self.parallel:
+            return {path: read_tag_record(path, title_settings) for path in paths}
+        self.start()
+        try:
+            futures = [
+                self._pool.submit(_read_chunk, chunk, title_settings)
+                for chunk in _chunks(paths, self.workers)
+            ]
+            results = [future.result() for future in futures]
+        except BrokenProcessPool as e:
+            log.warning(f"`scan`Tag reader pool failed, reading serially: {e}")
+            self.close()
+            self.workers = 1
+            return {path: read_tag_record(path, title_settings) for path in paths}
+        return {record.path: record for chunk_records in results for record in chunk_records}
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Iterable, Literal
 
 from kimp3.models import AudioTags
@@ -13,6 +14,7 @@ LATIN_RE = re.compile(r"[A-Za-z]")
 SPACE_RE = re.compile(r"\s+")
 WORD_RE = re.compile(r"[A-Za-z][A-Za-z'’]*(?:[./-][A-Za-z][A-Za-z'’]*)*\.?")
 EXCEPTION_BOUNDARY = r"A-Za-zА-Яа-яЁё0-9"
+TITLE_MEMO_SIZE = 4096
 
 SMALL_WORDS = {
     "a",
@@ -61,29 +63,89 @@ def _exception_map(exceptions: Iterable[str]) -> dict[str, str]:
     return {item.casefold(): item for item in exceptions if item.strip()}
 
 
-def _protect_exceptions(
-    value: str, exceptions: Iterable[str], *, phrase_only: bool = False
-) -> tuple[str, dict[str, str]]:
-    protected = value
-    replacements: dict[str, str] = {}
-    protected_exceptions = sorted(
-        {
-            item
-            for item in exceptions
-            if item.strip() and (not phrase_only or " " in item.strip())
-        },
-        key=len,
-        reverse=True,
+def _exception_pattern(exception: str) -> re.Pattern[str]:
+    return re.compile(
+        rf"(?<![{EXCEPTION_BOUNDARY}]){re.escape(exception)}(?![{EXCEPTION_BOUNDARY}])",
+        re.IGNORECASE,
     )
-    for index, exception in enumerate(protected_exceptions):
-        placeholder = f"\x00§{index}§\x00"
-        pattern = re.compile(
-            rf"(?<![{EXCEPTION_BOUNDARY}]){re.escape(exception)}(?![{EXCEPTION_BOUNDARY}])",
-            re.IGNORECASE,
+
+
+class TitleCaseRules:
+    """title_case_exceptions compiled once, with a memo of normalized values.
+
+    Every exception gets its pattern compiled up front, longest first, and
+    all of them are joined into one alternation. A value the alternation
+    does not match cannot be changed by any exception, so the per-exception
+    passes are skipped for it; otherwise they run in the usual order.
+    normalize() is memoized on (value, mode), as artist and album strings
+    repeat for every track of an album.
+    """
+
+    def __init__(self, exceptions: Iterable[str], memo_size: int = TITLE_MEMO_SIZE) -> None:
+        exceptions = list(exceptions)
+        self.exceptions_map = _exception_map(exceptions)
+        ordered = sorted({item for item in exceptions if item.strip()}, key=len, reverse=True)
+        self._patterns = [(exception, _exception_pattern(exception)) for exception in ordered]
+        self._phrase_patterns = [
+            (exception, pattern)
+            for exception, pattern in self._patterns
+            if " " in exception.strip()
+        ]
+        self._any = (
+            re.compile("|".join(pattern.pattern for _, pattern in self._patterns), re.IGNORECASE)
+            if self._patterns
+            else None
         )
-        protected = pattern.sub(placeholder, protected)
-        replacements[placeholder] = exception
-    return protected, replacements
+        self.normalize = lru_cache(maxsize=memo_size)(self._normalize)
+
+    def _may_match(self, value: str) -> bool:
+        return self._any is not None and self._any.search(value) is not None
+
+    def protect(self, value: str, *, phrase_only: bool = False) -> tuple[str, dict[str, str]]:
+        """Replace exceptions in value with placeholders restored by _restore_exceptions()."""
+        if not self._may_match(value):
+            return value, {}
+        protected = value
+        replacements: dict[str, str] = {}
+        patterns = self._phrase_patterns if phrase_only else self._patterns
+        for index, (exception, pattern) in enumerate(patterns):
+            placeholder = f"\x00§{index}§\x00"
+            protected = pattern.sub(placeholder, protected)
+            replacements[placeholder] = exception
+        return protected, replacements
+
+    def apply(self, value: str) -> str:
+        """Rewrite every exception found in value in its configured spelling."""
+        if not self._may_match(value):
+            return value
+        result = value
+        for exception, pattern in self._patterns:
+            result = pattern.sub(exception, result)
+        return result
+
+    def _normalize(self, value: str, mode: TitleNormalization) -> str:
+        text = _collapse_spaces(value)
+        if mode == "preserve":
+            return text
+        has_cyrillic = _contains_cyrillic(text)
+        has_latin = _contains_latin(text)
+        if has_cyrillic and has_latin:
+            return self.apply(text)
+        if has_cyrillic:
+            return _sentence_case(text, self)
+        if mode == "aggressive_normalize":
+            return _title_case(text, self)
+        return _title_case(text, self)
+
+    def memo_info(self) -> dict[str, int]:
+        info = self.normalize.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+@lru_cache(maxsize=8)
+def title_case_rules(exceptions: tuple[str, ...] = ()) -> TitleCaseRules:
+    """Return the compiled rules for exceptions, shared by all callers."""
+    return TitleCaseRules(exceptions)
 
 
 def _restore_exceptions(value: str, replacements: dict[str, str]) -> str:
@@ -98,17 +160,6 @@ def _starts_with_placeholder(value: str, replacements: dict[str, str]) -> bool:
     return any(stripped.startswith(placeholder) for placeholder in replacements)
 
 
-def _apply_exceptions_only(value: str, exceptions: Iterable[str]) -> str:
-    result = value
-    for exception in sorted({item for item in exceptions if item.strip()}, key=len, reverse=True):
-        pattern = re.compile(
-            rf"(?<![{EXCEPTION_BOUNDARY}]){re.escape(exception)}(?![{EXCEPTION_BOUNDARY}])",
-            re.IGNORECASE,
-        )
-        result = pattern.sub(exception, result)
-    return result
-
-
 def _is_stylized_token(token: str) -> bool:
     if any(char.isdigit() for char in token):
         return True
@@ -187,17 +238,15 @@ def _normalize_hyphenated_word(
     return "-".join(normalized)
 
 
-def title_case_safe(value: str, exceptions: Iterable[str] = ()) -> str:
-    """Return moderate English Title Case."""
+def _title_case(value: str, rules: TitleCaseRules) -> str:
     text = _collapse_spaces(value)
     if not text:
         return text
 
-    exceptions_map = _exception_map(exceptions)
-    phrase_exception = exceptions_map.get(text.casefold())
+    phrase_exception = rules.exceptions_map.get(text.casefold())
     if phrase_exception is not None:
         return phrase_exception
-    text, protected_exceptions = _protect_exceptions(text, exceptions, phrase_only=True)
+    text, protected_exceptions = rules.protect(text, phrase_only=True)
 
     matches = list(WORD_RE.finditer(text))
     if not matches:
@@ -212,7 +261,7 @@ def title_case_safe(value: str, exceptions: Iterable[str] = ()) -> str:
                 match.group(0),
                 is_first=index == 0,
                 is_last=index == len(matches) - 1,
-                exceptions=exceptions_map,
+                exceptions=rules.exceptions_map,
                 preserve_stylized=True,
             )
         )
@@ -221,19 +270,17 @@ def title_case_safe(value: str, exceptions: Iterable[str] = ()) -> str:
     return _restore_exceptions("".join(result), protected_exceptions)
 
 
-def sentence_case_safe(value: str, exceptions: Iterable[str] = ()) -> str:
-    """Return Russian-style sentence case while preserving configured names."""
+def _sentence_case(value: str, rules: TitleCaseRules) -> str:
     text = _collapse_spaces(value)
     if not text:
         return text
 
-    exceptions_map = _exception_map(exceptions)
-    phrase_exception = exceptions_map.get(text.casefold())
+    phrase_exception = rules.exceptions_map.get(text.casefold())
     if phrase_exception is not None:
         return phrase_exception
 
-    text, protected_exceptions = _protect_exceptions(text, exceptions)
-    text = _apply_exceptions_only(text.lower(), exceptions)
+    text, protected_exceptions = rules.protect(text)
+    text = rules.apply(text.lower())
     if not _starts_with_placeholder(text, protected_exceptions):
         for index, char in enumerate(text):
             if char.isalpha():
@@ -242,19 +289,18 @@ def sentence_case_safe(value: str, exceptions: Iterable[str] = ()) -> str:
     return _restore_exceptions(text, protected_exceptions)
 
 
+def title_case_safe(value: str, exceptions: Iterable[str] = ()) -> str:
+    """Return moderate English Title Case."""
+    return _title_case(value, title_case_rules(tuple(exceptions)))
+
+
+def sentence_case_safe(value: str, exceptions: Iterable[str] = ()) -> str:
+    """Return Russian-style sentence case while preserving configured names."""
+    return _sentence_case(value, title_case_rules(tuple(exceptions)))
+
+
 def normalize_title(value: str, mode: TitleNormalization, exceptions: Iterable[str]) -> str:
-    text = _collapse_spaces(value)
-    if mode == "preserve":
-        return text
-    has_cyrillic = _contains_cyrillic(text)
-    has_latin = _contains_latin(text)
-    if has_cyrillic and has_latin:
-        return _apply_exceptions_only(text, exceptions)
-    if has_cyrillic:
-        return sentence_case_safe(text, exceptions)
-    if mode == "aggressive_normalize":
-        return title_case_safe(text, exceptions)
-    return title_case_safe(text, exceptions)
+    return title_case_rules(tuple(exceptions)).normalize(value, mode)
 
 
 def normalize_audio_tag_titles(tags: AudioTags, tags_config: object) -> AudioTags:
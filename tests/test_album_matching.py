@@ -0,0 +1,74 @@
+from kimp3.album_matching import AlbumMatcher, AlbumTitleIndex
+from kimp3.strings_operations import album_title_similarity
+
+TITLES = [
+    "Odelay",
+    "Guero",
+    "Guero (Deluxe Edition)",
+    "The Information",
+    "The Information (Deluxe Version)",
+    "Sea Change",
+    "Sea Change (Remastered)",
+    "Midnite Vultures",
+    "Mutations",
+    "Modern Guilt",
+    "Morning Phase",
+    "Colors",
+    "Hyperspace",
+    "Mellow Gold",
+    "One Foot in the Grave",
+    "Stereopathetic Soulmanure",
+]
+
+
+def _scan_all(query):
+    best = None
+    best_score = 0.0
+    for title in TITLES:
+        score = album_title_similarity(title, query)
+        if score > best_score:
+            best, best_score = title, score
+    return best
+
+
+def test_index_agrees_with_scoring_every_title():
+    index = AlbumTitleIndex(TITLES, shortlist=3)
+    queries = [
+        "Guero",
+        "Guero (Deluxe)",
+        "The Informaton",
+        "the information (deluxe edition)",
+        "Sea Change (Remaster)",
+        "Midnight Vultures",
+        "Modern Guilt (Live)",
+        "Mellow Gold",
+        "Completely Unrelated",
+    ]
+
+    for query in queries:
+        found = index.best_match(query)
+        assert (TITLES[found[0]] if found else None) == _scan_all(query), query
+    assert index.scored <= 3 * len(queries)
+
+
+def test_exact_title_is_found_without_scoring():
+    index = AlbumTitleIndex(TITLES, shortlist=3)
+
+    assert index.best_match("  sea change (REMASTERED)") == (6, 1.0)
+    assert index.scored == 0
+
+
+def test_matcher_memoizes_per_key_and_rebuilds_for_a_new_list():
+    matcher = AlbumMatcher(shortlist=3)
+    albums = [{"title": title} for title in TITLES]
+
+    first = matcher.best_match("beck", albums, lambda album: album["title"], "Guero (Deluxe)")
+    again = matcher.best_match("beck", albums, lambda album: album["title"], "Guero (Deluxe)")
+
+    assert first == again
+    assert first[0]["title"] == "Guero (Deluxe Edition)"
+    assert matcher.stats()["album_match_memo_hits"] == 1
+
+    reloaded = [{"title": "Guero (Deluxe Edition) [Japan]"}]
+    assert matcher.best_match("beck", reloaded, lambda album: album["title"], "Guero (Deluxe)") is None
+    assert matcher.best_match("beck", [], lambda album: album["title"], "Guero") is None
@@ -0,0 +1,153 @@
+import io
+import json
+import os
+import time
+
+from PIL import Image
+
+from kimp3 import covers
+from kimp3.covers import COVER_INDEX_FILENAME, CoverDiskCache, CoverMemoryCache
+
+
+def test_disk_cache_survives_reopen_via_index(tmp_path):
+    cache = CoverDiskCache(tmp_path, max_bytes=1024)
+    cache.put("album.jpg", b"cover")
+    cache.save()
+
+    reopened = CoverDiskCache(tmp_path, max_bytes=1024)
+
+    assert reopened.get("album.jpg") == b"cover"
+    assert reopened.get("other.jpg") is None
+    assert (tmp_path / COVER_INDEX_FILENAME).exists()
+
+
+def test_disk_cache_evicts_least_recently_used_covers(tmp_path):
+    cache = CoverDiskCache(tmp_path, max_bytes=25)
+    cache.put("one.jpg", b"1" * 10)
+    cache.put("two.jpg", b"2" * 10)
+    cache.get("one.jpg")
+    cache.put("three.jpg", b"3" * 10)
+    cache.save()
+
+    assert cache.get("two.jpg") is None
+    assert cache.get("one.jpg") == b"1" * 10
+    assert cache.stats() == {"album_covers_on_disk": 2, "album_covers_disk_bytes": 20}
+    index = json.loads((tmp_path / COVER_INDEX_FILENAME).read_text())
+    assert len(index) == 2
+    assert len(list(tmp_path.glob("*.jpg"))) == 2
+
+
+def test_disk_cache_rebuilds_missing_index_from_directory(tmp_path):
+    CoverDiskCache(tmp_path, max_bytes=1024).put("album.jpg", b"cover")
+
+    reopened = CoverDiskCache(tmp_path, max_bytes=1024)
+
+    assert reopened.get("album.jpg") == b"cover"
+
+
+def test_disk_cache_adopts_covers_missing_from_index(tmp_path):
+    cache = CoverDiskCache(tmp_path, max_bytes=1024)
+    cache.put("indexed.jpg", b"1" * 10)
+    cache.save()
+    cache.put("unsaved.jpg", b"2" * 10)
+    cache.put("also-unsaved.jpg", b"3" * 10)
+    later = time.time() + 60
+    for name in ("unsaved.jpg", "also-unsaved.jpg"):
+        os.utime(tmp_path / name, (later, later))
+
+    reopened = CoverDiskCache(tmp_path, max_bytes=25)
+
+    assert reopened.stats() == {"album_covers_on_disk": 2, "album_covers_disk_bytes": 20}
+    assert reopened.get("unsaved.jpg") == b"2" * 10
+    assert reopened.get("also-unsaved.jpg") == b"3" * 10
+    assert not (tmp_path / "indexed.jpg").exists()
+
+
+def test_clear_cover_cache_keeps_disk_covers(tmp_path, monkeypatch):
+    cache = CoverDiskCache(tmp_path, max_bytes=1024)
+    monkeypatch.setattr(covers, "_disk_cache", cache)
+    monkeypatch.setattr(covers, "_memory_cache", CoverMemoryCache(1024))
+    cache.put("album.jpg", b"cover")
+    covers.get_cover_memory_cache().put("Artist", "Album", b"cover", "image/jpeg")
+
+    covers.clear_cover_cache()
+
+    assert covers.cover_cache_size() == 0
+    assert CoverDiskCache(tmp_path, max_bytes=1024).get("album.jpg") == b"cover"
+
+    covers.purge_cover_cache()
+
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get("album.jpg") is None
+
+
+def test_memory_cache_keeps_byte_budget_and_falls_back_to_disk(tmp_path, monkeypatch):
+    disk = CoverDiskCache(tmp_path, max_bytes=1024)
+    memory = CoverMemoryCache(max_bytes=25)
+    monkeypatch.setattr(covers, "_disk_cache", disk)
+    monkeypatch.setattr(covers, "_memory_cache", memory)
+    monkeypatch.setattr(covers, "_get_cover_url", lambda artist, album, size: f"https://img/{album}")
+    cover_format = covers.CoverFormat.from_config(covers.cfg.tags)
+    for album in ("A", "B", "C"):
+        disk.put(cover_format.variant_name(f"https://img/{album}"), album.encode() * 10)
+        memory.put("Artist", album, album.encode() * 10, "image/jpeg")
+
+    assert len(memory) == 2
+    assert memory.get("Artist", "A") is None
+    assert covers.get_album_cover("Artist", "A") == (b"A" * 10, "image/jpeg")
+    assert memory.get("Artist", "B") is None
+    assert memory.stats() == {
+        "album_covers_memory_bytes": 20,
+        "album_covers_memory_hits": 0,
+        "album_covers_memory_misses": 3,
+        "album_covers_memory_evictions": 2,
+    }
+
+    memory.put("Artist", "Huge", b"x" * 100, "image/jpeg")
+
+    assert memory.stats()["album_covers_memory_bytes"] == 20
+
+
+def _png(width, height):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(output, format="PNG")
+    return output.getvalue()
+
+
+def test_encode_cover_fits_dimension_and_target_size():
+    data = Image.effect_noise((1600, 1200), 100).convert("RGB")
+    output = io.BytesIO()
+    data.save(output, format="PNG")
+
+    full_quality = covers.encode_cover(output.getvalue(), covers.CoverFormat(800, 95))
+    encoded = covers.encode_cover(
+        output.getvalue(), covers.CoverFormat(max_dimension=800, quality=95, target_bytes=150_000)
+    )
+    image = Image.open(io.BytesIO(encoded))
+
+    assert image.format == "JPEG"
+    assert image.size == (800, 600)
+    assert len(encoded) <= 150_000 < len(full_quality)
+
+
+def test_album_cover_variant_is_encoded_once_per_source_url(tmp_path, monkeypatch):
+    downloads = []
+    monkeypatch.setattr(covers, "_disk_cache", CoverDiskCache(tmp_path, max_bytes=1 << 20))
+    monkeypatch.setattr(covers, "_memory_cache", CoverMemoryCache(1 << 20))
+    monkeypatch.setattr(covers, "_processor", covers.CoverProcessor(1))
+    monkeypatch.setattr(covers, "_get_cover_url", lambda artist, album, size: "https://img/shared.png")
+
+    def fake_download(url):
+        downloads.append(url)
+        return _png(2000, 2000)
+
+    monkeypatch.setattr(covers, "_download_cover", fake_download)
+
+    first, mime = covers.get_album_cover("Artist", "Album")
+    second, _ = covers.get_album_cover("Artist", "Album (Deluxe)")
+
+    assert mime == "image/jpeg"
+    assert first == second
+    assert downloads == ["https://img/shared.png"]
+    assert max(Image.open(io.BytesIO(first)).size) == covers.cfg.tags.cover_max_dimension
+
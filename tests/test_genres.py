@@ -0,0 +1,54 @@
+import pytest
+from pydantic import ValidationError
+
+from kimp3.genres import GenreCycleError, GenreTaxonomy, find_genre_cycle
+from kimp3.settings import TagsSettings
+
+
+def _taxonomy():
+    return GenreTaxonomy(
+        genres=["rock", "Electronic"],
+        extended_genres=["post-punk", "coldwave", "minimal synth"],
+        parents={
+            "post-punk": "rock",
+            "coldwave": "post-punk",
+            "minimal synth": "coldwave",
+            "synthwave": "electronic",
+        },
+    )
+
+
+def test_taxonomy_closes_ancestors_through_several_levels():
+    taxonomy = _taxonomy()
+
+    assert taxonomy.ancestors("minimal synth") == ("coldwave", "post-punk", "rock")
+    assert taxonomy.depth("minimal synth") == 3
+    assert taxonomy.depth("rock") == 0
+    assert taxonomy.main_ancestor("minimal synth") == ("rock", 3)
+    assert taxonomy.main_ancestor("post-punk") == ("rock", 1)
+    assert taxonomy.main_ancestor("rock") is None
+    assert taxonomy.main_ancestor("polka") is None
+
+
+def test_taxonomy_matches_names_in_their_configured_spelling():
+    taxonomy = _taxonomy()
+
+    assert taxonomy.canonical("  ELECTRONIC ") == "Electronic"
+    assert taxonomy.main_ancestor("Synthwave") == ("Electronic", 1)
+    assert taxonomy.is_main("electronic")
+    assert taxonomy.is_public("synthwave")
+    assert not taxonomy.is_public("polka")
+
+
+def test_find_genre_cycle_reports_the_loop():
+    assert find_genre_cycle({"a": "b", "b": "c"}) is None
+    assert find_genre_cycle({"x": "a", "a": "b", "b": "A"}) == ["a", "b", "a"]
+    assert find_genre_cycle({"self": "self"}) == ["self", "self"]
+
+    with pytest.raises(GenreCycleError):
+        GenreTaxonomy(["rock"], parents={"rock": "indie", "indie": "rock"})
+
+
+def test_tags_settings_reject_genre_cycles():
+    with pytest.raises(ValidationError, match="genre_parents contains a cycle: indie -> rock -> indie"):
+        TagsSettings(genre_parents={"indie": "rock", "rock": "indie"})
@@ -3,7 +3,7 @@ from datetime import date, timedelta
 import pylast
 
 from kimp3 import lastfm
-from kimp3.models import LyricsLookup
+from kimp3.models import AudioTags, LyricsLookup
 from kimp3.musicbrainz import AlbumCandidate
 
 
@@ -75,7 +75,7 @@ def test_lyrics_lookup_marker_expires_after_retry_window(monkeypatch):
 def test_best_musicbrainz_album_match_weights_base_title(monkeypatch):
     calls = []
 
-    def fake_get_artist_albums(artist, album_title=None):
+    def fake_get_artist_albums(artist, album_title=None, track_count=None):
         calls.append((artist, album_title))
         return [
             AlbumCandidate("Guero (Deluxe Edition)"),
@@ -101,7 +101,7 @@ def test_best_musicbrainz_album_match_keeps_specific_release_title(monkeypatch):
     monkeypatch.setattr(
         lastfm.musicbrainz,
         "get_artist_albums",
-        lambda artist, album_title=None: [
+        lambda artist, album_title=None, track_count=None: [
             AlbumCandidate("The Information (Deluxe Version)"),
             AlbumCandidate("The Information"),
         ],
@@ -137,3 +137,183 @@ def test_best_lastfm_album_match_weights_base_title(monkeypatch):
 
     assert match is not None
     assert match[0] == "The Information (Deluxe Version)"
+
+
+def test_album_resolver_resolves_album_level_data_once(monkeypatch):
+    calls = []
+
+    class FakeArtist:
+        def __init__(self, name):
+            self.name = name
+
+        def get_correction(self):
+            calls.append(("artist_correction", self.name))
+            return self.name
+
+    class FakeAlbum:
+        def __init__(self, artist, title):
+            self.artist = FakeArtist(artist)
+            self.title = title
+
+    class FakeTrack:
+        def __init__(self, artist, title):
+            self.artist = FakeArtist(artist)
+            self.title = title
+
+        def get_correction(self):
+            calls.append(("track_correction", self.title))
+            return self.title
+
+    class FakeNetwork:
+        get_artist = staticmethod(FakeArtist)
+        get_album = staticmethod(FakeAlbum)
+        get_track = staticmethod(FakeTrack)
+
+    def fake_album_match(artist_name, album_title, track_count=None):
+        calls.append(("album_match", album_title))
+        return None
+
+    def fake_tags(obj, min_weight=0):
+        calls.append(("tags", type(obj).__name__))
+        return []
+
+    def fake_tracks(album):
+        calls.append(("album_tracks", album.title))
+        return []
+
+    def fake_cover(artist, album):
+        calls.append(("cover", album))
+        return None, ""
+
+    class FakeSongDir:
+        track_count = 12
+
+    lastfm._artist_corrections.clear()
+    lastfm._album_corrections.clear()
+    monkeypatch.setattr(lastfm, "network", FakeNetwork(), raising=False)
+    monkeypatch.setattr(lastfm, "_best_musicbrainz_album_match", fake_album_match)
+    monkeypatch.setattr(lastfm, "_best_lastfm_album_match", fake_album_match)
+    monkeypatch.setattr(lastfm, "_get_tags", fake_tags)
+    monkeypatch.setattr(lastfm, "_get_album_tracks", fake_tracks)
+    monkeypatch.setattr(
+        lastfm, "_get_album_release", lambda *args: calls.append(("release", args[1]))
+    )
+    monkeypatch.setattr(lastfm, "get_album_cover", fake_cover)
+    monkeypatch.setattr(lastfm, "process_lastfm_tags", lambda *args, **kwargs: ([], []))
+    monkeypatch.setattr(lastfm.cfg.tags, "fetch_lyrics", False)
+    monkeypatch.setattr(lastfm.cfg.tags, "fetch_album_cover", True)
+    monkeypatch.setattr(lastfm.cfg.tags, "skip_existing_cover", False)
+    monkeypatch.setattr(lastfm.cfg.tags, "skip_existing_tags", False)
+    monkeypatch.setattr(lastfm.cfg.tags, "album_metadata_source", "musicbrainz_first")
+
+    songdir = FakeSongDir()
+    resolver = lastfm.AlbumResolver(songdir)
+    for number in range(1, 13):
+        tags = AudioTags(title=f"Song {number}", artist="Artist", album="Album")
+        lastfm.TaggedTrack(tags, songdir, resolver.resolve(tags))
+
+    assert len(resolver) == 1
+    assert calls.count(("album_tracks", "Album")) == 1
+    assert calls.count(("cover", "Album")) == 1
+    assert calls.count(("album_match", "Album")) == 2
+    assert ("release", "Album") not in calls
+    assert calls.count(("tags", "FakeArtist")) == 1
+    assert calls.count(("tags", "FakeAlbum")) == 1
+    assert calls.count(("tags", "FakeTrack")) == 12
+    assert len([call for call in calls if call[0] == "track_correction"]) == 12
+
+
+def test_album_release_numbers_tracks_without_lastfm_track_list(monkeypatch):
+    release = lastfm.musicbrainz.AlbumRelease(
+        mbid="deluxe",
+        title="Sea Change",
+        tracks=(
+            lastfm.musicbrainz.ReleaseTrack("The Golden Age", 1, 1),
+            lastfm.musicbrainz.ReleaseTrack("Paper Tiger", 2, 1),
+            lastfm.musicbrainz.ReleaseTrack("Ship in a Bottle", 1, 2),
+        ),
+        total_discs=2,
+    )
+    candidate = AlbumCandidate("Sea Change", mbid="deluxe")
+    monkeypatch.setattr(
+        lastfm,
+        "_best_musicbrainz_album_match",
+        lambda artist, album, track_count=None: ("Sea Change", candidate, 1.0),
+    )
+    monkeypatch.setattr(
+        lastfm.musicbrainz, "get_album_release", lambda candidate, track_count: release
+    )
+    monkeypatch.setattr(lastfm.cfg.tags, "album_metadata_source", "musicbrainz_first")
+
+    assert lastfm._get_album_release("Beck", "Sea Change", 3) is release
+
+    class FakeTrack:
+        title = "Ship In A Bottle"
+
+    track = lastfm.TaggedTrack.__new__(lastfm.TaggedTrack)
+    track.tags = AudioTags(title="Ship In A Bottle", track_number=3)
+    track.songdir = type("SongDir", (), {"track_count": 3})()
+    track.track = FakeTrack()
+    track.resolution = type("Resolution", (), {"release": release, "tracks": []})()
+    track.track_number, track.total_tracks = 3, None
+    track.disc_number = track.total_discs = None
+
+    track.update_album_data()
+
+    assert (track.track_number, track.total_tracks) == (1, 1)
+    assert (track.disc_number, track.total_discs) == (2, 2)
+
+
+def test_album_release_leaves_numbering_when_track_count_differs():
+    release = lastfm.musicbrainz.AlbumRelease(
+        mbid="deluxe",
+        title="Sea Change",
+        tracks=tuple(
+            lastfm.musicbrainz.ReleaseTrack(f"Song {number}", number, 1) for number in range(1, 16)
+        ),
+    )
+
+    class FakeTrack:
+        title = "Song 14"
+
+    track = lastfm.TaggedTrack.__new__(lastfm.TaggedTrack)
+    track.tags = AudioTags(title="Song 14", track_number=12)
+    track.songdir = type("SongDir", (), {"track_count": 12})()
+    track.track = FakeTrack()
+    track.resolution = type("Resolution", (), {"release": release, "tracks": []})()
+    track.track_number, track.total_tracks = 12, 12
+    track.disc_number = track.total_discs = None
+
+    track.update_album_data()
+
+    assert (track.track_number, track.total_tracks) == (12, 12)
+    assert (track.disc_number, track.total_discs) == (None, None)
+
+
+def test_album_release_is_skipped_when_lastfm_matched_first(monkeypatch):
+    calls = []
+    candidate = AlbumCandidate("Sea Change", mbid="sea-change")
+    release = lastfm.musicbrainz.AlbumRelease(
+        mbid="sea-change", title="Sea Change", tracks=(lastfm.musicbrainz.ReleaseTrack("Lonesome Tears", 1, 1),)
+    )
+    lastfm_match = [("Sea Change", object(), 1.0)]
+    monkeypatch.setattr(lastfm, "_best_lastfm_album_match", lambda artist, album: lastfm_match[0])
+    monkeypatch.setattr(
+        lastfm,
+        "_best_musicbrainz_album_match",
+        lambda artist, album, track_count=None: calls.append(track_count) or ("Sea Change", candidate, 1.0),
+    )
+    monkeypatch.setattr(lastfm.musicbrainz, "get_album_release", lambda candidate, track_count: release)
+
+    monkeypatch.setattr(lastfm.cfg.tags, "album_metadata_source", "lastfm_only")
+    assert lastfm._get_album_release("Beck", "Sea Change", 1) is None
+    monkeypatch.setattr(lastfm.cfg.tags, "album_metadata_source", "lastfm_first")
+    assert lastfm._get_album_release("Beck", "Sea Change", 1) is None
+    assert calls == []
+
+    lastfm_match[0] = None
+    assert lastfm._get_album_release("Beck", "Sea Change", 1) is release
+    monkeypatch.setattr(lastfm.cfg.tags, "album_metadata_source", "musicbrainz_first")
+    lastfm_match[0] = ("Sea Change", object(), 1.0)
+    assert lastfm._get_album_release("Beck", "Sea Change", 1) is release
+    assert calls == [1, 1]
@@ -0,0 +1,97 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from kimp3 import lyrics
+from kimp3.lyrics import GeniusLyricsParser, extract_genius_lyrics
+
+GENIUS_PAGE = Path(__file__).parent / "fixtures" / "genius" / "song.html"
+GENIUS_PAGE_RU = GENIUS_PAGE.with_name("song-ru.html")
+
+
+def test_get_lyrics_caches_answers_by_normalized_key(monkeypatch):
+    calls = []
+
+    def ovh(artist, title):
+        calls.append(("ovh", artist, title))
+        return None
+
+    def genius(artist, title):
+        calls.append(("genius", artist, title))
+        return "words"
+
+    monkeypatch.setattr(lyrics.cfg.tags, "fetch_lyrics", True)
+    monkeypatch.setattr(lyrics.cfg.tags, "lyrics_race", False)
+    monkeypatch.setattr(lyrics, "_get_lyrics_from_lyrics_ovh", ovh)
+    monkeypatch.setattr(lyrics, "_get_lyrics_from_genius", genius)
+    lyrics.clear_lyrics_cache()
+
+    assert lyrics.get_lyrics("The Artist", "Song, Part 1") == "words"
+    assert lyrics.get_lyrics("the artist", "Song Part 1") == "words"
+    assert calls == [("ovh", "The Artist", "Song, Part 1"), ("genius", "The Artist", "Song, Part 1")]
+
+
+def test_lyrics_race_returns_first_answer_without_waiting_for_slow_provider(monkeypatch):
+    release = threading.Event()
+
+    def slow(artist, title):
+        release.wait(5)
+        return "slow words"
+
+    monkeypatch.setattr(lyrics.cfg.tags, "fetch_lyrics", True)
+    monkeypatch.setattr(lyrics.cfg.tags, "lyrics_race", True)
+    monkeypatch.setattr(lyrics, "_get_lyrics_from_lyrics_ovh", slow)
+    monkeypatch.setattr(lyrics, "_get_lyrics_from_genius", lambda artist, title: "fast words")
+    lyrics.clear_lyrics_cache()
+    try:
+        started = time.monotonic()
+        assert lyrics.get_lyrics("Artist", "Song") == "fast words"
+        assert time.monotonic() - started < 1
+    finally:
+        release.set()
+        lyrics.close_race_pool()
+
+
+def test_extract_genius_lyrics_reads_only_lyrics_containers():
+    html = (
+        "<html><body><div id='root'><h1>Title</h1>"
+        "<div data-lyrics-container='true'>[Verse]<br/><a href='/x'><span>First line</span></a><br>"
+        "Rock &amp; roll<p>unclosed<script>var ignored = 1;</script></div>"
+        "<div class='ad'>Advertisement</div>"
+        "<div data-lyrics-container='true'>Last line</div></div>"
+        "<footer>Footer</footer></body></html>"
+    )
+
+    assert extract_genius_lyrics(html) == "[Verse]\nFirst line\nRock & roll\nunclosed\nLast line"
+    assert extract_genius_lyrics("<html><body>No lyrics</body></html>") is None
+
+
+def test_genius_parser_stops_after_the_lyrics_block():
+    page = GENIUS_PAGE.read_bytes()
+    parser = GeniusLyricsParser()
+    on_chunk = parser.restart()
+    read = 0
+    for start in range(0, len(page), 16384):
+        read += 16384
+        if on_chunk(page[start:start + 16384]):
+            break
+
+    assert read < len(page) // 2
+    assert parser.text() == extract_genius_lyrics(page.decode("utf-8"))
+    assert parser.text().startswith("[Verse 1]\n")
+    assert parser.restart() and parser.text() is None
+
+
+@pytest.mark.parametrize("page_path", [GENIUS_PAGE, GENIUS_PAGE_RU])
+@pytest.mark.parametrize("chunk_size", [7, 60, 1000, 4096, 8192])
+def test_genius_parser_keeps_lines_whole_across_chunks(page_path, chunk_size):
+    page = page_path.read_bytes()
+    parser = GeniusLyricsParser()
+    on_chunk = parser.restart()
+    for start in range(0, len(page), chunk_size):
+        if on_chunk(page[start:start + chunk_size]):
+            break
+
+    assert parser.text() == extract_genius_lyrics(page.decode("utf-8"))
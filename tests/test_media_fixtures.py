@@ -1,9 +1,9 @@
 from pathlib import Path
 import shutil
 
-from kimp3.backends import Mp3Id3Backend, TagWritePolicy
+from kimp3.backends import Mp3Id3Backend, TagWritePolicy, load_artwork_bytes
 from kimp3.executor import OperationExecutor
-from kimp3.models import AudioTags, FileOperation
+from kimp3.models import AudioTags, FileOperation, artwork_store
 from kimp3.planning import OperationPlan, PathPlan, build_tag_change_plan
 
 
@@ -136,3 +136,76 @@ def test_executor_replace_existing_preserves_library_rating_and_lyrics(tmp_path)
     assert read_tags.title == "Song"
     assert read_tags.rating == 95
     assert read_tags.lyrics.text == "Library lyrics"
+
+
+def test_mp3_fixture_read_parses_tag_block_once(monkeypatch, tmp_path):
+    from mutagen.easyid3 import EasyID3
+
+    target = tmp_path / "sample.mp3"
+    shutil.copyfile(SAMPLE_MP3, target)
+    backend = Mp3Id3Backend()
+    backend.write(target, AudioTags(title="Fixture Title", genre="Rock/Pop", album_cover=SMALL_COVER.read_bytes()), TagWritePolicy())
+
+    class NoEasyId3(EasyID3):
+        def __init__(self, *args, **kwargs):
+            raise AssertionError("EasyID3 must not reparse the file")
+
+    def no_id3(*args, **kwargs):
+        raise AssertionError("ID3 must not reparse the file")
+
+    monkeypatch.setattr("kimp3.backends.EasyID3", NoEasyId3)
+    monkeypatch.setattr("kimp3.backends.ID3", no_id3)
+
+    tags, info = backend.read_with_info(target)
+
+    assert tags.title == "Fixture Title"
+    assert tags.album_cover == SMALL_COVER.read_bytes()
+    assert info.length > 0
+    assert info.bitrate > 0
+    assert info.raw_genres
+
+
+def test_headers_only_read_loads_artwork_bytes_on_demand(monkeypatch, tmp_path):
+    target = tmp_path / "sample.mp3"
+    shutil.copyfile(SAMPLE_MP3, target)
+    cover = SMALL_COVER.read_bytes()
+    backend = Mp3Id3Backend()
+    backend.write(target, AudioTags(title="Fixture Title", album_cover=cover), TagWritePolicy())
+
+    artwork_store.clear()
+    lazy = backend.read(target, headers_only=True)
+
+    assert lazy.artwork.data is None
+    assert lazy.artwork.size == len(cover)
+    assert artwork_store.stats()["artwork_buffers"] == 0
+
+    reloads = []
+    monkeypatch.setattr(
+        "kimp3.backends.load_artwork_bytes",
+        lambda source: reloads.append(source) or load_artwork_bytes(source),
+    )
+    assert lazy.artwork.read_bytes() == cover
+    assert reloads == [lazy.artwork.source]
+    assert lazy.artwork.data is None
+    assert lazy.artwork.materialize().data == cover
+    assert lazy.managed_equals(backend.read(target))
+    artwork_store.clear()
+
+
+def test_write_reuses_embedded_artwork_for_lazy_handle(monkeypatch, tmp_path):
+    target = tmp_path / "sample.mp3"
+    shutil.copyfile(SAMPLE_MP3, target)
+    cover = SMALL_COVER.read_bytes()
+    backend = Mp3Id3Backend()
+    backend.write(target, AudioTags(title="Old", album_cover=cover), TagWritePolicy())
+    tags = backend.read(target, headers_only=True)
+    tags.title = "New"
+
+    def no_reload(source):
+        raise AssertionError("artwork already embedded in the written file")
+
+    monkeypatch.setattr("kimp3.backends.load_artwork_bytes", no_reload)
+    backend.write(target, tags, TagWritePolicy())
+
+    assert backend.read(target).album_cover == cover
+    assert backend.verify(target, tags, TagWritePolicy()) == []
@@ -0,0 +1,154 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kimp3 import metadata_cache
+from kimp3.metadata_cache import MetadataCache, ProviderCache, SCHEMA_VERSION
+
+
+@pytest.fixture
+def store(tmp_path):
+    cache = MetadataCache(tmp_path / "metadata.sqlite", ttl_days=30, negative_ttl_days=1)
+    yield cache
+    cache.close()
+
+
+def test_put_and_get_roundtrip_with_tuple_keys(store):
+    store.put("lastfm.genres", ("Artist", "Album"), "Rock")
+
+    assert store.get("lastfm.genres", ("Artist", "Album")) == ("hit", "Rock")
+    assert store.get("lastfm.genres", ("Artist", "Other")) == ("miss", None)
+    assert store.get("lastfm.album_tags", ("Artist", "Album")) == ("miss", None)
+
+
+def test_negative_entries_use_short_ttl(store, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(metadata_cache.time, "time", lambda: now)
+    store.put("musicbrainz.artist_mbid", "known", "mbid")
+    store.put("musicbrainz.artist_mbid", "unknown", None, negative=True)
+
+    now += 2 * metadata_cache.DAY_SECONDS
+
+    assert store.get("musicbrainz.artist_mbid", "known") == ("hit", "mbid")
+    assert store.get("musicbrainz.artist_mbid", "unknown") == ("expired", None)
+    assert store.get("musicbrainz.artist_mbid", "unknown") == ("miss", None)
+
+
+def test_namespace_ttl_overrides_default(tmp_path, monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(metadata_cache.time, "time", lambda: now)
+    store = MetadataCache(tmp_path / "metadata.sqlite", ttl_days=30, namespace_ttl_days={"short": 1})
+    store.put("short", "key", "value")
+    store.put("long", "key", "value")
+
+    now += 2 * metadata_cache.DAY_SECONDS
+
+    assert store.get("short", "key")[0] == "expired"
+    assert store.get("long", "key")[0] == "hit"
+    store.close()
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path, monkeypatch):
+    clock = iter(range(1_000_000, 1_000_100))
+    monkeypatch.setattr(metadata_cache.time, "time", lambda: float(next(clock)))
+    store = MetadataCache(tmp_path / "metadata.sqlite", max_entries=2)
+    store.put("ns", "a", 1)
+    store.put("ns", "b", 2)
+    store.put("ns", "c", 3)
+    store.get("ns", "a")
+
+    store.close()
+
+    reopened = MetadataCache(tmp_path / "metadata.sqlite", max_entries=2)
+    assert len(reopened) == 2
+    assert reopened.get("ns", "b") == ("miss", None)
+    reopened.close()
+
+
+def test_schema_version_mismatch_resets_store(tmp_path):
+    path = tmp_path / "metadata.sqlite"
+    store = MetadataCache(path)
+    store.put("ns", "key", "value")
+    store.close()
+    connection = sqlite3.connect(path)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    connection.close()
+
+    reopened = MetadataCache(path)
+
+    assert len(reopened) == 0
+    reopened.close()
+
+
+def test_provider_cache_reads_through_store_and_decodes(store):
+    writer = ProviderCache(
+        "test.pairs",
+        encode=lambda pairs: [list(pair) for pair in pairs],
+        decode=lambda rows: [tuple(row) for row in rows],
+    )
+    writer.store = store
+    writer[("artist", "album")] = [("tag", 10)]
+
+    reader = ProviderCache("test.pairs", encode=writer.encode, decode=writer.decode)
+    reader.store = store
+
+    assert ("artist", "other") not in reader
+    assert reader[("artist", "album")] == [("tag", 10)]
+    assert reader.stats() == {"hits": 1, "misses": 1, "expired": 0, "coalesced": 0}
+    reader.clear()
+    assert len(reader) == 0
+    assert store.get("test.pairs", ("artist", "album"))[0] == "hit"
+
+
+def test_provider_cache_without_store_behaves_like_dict():
+    cache = ProviderCache("test.memory")
+
+    assert "key" not in cache
+    cache["key"] = ""
+    assert "key" in cache
+    assert cache.get("key", "default") == ""
+    assert list(cache) == ["key"]
+    with pytest.raises(KeyError):
+        cache["missing"]
+
+
+def test_get_or_load_coalesces_concurrent_misses():
+    cache = ProviderCache("test.single_flight")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=2)
+        return "Artist"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(cache.get_or_load, "artist", loader)
+        started.wait(timeout=2)
+        others = [executor.submit(cache.get_or_load, "artist", loader) for _ in range(3)]
+        while cache.stats()["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [first.result()] + [future.result() for future in others]
+
+    assert results == ["Artist"] * 4
+    assert len(calls) == 1
+    assert cache["artist"] == "Artist"
+
+
+def test_get_or_load_does_not_cache_loader_errors():
+    cache = ProviderCache("test.single_flight_errors")
+
+    def failing_loader():
+        raise ValueError("network down")
+
+    with pytest.raises(ValueError):
+        cache.get_or_load("artist", failing_loader)
+
+    assert "artist" not in cache
+    assert cache.get_or_load("artist", lambda: "Artist") == "Artist"
@@ -3,8 +3,9 @@ from pathlib import Path
 
 import pytest
 
-from kimp3.models import (AbstractSongDir, AudioTags, FileOperation, Lyrics,
-                          LyricsLookup, TrackNumber, UsualFile)
+from kimp3.models import (AbstractSongDir, Artwork, ArtworkSource, ArtworkStore, AudioTags,
+                          FileOperation, Lyrics, LyricsLookup, TrackNumber,
+                          UsualFile, artwork_store)
 
 
 class MockMutagenFile:
@@ -162,6 +163,52 @@ class TestAudioTags:
         assert tags.track_number == expected_number
         assert tags.total_tracks == expected_total
 
+class TestArtworkStore:
+    def test_equal_artwork_shares_one_buffer(self):
+        artwork_store.clear()
+        first = AudioTags(album_cover=bytes(bytearray(b"cover" * 100)))
+        second = AudioTags(album_cover=bytes(bytearray(b"cover" * 100)))
+
+        assert first.artwork.data is second.artwork.data
+        assert first.managed_equals(second)
+        assert artwork_store.stats()["artwork_bytes_saved"] == 500
+        artwork_store.clear()
+
+    def test_lazy_artwork_is_served_from_store(self):
+        artwork_store.clear()
+        loaded = Artwork(data=b"cover")
+        lazy = Artwork(digest=loaded.digest, size=loaded.size)
+
+        assert lazy.read_bytes() is loaded.data
+        artwork_store.clear()
+
+    def test_described_artwork_does_not_fill_store(self, tmp_path):
+        artwork_store.clear()
+        source = ArtworkSource(path=tmp_path / "song.mp3", locator="APIC:Cover")
+        first = Artwork.described(b"cover" * 100, "image/jpeg", source)
+        second = Artwork.described(b"cover" * 100, "image/jpeg", source)
+
+        assert not first.is_loaded
+        assert first.managed_value() == second.managed_value()
+        assert artwork_store.stats()["artwork_buffers"] == 0
+        assert artwork_store.stats()["artwork_shared_hits"] == 0
+        assert first.managed_value() == Artwork(data=b"cover" * 100).managed_value()
+        artwork_store.clear()
+
+    def test_store_evicts_least_recently_used_buffers(self):
+        store = ArtworkStore(max_bytes=10)
+        store.intern("a", b"aaaa")
+        store.intern("b", b"bbbb")
+        store.get("a")
+        store.intern("c", b"cccc")
+
+        assert store.get("b") is None
+        assert store.get("a") == b"aaaa"
+        assert store.stats()["artwork_bytes"] == 8
+        assert store.intern("big", b"x" * 11) == b"x" * 11
+        assert store.get("big") is None
+
+
 class TestUsualFile:
     def test_create_usual_file(self):
         """Тест создания UsualFile"""
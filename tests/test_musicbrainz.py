@@ -102,3 +102,63 @@ def test_get_artist_albums_uses_cache(monkeypatch):
     assert [album.title for album in musicbrainz.get_artist_albums("Beck")] == [
         "Sea Change"
     ]
+
+
+def test_get_album_release_picks_edition_and_reads_tracks_once(monkeypatch):
+    calls = []
+
+    def fake_get_json(path, params):
+        calls.append((path, params))
+        if path == "release":
+            return {
+                "releases": [
+                    {"id": "single-disc", "status": "Official", "media": [{"track-count": 10}]},
+                    {"id": "deluxe", "status": "Official", "media": [{"track-count": 10}, {"track-count": 3}]},
+                ]
+            }
+        return {
+            "title": "Sea Change",
+            "date": "2002-09-23",
+            "media": [
+                {"position": 1, "tracks": [{"position": 1, "title": "The Golden Age"}] * 10},
+                {"position": 2, "tracks": [{"position": 1, "title": "Ship in a Bottle"}] * 3},
+            ],
+        }
+
+    musicbrainz.clear_cache()
+    monkeypatch.setattr(musicbrainz, "_get_json", fake_get_json)
+    candidate = musicbrainz.AlbumCandidate("Sea Change", mbid="group", entity="release-group")
+
+    release = musicbrainz.get_album_release(candidate, track_count=13)
+    again = musicbrainz.get_album_release(candidate, track_count=13)
+
+    assert release is again
+    assert release.mbid == "deluxe"
+    assert (release.track_count, release.total_discs) == (13, 2)
+    assert release.disc_track_count(2) == 3
+    assert release.find_track("ship in a bottle") == musicbrainz.ReleaseTrack("Ship in a Bottle", 1, 2)
+    assert calls == [
+        ("release", {"release-group": "group", "inc": "media", "limit": 100}),
+        ("release/deluxe", {"inc": "recordings"}),
+    ]
+
+
+def test_get_artist_albums_prefers_edition_with_directory_track_count(monkeypatch):
+    def fake_get_json(path, params):
+        if path == "release":
+            return {
+                "releases": [
+                    {"id": "standard", "title": "Sea Change", "track-count": 12},
+                    {"id": "deluxe", "title": "Sea Change", "track-count": 15},
+                ]
+            }
+        return {"artists": []}
+
+    musicbrainz.clear_cache()
+    monkeypatch.setattr(musicbrainz, "_get_json", fake_get_json)
+
+    albums = musicbrainz.get_artist_albums("Beck", "Sea Change", track_count=15)
+    default = musicbrainz.get_artist_albums("Beck", "Sea Change")
+
+    assert [(album.mbid, album.track_count) for album in albums] == [("deluxe", 15)]
+    assert [(album.mbid, album.track_count) for album in default] == [("standard", 12)]
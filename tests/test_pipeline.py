@@ -0,0 +1,269 @@
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from kimp3 import pipeline
+from kimp3.executor import ExecutionResult
+from kimp3.pipeline import EnrichmentScheduler, SongDirPipeline, TargetReservations
+
+
+class FakeSongDir:
+    def __init__(self, name: str, files: int = 1):
+        self.path = Path(name)
+        self.stages: list[str] = []
+        self.audio_files = [None] * files
+
+
+def test_pipeline_runs_stages_in_order_and_sums_results(monkeypatch):
+    executed = []
+
+    def enrich(song_dir):
+        song_dir.stages.append("enrich")
+        return song_dir
+
+    def plan(song_dir):
+        song_dir.stages.append("plan")
+        return song_dir
+
+    def execute(song_dir, scan_index=None, claim=None):
+        executed.append((song_dir.path.name, list(song_dir.stages), threading.current_thread()))
+        return ExecutionResult(successes=2, failures=1)
+
+    monkeypatch.setattr(pipeline, "enrich_song_dir", enrich)
+    monkeypatch.setattr(pipeline, "plan_song_dir", plan)
+    monkeypatch.setattr(pipeline, "execute_song_dir", execute)
+
+    result = SongDirPipeline([FakeSongDir(f"d{index}") for index in range(5)], depth=1).run()
+
+    assert [name for name, _, _ in executed] == ["d0", "d1", "d2", "d3", "d4"]
+    assert all(stages == ["enrich", "plan"] for _, stages, _ in executed)
+    assert all(thread is threading.main_thread() for _, _, thread in executed)
+    assert (result.successes, result.failures) == (10, 5)
+
+
+def test_pipeline_streams_lazily_with_bounded_lookahead(monkeypatch):
+    produced = []
+    max_ahead = []
+
+    def song_dirs():
+        for index in range(10):
+            produced.append(index)
+            yield FakeSongDir(f"d{index}")
+
+    def execute(song_dir, scan_index=None, claim=None):
+        index = int(song_dir.path.name[1:])
+        max_ahead.append(len(produced) - 1 - index)
+        return ExecutionResult(successes=1)
+
+    monkeypatch.setattr(pipeline, "enrich_song_dir", lambda song_dir: song_dir)
+    monkeypatch.setattr(pipeline, "plan_song_dir", lambda song_dir: song_dir)
+    monkeypatch.setattr(pipeline, "execute_song_dir", execute)
+
+    result = SongDirPipeline(song_dirs(), depth=1).run()
+
+    assert result.successes == 10
+    # One slot per queue plus one directory held by each worker stage.
+    assert max(max_ahead) <= 6
+
+
+def test_pipeline_drops_directory_when_a_stage_fails(monkeypatch):
+    executed = []
+
+    def enrich(song_dir):
+        if song_dir.path.name == "broken":
+            raise RuntimeError("provider exploded")
+        return song_dir
+
+    def execute(song_dir, scan_index=None, claim=None):
+        executed.append(song_dir.path.name)
+        return ExecutionResult(successes=1)
+
+    monkeypatch.setattr(pipeline, "enrich_song_dir", enrich)
+    monkeypatch.setattr(pipeline, "plan_song_dir", lambda song_dir: song_dir)
+    monkeypatch.setattr(pipeline, "execute_song_dir", execute)
+
+    result = SongDirPipeline(
+        [FakeSongDir("first"), FakeSongDir("broken"), FakeSongDir("last")], depth=2
+    ).run()
+
+    assert executed == ["first", "last"]
+    assert result.successes == 2
+
+
+def test_scheduler_prefetches_upcoming_directories_in_order(monkeypatch):
+    lock = threading.Lock()
+    active = []
+    peak = []
+    executed = []
+
+    def enrich(song_dir):
+        with lock:
+            active.append(song_dir.path.name)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(song_dir.path.name)
+        song_dir.stages.append("enrich")
+        return song_dir
+
+    def execute(song_dir, scan_index=None, claim=None):
+        executed.append(song_dir.path.name)
+        return ExecutionResult(successes=1)
+
+    monkeypatch.setattr(pipeline, "enrich_song_dir", enrich)
+    monkeypatch.setattr(pipeline, "plan_song_dir", lambda song_dir: song_dir)
+    monkeypatch.setattr(pipeline, "execute_song_dir", execute)
+
+    scheduler = EnrichmentScheduler(lookahead=3, max_files=100)
+    try:
+        result = SongDirPipeline(
+            [FakeSongDir(f"d{index}") for index in range(9)], depth=3, scheduler=scheduler
+        ).run()
+    finally:
+        scheduler.close()
+
+    assert executed == [f"d{index}" for index in range(9)]
+    assert result.successes == 9
+    assert 1 < max(peak) <= 3
+
+
+def test_scheduler_window_respects_file_cap():
+    scheduler = EnrichmentScheduler(lookahead=4, max_files=20)
+
+    assert scheduler.admits(window_files=0, window_size=0, files=50)
+    assert scheduler.admits(window_files=10, window_size=1, files=10)
+    assert not scheduler.admits(window_files=15, window_size=1, files=10)
+    assert not scheduler.admits(window_files=0, window_size=4, files=1)
+
+
+class FakeAudioFile:
+    def __init__(self, target: str, genre_paths=()):
+        self.new_filepath = target
+        self.genre_paths = list(genre_paths)
+
+
+def test_parallel_roots_wait_for_a_shared_target(monkeypatch, tmp_path):
+    shared = str(tmp_path / "collection" / "song.mp3")
+    lock = threading.Lock()
+    writing = []
+    overlaps = []
+
+    def execute(song_dir, scan_index=None, claim=None):
+        targets = [audio_file.new_filepath for audio_file in song_dir.audio_files]
+        with lock:
+            overlaps.extend(target for target in targets if target in writing)
+            writing.extend(targets)
+        time.sleep(0.05)
+        with lock:
+            for target in targets:
+                writing.remove(target)
+        return ExecutionResult(successes=len(targets))
+
+    monkeypatch.setattr(pipeline, "enrich_song_dir", lambda song_dir: song_dir)
+    monkeypatch.setattr(pipeline, "plan_song_dir", lambda song_dir: song_dir)
+    monkeypatch.setattr(pipeline, "execute_song_dir", execute)
+
+    def root(name: str) -> FakeSongDir:
+        song_dir = FakeSongDir(name)
+        song_dir.audio_files = [FakeAudioFile(shared), FakeAudioFile(str(tmp_path / name / "own.mp3"))]
+        return song_dir
+
+    reservations = TargetReservations()
+    pipelines = [
+        SongDirPipeline([root(name)], reservations=reservations) for name in ("a", "b", "c")
+    ]
+    results = []
+    threads = [threading.Thread(target=lambda p=p: results.append(p.run())) for p in pipelines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert sum(result.successes for result in results) == 6
+    assert reservations.waits >= 1
+    assert len(reservations) == 0
+
+
+def test_planned_targets_claim_genre_links_by_their_own_path(tmp_path):
+    song = tmp_path / "collection" / "song.mp3"
+    link = tmp_path / "genres" / "Rock" / "song.mp3"
+    link.parent.mkdir(parents=True)
+    link.symlink_to(song)
+    song_dir = FakeSongDir("a")
+    song_dir.audio_files = [FakeAudioFile(str(song), genre_paths=[link])]
+
+    assert pipeline.planned_targets(song_dir) == {song.resolve(strict=False), link}
+
+
+def test_extending_a_claim_waits_without_holding_it(tmp_path):
+    song = tmp_path / "song.mp3"
+    renamed = tmp_path / "song (1).mp3"
+    reservations = TargetReservations()
+    first_holds = threading.Event()
+    release_first = threading.Event()
+    extended = []
+
+    def first():
+        with reservations.hold(Path("a"), [renamed]):
+            first_holds.set()
+            release_first.wait(5)
+
+    def second():
+        with reservations.hold(Path("b"), [song]) as claim:
+            extended.append(claim.extend([song, renamed]))
+            extended.append(len(reservations))
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    first_holds.wait(5)
+    waiting = threading.Thread(target=second)
+    waiting.start()
+    deadline = time.monotonic() + 5
+    while reservations.waits == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(reservations) == 1
+    release_first.set()
+    for worker in (thread, waiting):
+        worker.join(5)
+
+    assert extended == [False, 2]
+    assert len(reservations) == 0
+
+
+def test_execute_song_dir_revalidates_original_targets_after_waiting(monkeypatch, tmp_path):
+    target = tmp_path / "song.mp3"
+    plan = SimpleNamespace(
+        path=SimpleNamespace(target_path=target, genre_links=[]), requires_file_operation=True
+    )
+
+    class SuffixingSongDir(FakeSongDir):
+        validations = 0
+
+        def validate_plans(self):
+            self.validations += 1
+            plan.path.target_path = plan.path.target_path.with_name(f"{plan.path.target_path.stem} (1).mp3")
+            return []
+
+    class WaitingClaim:
+        def __init__(self):
+            self.extended = []
+
+        def extend(self, targets):
+            self.extended.append(set(targets))
+            return len(self.extended) > 1
+
+    song_dir = SuffixingSongDir("a")
+    song_dir.audio_files = [SimpleNamespace(operation_plan=plan)]
+    monkeypatch.setattr(pipeline.OperationExecutor, "execute_song_dir", lambda self, song_dir: ExecutionResult())
+    monkeypatch.setattr(pipeline, "PlanReporter", lambda: SimpleNamespace(print_interesting_details=print))
+    monkeypatch.setattr(pipeline, "ExecutionReporter", lambda: SimpleNamespace(print_result=lambda *a, **k: None))
+    claim = WaitingClaim()
+
+    pipeline.execute_song_dir(song_dir, claim=claim)
+
+    assert song_dir.validations == 2
+    assert plan.path.target_path == tmp_path / "song (1).mp3"
+    assert claim.extended[-1] == {(tmp_path / "song (1).mp3").resolve(strict=False)}
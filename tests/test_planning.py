@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from kimp3.models import AudioTags, FileOperation
+from kimp3.models import AudioInfo, AudioTags, FileOperation
 from kimp3.planning import (OperationPlan, PathPlan, PlanValidationError,
                             build_operation_plan, build_path_plan,
                             build_tag_change_plan, render_operation_preview,
@@ -573,3 +573,24 @@ def test_render_operation_preview_contains_tags_paths_and_links(tmp_path):
     assert "operation: copy" in preview
     assert "title: 'Old' -> 'New'" in preview
     assert "genre symlinks:" in preview
+
+
+def test_plan_and_score_reuse_source_info_without_reopening_file(monkeypatch, tmp_path):
+    def no_mutagen(*args, **kwargs):
+        raise AssertionError("source file must not be reopened")
+
+    monkeypatch.setattr("kimp3.planning.MutagenFile", no_mutagen)
+    settings = Settings.model_validate(
+        {
+            "collection": {"directory": str(tmp_path / "library"), "create_genre_links": False},
+            "paths": {"patterns": {"album": "%album_artist/%song_title.%ext"}},
+        }
+    )
+    tags = AudioTags(title="song", artist="Artist", album_artist="Artist", genre="Rock, Pop")
+    info = AudioInfo(bitrate=320000, length=180.0, raw_genres=["Rock/Pop"])
+
+    plan = build_operation_plan(tmp_path / "incoming" / "song.mp3", tags, tags, DummySongDir(), settings, source_info=info)
+    quality = score_candidate(tmp_path / "incoming" / "song.mp3", tags, info=plan.source_info)
+
+    assert [change.field for change in plan.tags.changes] == ["genres"]
+    assert "bitrate=320000:32.0" in quality.reasons
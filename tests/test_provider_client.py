@@ -0,0 +1,107 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from kimp3.provider_client import ProviderClient, ResponseTooLarge
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+
+    def do_GET(self):
+        self.connections.add(self.client_address)
+        body = self.path.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        body = self.rfile.read(length)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_sync_requests_reuse_one_pooled_connection(server):
+    client = ProviderClient(http2=False)
+    try:
+        responses = [client.get(f"{server}/item/{index}") for index in range(5)]
+        posted = client.post(f"{server}/echo", json={"a": 1})
+    finally:
+        client.close()
+
+    assert [response.text for response in responses] == [f"/item/{index}" for index in range(5)]
+    assert posted.json() == {"a": 1}
+    assert len(_Handler.connections) == 1
+
+
+def test_concurrent_async_requests_share_host_client(server):
+    client = ProviderClient(max_connections=4, http2=False)
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(client.request("GET", f"{server}/item/{index}") for index in range(20))
+        )
+
+    try:
+        responses = asyncio.run(fetch_all())
+        assert client.stats() == {"http_clients": 1}
+    finally:
+        client.close()
+
+    assert sorted(response.text for response in responses) == sorted(
+        f"/item/{index}" for index in range(20)
+    )
+    assert len(_Handler.connections) <= 4
+
+
+def test_download_streams_body_up_to_max_bytes(server):
+    client = ProviderClient(http2=False)
+    try:
+        response = client.download(f"{server}/cover.jpg", max_bytes=64)
+        with pytest.raises(ResponseTooLarge):
+            client.download(f"{server}/{'x' * 100}", max_bytes=64)
+    finally:
+        client.close()
+
+    assert response.content == b"/cover.jpg"
+
+
+def test_stream_feeds_chunks_to_a_fresh_callback(server):
+    chunks = []
+    starts = []
+
+    def start():
+        starts.append(1)
+        return lambda chunk: chunks.append(chunk) is None
+
+    client = ProviderClient(http2=False)
+    try:
+        response = client.stream(f"{server}/page", start)
+    finally:
+        client.close()
+
+    assert response.status_code == 200
+    assert starts == [1]
+    assert chunks == [b"/page"]
+
@@ -0,0 +1,93 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from kimp3 import rate_limit
+from kimp3.rate_limit import ProviderLimiter, TokenBucket, retry_after_seconds
+
+
+def test_token_bucket_allows_burst_then_spaces_requests(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=2, burst=2)
+
+    assert [bucket.reserve(), bucket.reserve()] == [0.0, 0.0]
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    now[0] += 10
+    assert bucket.reserve() == 0.0
+
+
+def test_block_for_delays_following_reservations(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate=10, burst=10)
+
+    bucket.block_for(3)
+
+    assert bucket.reserve() == 3.0
+
+
+def test_retry_after_accepts_seconds_and_http_dates(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "time", lambda: 1_700_000_000.0)
+
+    assert retry_after_seconds({"Retry-After": "7"}) == 7.0
+    assert retry_after_seconds({"retry-after": "Tue, 14 Nov 2023 22:13:30 GMT"}) == 10.0
+    assert retry_after_seconds({}) == rate_limit.DEFAULT_BACKOFF_SECONDS
+    assert retry_after_seconds({"Retry-After": "soon"}) == rate_limit.DEFAULT_BACKOFF_SECONDS
+
+
+def test_limiter_caps_in_flight_requests_without_stalling_other_providers():
+    slow = ProviderLimiter("slow", requests_per_second=1000, burst=100, max_in_flight=1)
+    fast = ProviderLimiter("fast", requests_per_second=1000, burst=100, max_in_flight=4)
+    active = []
+    peak = {"slow": 0, "fast": 0}
+    lock = threading.Lock()
+
+    def call(limiter):
+        with limiter.slot():
+            with lock:
+                active.append(limiter.name)
+                peak[limiter.name] = max(peak[limiter.name], active.count(limiter.name))
+            time.sleep(0.02)
+            with lock:
+                active.remove(limiter.name)
+
+    threads = [threading.Thread(target=call, args=(slow,)) for _ in range(3)]
+    threads += [threading.Thread(target=call, args=(fast,)) for _ in range(4)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak["slow"] == 1
+    assert 1 < peak["fast"] <= 4
+    assert slow.stats()["requests"] == 3
+    assert fast.stats()["requests"] == 4
+    assert time.monotonic() - started < 0.2
+
+
+def test_observe_pauses_provider_after_throttle_response(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    limiter = ProviderLimiter("musicbrainz", requests_per_second=10, burst=10)
+
+    limiter.observe(200, {})
+    limiter.observe(503, {"Retry-After": "4"})
+
+    assert limiter.stats()["throttled"] == 1
+    assert limiter.bucket.reserve() == 4.0
+
+
+def test_pylast_limiter_replaces_fixed_delay(monkeypatch):
+    rate_limit.configure({"lastfm": SimpleNamespace(requests_per_second=100, burst=1, max_in_flight=1)})
+    network = SimpleNamespace(limit_rate=False)
+
+    rate_limit.install_pylast_limiter(network)
+    network._delay_call()
+
+    assert network.limit_rate is True
+    assert rate_limit.get_stats()["lastfm"]["requests"] == 1
+    rate_limit.configure({})
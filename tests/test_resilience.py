@@ -0,0 +1,126 @@
+import httpx
+import pylast
+import pytest
+
+from kimp3 import lyrics, resilience
+from kimp3.resilience import CircuitBreaker, ProviderGuard, ProviderUnavailable, is_transient
+
+
+def _status_error(status_code):
+    request = httpx.Request("GET", "https://example.test")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status_code, request=request)
+    )
+
+
+def test_is_transient_separates_outages_from_negative_answers():
+    assert is_transient(httpx.ConnectTimeout("timeout"))
+    assert is_transient(_status_error(503))
+    assert is_transient(pylast.WSError(None, "11", "Service Offline"))
+    assert not is_transient(_status_error(404))
+    assert not is_transient(pylast.WSError(None, "6", "Artist not found"))
+    assert not is_transient(ValueError("bad json"))
+
+
+def test_guard_retries_transient_errors_with_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(resilience.time, "sleep", sleeps.append)
+    guard = ProviderGuard("genius", retries=2, backoff_seconds=0.5)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise httpx.ReadTimeout("slow")
+        return "lyrics"
+
+    assert guard.call(flaky) == "lyrics"
+    assert sleeps == [0.5, 1.0]
+    assert guard.stats()["retried"] == 2
+    assert guard.stats()["failures"] == 0
+
+
+def test_guard_does_not_retry_negative_answers(monkeypatch):
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: None)
+    guard = ProviderGuard("lastfm", retries=3)
+    attempts = []
+
+    def not_found():
+        attempts.append(1)
+        raise pylast.WSError(None, "6", "Artist not found")
+
+    with pytest.raises(pylast.WSError):
+        guard.call(not_found)
+    assert len(attempts) == 1
+
+
+def test_circuit_opens_after_consecutive_failures_and_recovers(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(resilience.time, "sleep", lambda seconds: None)
+    guard = ProviderGuard("genius", retries=0, failure_threshold=2, cooldown_seconds=30)
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise httpx.ConnectError("refused")
+
+    for _ in range(2):
+        with pytest.raises(ProviderUnavailable):
+            guard.call(down)
+    with pytest.raises(ProviderUnavailable):
+        guard.call(down)
+
+    assert len(calls) == 2
+    assert guard.stats()["skipped"] == 1
+    assert guard.stats()["circuit_opened"] == 1
+
+    now[0] += 31
+    assert guard.call(lambda: "back") == "back"
+    assert guard.breaker.consecutive_failures == 0
+
+
+def test_half_open_circuit_lets_one_trial_through(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=10)
+    breaker.record_failure()
+
+    assert breaker.allow() is False
+    now[0] += 11
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+
+
+def test_interrupted_trial_does_not_keep_the_circuit_open(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    guard = ProviderGuard("genius", retries=0, failure_threshold=1, cooldown_seconds=10)
+    guard.breaker.record_failure()
+    now[0] += 11
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        guard.call(interrupted)
+
+    assert guard.call(lambda: "lyrics") == "lyrics"
+    assert guard.breaker.consecutive_failures == 0
+
+
+def test_get_lyrics_reports_outage_instead_of_not_found(monkeypatch):
+    monkeypatch.setattr(lyrics.cfg.tags, "fetch_lyrics", True)
+    lyrics.clear_lyrics_cache()
+
+    def unavailable(artist, title):
+        raise ProviderUnavailable("genius")
+
+    monkeypatch.setattr(lyrics, "_get_lyrics_from_lyrics_ovh", lambda artist, title: None)
+    monkeypatch.setattr(lyrics, "_get_lyrics_from_genius", unavailable)
+
+    with pytest.raises(ProviderUnavailable):
+        lyrics.get_lyrics("Artist", "Song")
+
+    monkeypatch.setattr(lyrics, "_get_lyrics_from_genius", lambda artist, title: None)
+    assert lyrics.get_lyrics("Artist", "Song") is None
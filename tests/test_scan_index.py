@@ -0,0 +1,102 @@
+from pathlib import Path
+
+from kimp3.models import AudioTags, FileOperation
+from kimp3.planning import OperationPlan, PathPlan, build_tag_change_plan
+from kimp3.scan_index import FileStat, IndexEntry, ScanIndex, plan_is_settled, settings_digest
+from kimp3.settings import Settings
+from kimp3.songdir import SongDir
+
+
+def _plan(source: Path, target: Path, old_title: str = "Song") -> OperationPlan:
+    return OperationPlan(
+        path=PathPlan(source_path=source, target_path=target, operation=FileOperation.MOVE),
+        tags=build_tag_change_plan(AudioTags(title=old_title), AudioTags(title="Song")),
+    )
+
+
+def test_scan_index_serves_unchanged_noop_files(tmp_path):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"audio")
+    index = ScanIndex(tmp_path / "index.sqlite", "settings")
+    stat = FileStat.from_path(song)
+
+    index.record([IndexEntry(song, stat, "fingerprint", "noop")])
+
+    assert index.is_settled(song, stat) is True
+    assert index.is_settled(song, FileStat(stat.inode, stat.size + 1, stat.mtime_ns)) is False
+    assert ScanIndex(tmp_path / "index.sqlite", "other-settings").is_settled(song, stat) is False
+
+
+def test_scan_index_does_not_serve_changed_outcomes_or_expired_entries(tmp_path):
+    song = tmp_path / "song.mp3"
+    song.write_bytes(b"audio")
+    stat = FileStat.from_path(song)
+    index = ScanIndex(tmp_path / "index.sqlite", "settings")
+
+    index.record([IndexEntry(song, stat, "fingerprint", "changed")])
+    assert index.is_settled(song, stat) is False
+
+    expired = ScanIndex(tmp_path / "index.sqlite", "settings", max_age_days=0)
+    expired.record([IndexEntry(song, stat, "fingerprint", "noop")])
+    assert expired.is_settled(song, stat) is False
+
+
+def test_scan_index_does_not_serve_files_whose_targets_or_links_are_gone(tmp_path):
+    song = tmp_path / "library" / "song.mp3"
+    link = tmp_path / "genres" / "Rock" / "song.mp3"
+    song.parent.mkdir()
+    link.parent.mkdir(parents=True)
+    song.write_bytes(b"audio")
+    link.symlink_to(song)
+    stat = FileStat.from_path(song)
+    index = ScanIndex(tmp_path / "index.sqlite", "settings")
+
+    index.record([IndexEntry(song, stat, "fingerprint", "noop", target=song, links=(link,))])
+    assert index.is_settled(song, stat) is True
+
+    link.unlink()
+    assert index.is_settled(song, stat) is False
+
+    link.symlink_to(tmp_path / "library" / "other.mp3")
+    assert index.is_settled(song, stat) is False
+
+    elsewhere = tmp_path / "library" / "copy.mp3"
+    index.record([IndexEntry(song, stat, "fingerprint", "noop", target=elsewhere)])
+    assert index.is_settled(song, stat) is False
+
+
+def test_plan_is_settled_requires_noop_tags_and_path(tmp_path):
+    source = tmp_path / "library" / "song.mp3"
+
+    assert plan_is_settled(_plan(source, source)) is True
+    assert plan_is_settled(_plan(source, source, old_title="Old")) is False
+    assert plan_is_settled(_plan(source, tmp_path / "library" / "moved.mp3")) is False
+
+
+def test_song_dir_is_served_from_index_only_when_every_file_is_settled(tmp_path):
+    first = tmp_path / "01.mp3"
+    second = tmp_path / "02.mp3"
+    for path in (first, second):
+        path.write_bytes(b"audio")
+    index = ScanIndex(tmp_path / "index.sqlite", "settings")
+    stats = SongDir._stat_files([first, second])
+    song_dir = object.__new__(SongDir)
+    song_dir.parent = type("ScanDir", (), {"scan_index": index})()
+
+    index.record([IndexEntry(first, stats[first], "fingerprint", "noop")])
+    assert song_dir._served_from_index([first, second], stats) is False
+
+    index.record([IndexEntry(second, stats[second], "fingerprint", "noop")])
+    assert song_dir._served_from_index([first, second], stats) is True
+
+
+def test_settings_digest_ignores_tuning_only_tag_settings():
+    settings = Settings()
+    digest = settings_digest(settings)
+
+    settings.tags.artwork_store_mb += 1
+    settings.tags.cover_workers += 1
+    assert settings_digest(settings) == digest
+
+    settings.tags.fetch_tags = not settings.tags.fetch_tags
+    assert settings_digest(settings) != digest
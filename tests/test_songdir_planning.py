@@ -69,6 +69,7 @@ def test_fetch_tags_runs_audio_files_in_parallel(monkeypatch, tmp_path):
             return {"title": ("old", self.filepath.stem)}
 
     monkeypatch.setattr(cfg.tags, "fetch_workers", 2)
+    monkeypatch.setattr(cfg.tags, "use_llm", False)
     album_dir = tmp_path / "album"
     song_dir = object.__new__(SongDir)
     song_dir.path = album_dir
@@ -1,6 +1,62 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
 from kimp3 import tag_processing
 
 
+@pytest.fixture(autouse=True)
+def _empty_llm_cache():
+    tag_processing.clear_llm_cache()
+    yield
+    tag_processing.clear_llm_cache()
+
+
+class _LlmHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    messages: list = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        message = payload["message"]
+        self.messages.append(message)
+        lines = re.findall(r"^(\d+)\. (.+)$", message, re.MULTILINE)
+        if lines:
+            answer = [
+                {"index": int(number), "genres": ["rock"], "tags": [track.lower()]}
+                for number, track in lines
+            ]
+        else:
+            answer = {"genres": ["rock"], "tags": [message.lower()]}
+        body = json.dumps({"answer": json.dumps(answer), "status": "ok"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def llm_server(monkeypatch):
+    _LlmHandler.messages = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _LlmHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(tag_processing.cfg.tags, "use_llm", True)
+    monkeypatch.setattr(
+        tag_processing.cfg.tags, "llm_url", f"http://127.0.0.1:{httpd.server_address[1]}"
+    )
+    yield _LlmHandler.messages
+    httpd.shutdown()
+    httpd.server_close()
+
+
 class _FakeLastfmTag:
     def __init__(self, name, weight=100):
         self.weight = weight
@@ -24,8 +80,9 @@ def test_get_llm_tags_uses_ai_server_v1_chat_contract(monkeypatch):
                 "status": "ok",
             }
 
-    def post(url, headers, json, timeout):
+    def post(url, provider, headers, json, timeout):
         calls["url"] = url
+        calls["provider"] = provider
         calls["headers"] = headers
         calls["json"] = json
         calls["timeout"] = timeout
@@ -35,7 +92,7 @@ def test_get_llm_tags_uses_ai_server_v1_chat_contract(monkeypatch):
         tag_processing.cfg.tags, "llm_url", "http://ai.local:8000/music_machine"
     )
     monkeypatch.setattr(tag_processing.cfg.tags, "llm_timeout", 45)
-    monkeypatch.setattr(tag_processing.requests, "post", post)
+    monkeypatch.setattr(tag_processing.provider_client, "post", post)
 
     assert tag_processing.get_llm_tags("The Cure", "A Forest") == [
         "rock",
@@ -44,6 +101,7 @@ def test_get_llm_tags_uses_ai_server_v1_chat_contract(monkeypatch):
         "moody",
     ]
     assert calls["url"] == "http://ai.local:8000/v1/chat"
+    assert calls["provider"] == "llm"
     assert calls["headers"] == {"Content-Type": "application/json"}
     assert calls["timeout"] == 45
 
@@ -72,7 +130,7 @@ def test_get_llm_tags_ignores_follow_up_ignored_status(monkeypatch):
         tag_processing.cfg.tags, "llm_url", "http://ai.local:8000/v1/chat"
     )
     monkeypatch.setattr(
-        tag_processing.requests, "post", lambda *args, **kwargs: Response()
+        tag_processing.provider_client, "post", lambda *args, **kwargs: Response()
     )
 
     assert tag_processing.get_llm_tags("Artist", "Title") == []
@@ -96,7 +154,7 @@ def test_get_llm_tags_parses_dict_answer_and_deduplicates(monkeypatch):
         tag_processing.cfg.tags, "llm_url", "http://ai.local:8000/v1/chat"
     )
     monkeypatch.setattr(
-        tag_processing.requests, "post", lambda *args, **kwargs: Response()
+        tag_processing.provider_client, "post", lambda *args, **kwargs: Response()
     )
 
     assert tag_processing.get_llm_tags("Artist", "Title") == [
@@ -122,7 +180,7 @@ def test_get_llm_tags_parses_fenced_json_answer(monkeypatch):
         tag_processing.cfg.tags, "llm_url", "http://ai.local:8000/v1/chat"
     )
     monkeypatch.setattr(
-        tag_processing.requests, "post", lambda *args, **kwargs: Response()
+        tag_processing.provider_client, "post", lambda *args, **kwargs: Response()
     )
 
     assert tag_processing.get_llm_tags("Artist", "Title") == [
@@ -399,3 +457,170 @@ def test_process_lastfm_tags_preserves_existing_genre_and_tag_order(monkeypatch)
 
     assert genres == ["dark wave", "post-punk", "rock"]
     assert tags == ["moody", "classic"]
+
+
+TRACKS = [
+    ("The Cure", "A Forest"),
+    ("The Cure", "Charlotte Sometimes"),
+    ("The Cure", "Primary"),
+    ("The Cure", "Siamese Twins"),
+]
+
+
+def test_prefetch_sends_one_batch_per_directory(monkeypatch, llm_server):
+    monkeypatch.setattr(tag_processing.cfg.tags, "llm_batch_size", 0)
+
+    assert tag_processing.prefetch_llm_tag_suggestions(TRACKS) == 4
+    suggestions = [tag_processing.get_llm_tag_suggestions(*track) for track in TRACKS]
+
+    assert len(llm_server) == 1
+    assert llm_server[0].splitlines()[1] == "2. The Cure - Charlotte Sometimes"
+    assert suggestions[2] == tag_processing.LlmTagSuggestions(["rock"], ["the cure - primary"])
+
+
+def test_prefetch_splits_batches_and_per_track_mode_asks_each_track(monkeypatch, llm_server):
+    monkeypatch.setattr(tag_processing.cfg.tags, "llm_batch_size", 3)
+    tag_processing.prefetch_llm_tag_suggestions(TRACKS)
+    assert len(llm_server) == 2
+
+    tag_processing.clear_llm_cache()
+    llm_server.clear()
+    monkeypatch.setattr(tag_processing.cfg.tags, "llm_batch_size", 1)
+    assert tag_processing.prefetch_llm_tag_suggestions(TRACKS) == 0
+    for track in TRACKS:
+        tag_processing.get_llm_tag_suggestions(*track)
+    assert len(llm_server) == 4
+
+
+def test_llm_suggestions_are_cached_by_normalized_artist_and_title(llm_server):
+    first = tag_processing.get_llm_tag_suggestions("The Cure", "A Forest")
+    again = tag_processing.get_llm_tag_suggestions("the cure", "A Forest!")
+
+    assert again == first
+    assert len(llm_server) == 1
+
+
+def test_parse_llm_batch_answer_accepts_indexed_wrapped_and_ordered_lists():
+    indexed = '[{"index": 2, "genres": ["Jazz"], "tags": []}, {"index": 9, "genres": ["Pop"]}]'
+    wrapped = {"tracks": [{"genres": ["Rock"], "tags": []}, {"genres": [], "tags": ["Calm"]}]}
+    short = [{"genres": ["Rock"], "tags": []}]
+
+    assert tag_processing._parse_llm_batch_answer(indexed, 2) == {
+        1: tag_processing.LlmTagSuggestions(["jazz"], [])
+    }
+    assert tag_processing._parse_llm_batch_answer(wrapped, 2) == {
+        0: tag_processing.LlmTagSuggestions(["rock"], []),
+        1: tag_processing.LlmTagSuggestions([], ["calm"]),
+    }
+    assert tag_processing._parse_llm_batch_answer(short, 2) == {}
+
+
+def _tag_rules(**overrides):
+    rules = {
+        "similar_tags": [],
+        "similar_tags_patterns": [],
+        "banned_tags": [],
+        "banned_tags_patterns": [],
+        "banned_artists_from_tags": {},
+    }
+    rules.update(overrides)
+    return tag_processing.cfg.tags.model_copy(update=rules)
+
+
+def test_tag_policy_keeps_first_matching_rule():
+    policy = tag_processing.TagPolicy(
+        _tag_rules(
+            similar_tags=[["house", "house music"], ["deep house", "house music"]],
+            similar_tags_patterns=[
+                ["post-rock", r"^post[\W_]*rock$"],
+                ["rock", r"^.*rock$", r"^rock.*$"],
+                ["never", r"^post.*$"],
+            ],
+        )
+    )
+
+    assert policy.normalize("house music") == "house"
+    assert policy.normalize("post rock") == "post-rock"
+    assert policy.normalize("rock and roll") == "rock"
+    assert policy.normalize("postpunk") == "never"
+    assert policy.normalize("jazz") == "jazz"
+
+
+def test_tag_policy_matches_patterns_with_groups_one_by_one():
+    policy = tag_processing.TagPolicy(
+        _tag_rules(
+            similar_tags_patterns=[["doubled", r"^(\w+) \1$"], ["shouted", r"(?i)^ROCK$"]],
+            banned_tags_patterns=[r"^(\d)\1+$", r"^top \d+$"],
+        )
+    )
+
+    assert policy.normalize("rock rock") == "doubled"
+    assert policy.normalize("rock") == "shouted"
+    assert policy.is_banned("777", "Artist")
+    assert policy.is_banned("top 10", "Artist")
+    assert not policy.is_banned("778", "Artist")
+
+
+def test_tag_policy_bans_tags_for_listed_artists_only():
+    policy = tag_processing.TagPolicy(
+        _tag_rules(
+            banned_tags=["seen live"],
+            banned_artists_from_tags={"Metal": ["Nirvana"]},
+        )
+    )
+
+    assert policy.is_banned("Seen Live", "Anyone")
+    assert policy.is_banned("metal", "nirvana")
+    assert not policy.is_banned("metal", "Metallica")
+    assert not policy.is_banned("grunge", "Nirvana")
+
+
+def test_get_tag_policy_is_rebuilt_when_rules_are_replaced(monkeypatch):
+    monkeypatch.setattr(tag_processing.cfg.tags, "banned_tags", ["rock"])
+    policy = tag_processing.get_tag_policy()
+
+    assert tag_processing.get_tag_policy() is policy
+    assert policy.is_banned("rock", "Artist")
+
+    monkeypatch.setattr(tag_processing.cfg.tags, "banned_tags", [])
+    rebuilt = tag_processing.get_tag_policy()
+
+    assert rebuilt is not policy
+    assert not rebuilt.is_banned("rock", "Artist")
+
+
+def test_process_lastfm_tags_promotes_through_several_genre_levels(monkeypatch):
+    monkeypatch.setattr(tag_processing.cfg.tags, "use_llm", False)
+    monkeypatch.setattr(tag_processing.cfg.tags, "genres", ["rock"])
+    monkeypatch.setattr(tag_processing.cfg.tags, "extended_genres", ["post-punk", "coldwave"])
+    monkeypatch.setattr(
+        tag_processing.cfg.tags,
+        "genre_parents",
+        {"coldwave": "post-punk", "post-punk": "rock"},
+    )
+    monkeypatch.setattr(tag_processing.cfg.tags, "similar_tags", [])
+    monkeypatch.setattr(tag_processing.cfg.tags, "similar_tags_patterns", [])
+    monkeypatch.setattr(tag_processing.cfg.tags, "banned_tags", [])
+    monkeypatch.setattr(tag_processing.cfg.tags, "banned_tags_patterns", [])
+    monkeypatch.setattr(tag_processing.cfg.tags, "banned_artists_from_tags", {})
+    monkeypatch.setattr(tag_processing.cfg.tags, "max_length", 50)
+
+    genres, tags = tag_processing.process_lastfm_tags(
+        [], [], [_FakeLastfmTag("coldwave", 100)], artist_name="Artist", track_title="Title"
+    )
+
+    assert genres == ["rock"]
+    assert tags == ["coldwave"]
+
+
+def test_llm_lookup_uses_local_names_after_lastfm_correction(monkeypatch, llm_server):
+    monkeypatch.setattr(tag_processing.cfg.tags, "llm_batch_size", 0)
+    local_tracks = [("Cure", "A Forest"), ("Cure", "Primary")]
+
+    assert tag_processing.prefetch_llm_tag_suggestions(local_tracks) == 2
+    for artist, title in local_tracks:
+        tag_processing.process_lastfm_tags(
+            [], [], [], artist_name="The Cure", track_title=title, llm_artist=artist, llm_title=title
+        )
+
+    assert len(llm_server) == 1
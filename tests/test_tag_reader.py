@@ -0,0 +1,65 @@
+import pickle
+import shutil
+from pathlib import Path
+
+from kimp3.backends import Mp3Id3Backend, TagWritePolicy
+from kimp3.models import AudioTags
+from kimp3.tag_reader import TagReader, TitleSettings, _read_chunk, read_tag_record
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "media"
+SAMPLE_MP3 = FIXTURES_DIR / "sample.mp3"
+SMALL_COVER = FIXTURES_DIR / "small-cover.jpg"
+
+
+def _album(tmp_path: Path, count: int = 4) -> list[Path]:
+    cover = SMALL_COVER.read_bytes()
+    paths = []
+    for index in range(1, count + 1):
+        path = tmp_path / f"{index:02d}.mp3"
+        shutil.copyfile(SAMPLE_MP3, path)
+        tags = AudioTags(
+            title=f"song number {index}",
+            artist="artist",
+            album="album",
+            track_number=index,
+            album_cover=cover,
+        )
+        Mp3Id3Backend().write(path, tags, TagWritePolicy())
+        paths.append(path)
+    return paths
+
+
+def test_read_tag_record_keeps_original_and_normalized_tags(tmp_path):
+    path = _album(tmp_path, count=1)[0]
+
+    record = read_tag_record(path, TitleSettings())
+
+    assert record.original.title == "song number 1"
+    assert record.tags.title == "Song Number 1"
+    assert record.tags.album_cover == SMALL_COVER.read_bytes()
+
+
+def test_worker_chunk_records_carry_no_artwork_bytes(tmp_path):
+    paths = _album(tmp_path)
+
+    records = _read_chunk(paths, TitleSettings())
+
+    assert all(not record.original.artwork.is_loaded for record in records)
+    assert len({record.tags.artwork.digest for record in records}) == 1
+    assert len(pickle.dumps(records)) < len(SMALL_COVER.read_bytes())
+
+
+def test_process_pool_reader_matches_serial_reads(tmp_path):
+    paths = _album(tmp_path)
+    reader = TagReader(workers=2)
+    try:
+        records = reader.read(paths, TitleSettings())
+    finally:
+        reader.close()
+
+    serial = {path: read_tag_record(path, TitleSettings()) for path in paths}
+    assert list(records) == paths
+    for path in paths:
+        assert records[path].original == serial[path].original
+        assert records[path].tags == serial[path].tags
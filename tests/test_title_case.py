@@ -1,6 +1,13 @@
 from kimp3.models import AudioTags
 from kimp3.settings import TagsSettings
-from kimp3.title_case import normalize_audio_tag_titles, normalize_title, sentence_case_safe, title_case_safe
+from kimp3.title_case import (
+    TitleCaseRules,
+    normalize_audio_tag_titles,
+    normalize_title,
+    sentence_case_safe,
+    title_case_rules,
+    title_case_safe,
+)
 
 
 def test_title_case_safe_normalizes_basic_english_titles():
@@ -79,3 +86,37 @@ def test_normalize_audio_tag_titles_uses_russian_defaults():
     assert normalized.artist == "ДДТ"
     assert normalized.album == "Мумий Тролль - морская"
     assert normalized.album_artist == "спЛин"
+
+
+def test_title_case_rules_skip_values_without_exceptions():
+    rules = TitleCaseRules(["AC/DC", "Мумий Тролль"])
+
+    assert rules.protect("back in black") == ("back in black", {})
+    assert rules.apply("ac/dc live") == "AC/DC live"
+    protected, replacements = rules.protect("мумий тролль - морская", phrase_only=True)
+    assert list(replacements.values()) == ["Мумий Тролль"]
+    assert protected.startswith("\x00§0§\x00")
+
+
+def test_album_titles_are_normalized_once_per_distinct_value():
+    title_case_rules.cache_clear()
+    settings = TagsSettings()
+    tracks = [
+        AudioTags(
+            title=f"track number {number}",
+            artist="the cure",
+            album="disintegration (deluxe edition)",
+            album_artist="the cure",
+        )
+        for number in range(1, 13)
+    ]
+
+    # Once when the file is read, once more after the tag fetch.
+    for _ in range(2):
+        normalized = [normalize_audio_tag_titles(tags, settings) for tags in tracks]
+
+    assert normalized[4].title == "Track Number 5"
+    assert normalized[4].album == "Disintegration (Deluxe Edition)"
+    rules = title_case_rules(tuple(settings.title_case_exceptions))
+    assert rules.memo_info()["misses"] == 12 + 2
+    assert rules.memo_info()["hits"] == 2 * 12 * 4 - 14